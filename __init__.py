@@ -2,7 +2,7 @@
 Addon de Blender para renombrar y emparentar objetos segun reglas de puertas,
 closets y primitivos.
 Requiere un objeto activo llamado wallN/interiorwallN/ceilingN y seleccion en Modo Objeto.
-Modifica nombres, jerarquias y seleccion en la escena usando bpy.ops.
+Modifica nombres, jerarquias y seleccion en la escena; emparenta sin bpy.ops.
 """
 # -------------------------------------------------------------------------
 #                 Addon: Emparentador y Renombrador Inteligente
@@ -12,6 +12,32 @@ Modifica nombres, jerarquias y seleccion en la escena usando bpy.ops.
 # - Si el objeto tiene hijos y no es un closet, lo trata como una jerarquía de puerta estándar (con hardware).
 # - Si el objeto no tiene hijos, lo trata como un primitivo.
 #
+# v3.14.0: Selección restaurada con select_set directos sobre las referencias guardadas
+#          (seleccion.py): sin bpy.ops.object.select_all ni búsquedas por nombre.
+# v3.13.0: Manifiesto: la opción "Manifiesto" agrega cada cambio (clave estable, nombre
+#          anterior, nombre nuevo, padre) a un archivo JSON-lines o CSV, y "Aplicar
+#          manifiesto" lo repite en un solo lote sobre otra versión de la geometría.
+# v3.12.0: Panel "Validador de nomenclatura" (barra lateral, pestaña Emparentar): clasifica
+#          una vez los descendientes de cada wall y se actualiza por depsgraph_update_post.
+# v3.11.0: Contadores de índices por wall guardados como propiedad personalizada
+#          ("emparentar_indices"): asignación sin recorrer los hijos y operador
+#          "Reconstruir contadores de índices" para resincronizar la escena.
+# v3.10.0: Operador "por partes" (modal): aplica el plan desde un temporizador con barra
+#          de progreso y texto de estado; Esc revierte lo aplicado. Un solo paso de deshacer.
+# v3.9.0: Opción "Medir ejecución": tiempo por fase y contadores en el reporte, con
+#         registro JSON-lines opcional.
+# v3.8.0: Opción "Asignar al padre más cercano": varios wall/interiorwall/ceiling en la
+#         selección; cada objeto se asigna al más cercano con un KD-tree (mathutils.kdtree).
+# v3.7.0: normalizar_escena y normalizar.py: normalización sin interfaz de archivos .blend
+#         completos (blender -b), repartida entre varios procesos de Blender.
+# v3.6.0: Opción "Procesar por lotes": varias jerarquías de puerta/closet y primitivos en
+#         una sola ejecución (un solo paso de deshacer).
+# v3.5.0: Renombrado en dos fases: nombres finales calculados antes de aplicar, un solo
+#         renombrado por objeto y sin nombres .### transitorios (temporales solo en ciclos).
+# v3.4.0: Separación planificar/aplicar: el plan se calcula sobre una instantánea sin bpy
+#         y se aplica en un solo lote. Opción "Solo previsualizar" (dry-run).
+# v3.3.0: Emparentado directo (parent + matrix_parent_inverse) en lugar de bpy.ops.object.parent_set,
+#         con un solo update del view layer por ejecución.
 # v3.2.0: Añadido manejo de hardware para los paneles de las puertas de closet.
 #         Ajustada la captura de hijos para el hardware en jerarquías.
 # v3.1.0: Añadida jerarquía para puertas de closet con nomenclatura específica.
@@ -24,7 +50,7 @@ Modifica nombres, jerarquias y seleccion en la escena usando bpy.ops.
 bl_info = {
     "name": "Emparentador y Renombrador Inteligente (Unificado)",
     "author": "Tu Nombre (con asistencia de Gemini)",
-    "version": (3, 2, 9),
+    "version": (3, 14, 0),
     "blender": (4, 2, 0),
     "location": "View3D > Object Menu > Emparentar y Renombrar Inteligente",
     "description": "Emparenta y renombra primitivos, puertas estándar (con hardware) o puertas de closet (con paneles y hardware).",
@@ -33,26 +59,77 @@ bl_info = {
     "category": "Object",
 }
 
+import itertools
+import time
+
 import bpy
-import re
+
+from .asignacion import asignar_por_cercania
+from .clasificador import CATEGORIA_PADRE, clasificar_nombre
+from .indices import (
+    PROPIEDAD_CONTADORES,
+    AsignadorIndices,
+    escribir_contadores,
+    leer_contador,
+    reconstruir_contadores,
+)
+from .instrumentacion import Instrumentacion, ObjetosContados
+from .manifiesto import (
+    CLAVE_DATOS,
+    CLAVE_UUID,
+    entradas_plan,
+    escribir_manifiesto,
+    indice_claves,
+    leer_manifiesto,
+)
+from .planificador import (
+    PREFIJO_TEMPORAL,
+    Plan,
+    candidatos_normalizacion,
+    describir_plan,
+    planificar_jerarquia_puerta,
+    planificar_jerarquia_puerta_closet,
+    planificar_grupos,
+    planificar_manifiesto,
+    planificar_seleccion,
+    tomar_instantanea,
+    tomar_instantanea_grupos,
+)
+from .seleccion import SeleccionGuardada
+from .validador import ValidadorNombres
+
+# Lineas del plan que se muestran en el reporte de previsualizacion.
+LIMITE_LINEAS_PREVISUALIZACION = 50
+
+# Modo por partes: segundos de trabajo por tick del temporizador y periodo del temporizador.
+PRESUPUESTO_POR_PASO = 0.05
+INTERVALO_TEMPORIZADOR = 0.01
+
+# Claves estables de los objetos en el manifiesto.
+ELEMENTOS_CLAVE_MANIFIESTO = (
+    (CLAVE_DATOS, "Nombre de malla", "Identifica cada objeto por el nombre de sus datos (malla)"),
+    (CLAVE_UUID, "UUID", "Identifica cada objeto por un UUID guardado como propiedad personalizada"),
+)
+
+# Violaciones que lista el panel del validador.
+LIMITE_VIOLACIONES_PANEL = 10
+
+# Cache del validador de nomenclatura; vive mientras validar_en_depsgraph esta registrado.
+validador_nombres = ValidadorNombres()
 
 def encontrar_siguiente_indice(objeto_padre: bpy.types.Object, prefijo_hijo: str, exclude_obj: bpy.types.Object = None) -> int:
     """
     Calcula el siguiente indice numerico disponible para un prefijo bajo un padre.
     Espera hijos ya nombrados con el prefijo + numero; exclude_obj permite ignorar uno.
     Retorna el proximo indice entero (>= 0). No modifica el estado de Blender.
+    Usa el contador guardado en el padre si es consistente; si no, recorre los hijos.
+    Para varias asignaciones seguidas usar AsignadorIndices y evitar reescanear los hijos.
     """
-    max_indice = -1
-    patron = re.compile(f"^{re.escape(prefijo_hijo)}(\\d+)($|_)")
-    for hijo in objeto_padre.children:
-        if hijo == exclude_obj:
-            continue
-        match = patron.match(hijo.name)
-        if match:
-            indice_actual = int(match.group(1))
-            if indice_actual > max_indice:
-                max_indice = indice_actual
-    return max_indice + 1
+    if prefijo_hijo.startswith(f"{objeto_padre.name}_") and not prefijo_hijo.endswith("_closet"):
+        contador = leer_contador(objeto_padre, prefijo_hijo[len(objeto_padre.name) + 1:], bpy.data.objects)
+        if contador is not None and contador[1] is not exclude_obj:
+            return contador[0]
+    return AsignadorIndices(objeto_padre, prefijo_hijo).siguiente(exclude_obj)
 
 def encontrar_siguiente_indice_closet_global(objeto_padre_wall: bpy.types.Object, prefijo_base_wall_name: str, exclude_obj: bpy.types.Object = None) -> int:
     """
@@ -60,33 +137,94 @@ def encontrar_siguiente_indice_closet_global(objeto_padre_wall: bpy.types.Object
     Busca hijos con patron "<wall>_closetN_door" y toma el maximo encontrado.
     exclude_obj permite omitir un objeto del conteo.
     Retorna el indice libre siguiente. No modifica la escena.
+    Usa el contador guardado en el wall si es consistente; si no, recorre los hijos.
     """
-    max_indice_closet = -1
-    patron = re.compile(f"^{re.escape(prefijo_base_wall_name)}_closet(\\d+)_door")
-    for obj in objeto_padre_wall.children:
-        if obj == exclude_obj:
-            continue
-        match = patron.match(obj.name)
-        if match:
-            indice_actual = int(match.group(1))
-            if indice_actual > max_indice_closet:
-                max_indice_closet = indice_actual
-    return max_indice_closet + 1
-
-def emparentar_con_operador_seguro(context: bpy.types.Context, child_obj: bpy.types.Object, parent_obj: bpy.types.Object):
+    if prefijo_base_wall_name == objeto_padre_wall.name:
+        contador = leer_contador(objeto_padre_wall, "closet", bpy.data.objects)
+        if contador is not None and contador[1] is not exclude_obj:
+            return contador[0]
+    return AsignadorIndices(objeto_padre_wall, f"{prefijo_base_wall_name}_closet", sufijo="_door").siguiente(exclude_obj)
+
+def emparentar_directo(child_obj: bpy.types.Object, parent_obj: bpy.types.Object):
     """
-    Emparenta child_obj a parent_obj usando bpy.ops y mantiene transformaciones.
-    Requiere un contexto valido; cambia seleccion y objeto activo.
+    Emparenta child_obj a parent_obj asignando parent y matrix_parent_inverse directamente.
+    Conserva la transformacion mundial igual que parent_set(keep_transform=True),
+    sin cambiar seleccion ni objeto activo y sin pasar por bpy.ops.
+    No actualiza el view layer: el llamador hace un solo update al final del lote.
     No hace nada si ya estan emparentados.
     """
-    # TODO: considerar override de contexto para no depender de la seleccion activa.
     if child_obj.parent == parent_obj: # Ya está correctamente emparentado
         return
-    bpy.ops.object.select_all(action='DESELECT')
-    child_obj.select_set(True)
-    parent_obj.select_set(True)
-    context.view_layer.objects.active = parent_obj
-    bpy.ops.object.parent_set(type='OBJECT', keep_transform=True)
+    # matrix_world puede estar sin evaluar dentro del lote, pero como cada emparentado
+    # conserva la transformacion mundial, su valor sigue siendo el correcto.
+    matriz_mundo = child_obj.matrix_world.copy()
+    child_obj.parent = parent_obj
+    child_obj.matrix_parent_inverse = parent_obj.matrix_world.inverted_safe()
+    child_obj.matrix_basis = matriz_mundo
+
+def aplicar_accion(accion):
+    """Aplica una accion del plan: renombra y/o emparenta directo, sin update del view layer."""
+    if accion.nombre_nuevo is not None:
+        accion.objeto.name = accion.nombre_nuevo
+    if accion.padre_nuevo is not None:
+        emparentar_directo(accion.objeto, accion.padre_nuevo)
+
+def guardar_contadores(plan: Plan):
+    """Guarda en cada wall del plan ya aplicado sus contadores de indices actualizados."""
+    for objeto_padre, contadores in (plan.contadores or {}).items():
+        escribir_contadores(objeto_padre, contadores)
+
+def aplicar_plan(context: bpy.types.Context, plan: Plan):
+    """
+    Aplica en orden las acciones de un plan (renombrar y emparentar directo).
+    Hace un solo update del view layer al final del lote y guarda los contadores de indices.
+    Modifica nombres, jerarquia y propiedades personalizadas de los walls en la escena.
+    """
+    for accion in plan.acciones:
+        aplicar_accion(accion)
+    # Un solo update del view layer para todos los emparentados directos del plan.
+    context.view_layer.update()
+    guardar_contadores(plan)
+    notificar_validador(accion.objeto for accion in plan.acciones)
+
+def reconstruir_contadores_escena() -> int:
+    """
+    Recalcula los contadores de indices de cada wallN/interiorwallN/ceilingN del archivo
+    con un recorrido de sus hijos. Retorna la cantidad de padres actualizados.
+    """
+    padres = [obj for obj in bpy.data.objects if clasificar_nombre(obj.name).categoria == CATEGORIA_PADRE]
+    for objeto_padre in padres:
+        if PROPIEDAD_CONTADORES in objeto_padre:
+            del objeto_padre[PROPIEDAD_CONTADORES]
+        escribir_contadores(objeto_padre, reconstruir_contadores(objeto_padre))
+    return len(padres)
+
+def validacion_activa() -> bool:
+    """Indica si el handler del validador de nomenclatura esta registrado."""
+    return validar_en_depsgraph in bpy.app.handlers.depsgraph_update_post
+
+def notificar_validador(objetos):
+    """
+    Pasa al validador objetos renombrados o emparentados por el addon, por si Blender
+    no los reporta en el depsgraph (un renombrado solo no siempre lo hace).
+    """
+    if validacion_activa():
+        validador_nombres.actualizar(objetos)
+
+def validar_en_depsgraph(scene, depsgraph):
+    """
+    Handler de depsgraph_update_post: reclasifica solo los objetos actualizados cuyo
+    nombre o padre cambio, y olvida los borrados.
+    No es persistente: Blender lo quita al cargar otro archivo.
+    """
+    validador_nombres.sincronizar((actualizacion.id.original for actualizacion in depsgraph.updates
+                                   if isinstance(actualizacion.id, bpy.types.Object)), bpy.data.objects)
+
+def detener_validacion():
+    """Quita el handler del validador y vacia su cache."""
+    if validacion_activa():
+        bpy.app.handlers.depsgraph_update_post.remove(validar_en_depsgraph)
+    validador_nombres.limpiar()
 
 def procesar_jerarquia_puerta(context: bpy.types.Context, objeto_raiz_puerta_original: bpy.types.Object, objeto_padre_wall: bpy.types.Object):
     """
@@ -95,45 +233,11 @@ def procesar_jerarquia_puerta(context: bpy.types.Context, objeto_raiz_puerta_ori
     Renombra marco, paneles y hardware, y los emparenta al wall.
     Modifica nombres y jerarquia en la escena.
     """
-    # --- Paso 1: Definir prefijos base ---
-    base_door_idx = encontrar_siguiente_indice(objeto_padre_wall, f"{objeto_padre_wall.name}_door", exclude_obj=objeto_raiz_puerta_original)
-    nombre_base_puerta = f"{objeto_padre_wall.name}_door{base_door_idx}"
-    
-    # Guardar hijos (paneles) del objeto raíz ANTES de renombrar/reemparentar el objeto raíz
-    hijos_originales_paneles = list(objeto_raiz_puerta_original.children) 
-    
-    # --- Paso 2: Renombrar marco y emparentar ---
-    nombre_marco = f"{nombre_base_puerta}_frame0"
-    objeto_raiz_puerta_original.name = nombre_marco
-    emparentar_con_operador_seguro(context, objeto_raiz_puerta_original, objeto_padre_wall)
-    
-    # --- Paso 3: Renombrar paneles y hardware ---
-    for panel_original in hijos_originales_paneles:
-        panel_type_base = ""
-        panel_name_lower = panel_original.name.lower()
-
-        # Guardar hijos (hardware) del panel ANTES de renombrar/reemparentar el panel
-        hijos_originales_hardware = list(panel_original.children)
-
-        if "left" in panel_name_lower:
-            panel_type_base = "leftpanel"
-        elif "right" in panel_name_lower:
-            panel_type_base = "rightpanel"
-        else:
-            print(f"Panel estándar '{panel_original.name}' omitido por no ser 'left' ni 'right'.")
-            continue
-            
-        panel_idx_specific = encontrar_siguiente_indice(objeto_raiz_puerta_original, f"{nombre_base_puerta}_{panel_type_base}", exclude_obj=panel_original)
-        nombre_panel_renombrado = f"{nombre_base_puerta}_{panel_type_base}{panel_idx_specific}"
-        panel_original.name = nombre_panel_renombrado
-        emparentar_con_operador_seguro(context, panel_original, objeto_raiz_puerta_original)
-        
-        # Renombrar hardware bajo el panel ya renombrado.
-        for hardware_obj in hijos_originales_hardware:
-            current_hardware_idx = encontrar_siguiente_indice(panel_original, f"{panel_original.name}_hardware", exclude_obj=hardware_obj)
-            nombre_hardware = f"{panel_original.name}_hardware{current_hardware_idx}"
-            hardware_obj.name = nombre_hardware
-            emparentar_con_operador_seguro(context, hardware_obj, panel_original)
+    instantanea = tomar_instantanea(objeto_padre_wall, [objeto_raiz_puerta_original], bpy.data.objects)
+    plan = planificar_jerarquia_puerta(instantanea, objeto_raiz_puerta_original, objeto_padre_wall)
+    for mensaje in plan.mensajes:
+        print(mensaje)
+    aplicar_plan(context, plan)
 
 def procesar_jerarquia_puerta_closet(context: bpy.types.Context, objeto_raiz_puerta_closet_original: bpy.types.Object, objeto_padre_wall: bpy.types.Object):
     """
@@ -142,81 +246,36 @@ def procesar_jerarquia_puerta_closet(context: bpy.types.Context, objeto_raiz_pue
     Renombra marco, paneles y hardware, y los emparenta al wall.
     Modifica nombres y jerarquia en la escena.
     """
-    # --- Paso 1: Definir prefijos base para closet ---
-    closet_idx = encontrar_siguiente_indice_closet_global(objeto_padre_wall, objeto_padre_wall.name) # exclude_obj no es tan crítico aquí
-    prefijo_puerta_en_closet = f"{objeto_padre_wall.name}_closet{closet_idx}_door"
-    door_idx = encontrar_siguiente_indice(objeto_padre_wall, prefijo_puerta_en_closet, exclude_obj=objeto_raiz_puerta_closet_original)
-    nombre_base_puerta_actual_closet = f"{prefijo_puerta_en_closet}{door_idx}"
-    
-    # Guardar hijos (paneles) del objeto raíz del closet ANTES de renombrar/reemparentar el objeto raíz
-    hijos_originales_paneles = list(objeto_raiz_puerta_closet_original.children) 
-
-    # --- Paso 2: Renombrar marco y emparentar ---
-    nombre_marco_closet = f"{nombre_base_puerta_actual_closet}_frame0"
-    objeto_raiz_puerta_closet_original.name = nombre_marco_closet
-    emparentar_con_operador_seguro(context, objeto_raiz_puerta_closet_original, objeto_padre_wall)
-
-    patron_prefijo_closet = re.compile(
-        r'^(?:wall|interiorwall|ceiling)\d+_closet\d+_door\d+_(.+)$',
-        re.IGNORECASE,
-    )
-
-    def iterar_hijos_recursivos(objeto):
-        for hijo in objeto.children:
-            yield hijo
-            yield from iterar_hijos_recursivos(hijo)
+    instantanea = tomar_instantanea(objeto_padre_wall, [objeto_raiz_puerta_closet_original], bpy.data.objects)
+    plan = planificar_jerarquia_puerta_closet(instantanea, objeto_raiz_puerta_closet_original, objeto_padre_wall)
+    for mensaje in plan.mensajes:
+        print(mensaje)
+    aplicar_plan(context, plan)
 
-    def actualizar_prefijo_closet(objeto):
-        match = patron_prefijo_closet.match(objeto.name)
-        if not match:
-            return
-        nuevo_nombre = f"{nombre_base_puerta_actual_closet}_{match.group(1)}"
-        if objeto.name != nuevo_nombre:
-            objeto.name = nuevo_nombre
-
-    for hijo in iterar_hijos_recursivos(objeto_raiz_puerta_closet_original):
-        actualizar_prefijo_closet(hijo)
-    
-    # --- Paso 3: Renombrar paneles y hardware ---
-    for panel_original in hijos_originales_paneles:
-        panel_name_lower = panel_original.name.lower()
-        panel_type = ""
-
-        # Guardar hijos (hardware) del panel ANTES de renombrar/reemparentar el panel
-        hijos_originales_hardware_closet = list(panel_original.children)
-
-        # Detectar combinaciones closed/open + left/right desde el nombre original.
-        is_left = "left" in panel_name_lower
-        is_right = "right" in panel_name_lower
-        is_closed = "closed" in panel_name_lower
-        is_open = "open" in panel_name_lower
-
-        if is_closed and is_left:
-            panel_type = "closedleftpanel"
-        elif is_open and is_left:
-            panel_type = "openleftpanel"
-        elif is_closed and is_right:
-            panel_type = "closedrightpanel"
-        elif is_open and is_right:
-            panel_type = "openrightpanel"
-        else:
-            print(f"Panel de closet '{panel_original.name}' no coincide con nomenclatura esperada (closed/open + left/right). Omitiendo.")
+def normalizar_escena(context: bpy.types.Context, aplicar: bool = True) -> dict:
+    """
+    Aplica las reglas a los hijos candidatos de cada wallN/interiorwallN/ceilingN del archivo.
+    Cada padre se planifica en modo lote y se aplica antes de pasar al siguiente.
+    Con aplicar=False solo cuenta los cambios planificados.
+    Retorna un resumen con padres, renombrados, emparentados y fallos de reglas.
+    """
+    padres = [obj for obj in bpy.data.objects if clasificar_nombre(obj.name).categoria == CATEGORIA_PADRE]
+    renombrados = emparentados = 0
+    fallos = []
+    for objeto_padre in padres:
+        candidatos = candidatos_normalizacion(objeto_padre)
+        if not candidatos:
             continue
-
-        if panel_type:
-            # El padre para encontrar el índice del panel es el marco del closet (objeto_raiz_puerta_closet_original ya renombrado)
-            panel_idx = encontrar_siguiente_indice(objeto_raiz_puerta_closet_original, f"{nombre_base_puerta_actual_closet}_{panel_type}", exclude_obj=panel_original)
-            nombre_panel_renombrado = f"{nombre_base_puerta_actual_closet}_{panel_type}{panel_idx}"
-            panel_original.name = nombre_panel_renombrado
-            emparentar_con_operador_seguro(context, panel_original, objeto_raiz_puerta_closet_original) # Emparentar panel al marco del closet
-            
-            # Procesar hardware del panel de closet
-            for hardware_obj in hijos_originales_hardware_closet:
-                # El padre para encontrar el índice del hardware es el panel_original (ya renombrado y emparentado)
-                hardware_idx_closet = encontrar_siguiente_indice(panel_original, f"{panel_original.name}_hardware", exclude_obj=hardware_obj)
-                nombre_hardware = f"{panel_original.name}_hardware{hardware_idx_closet}"
-                hardware_obj.name = nombre_hardware
-                emparentar_con_operador_seguro(context, hardware_obj, panel_original) # Emparentar hardware al panel
+        instantanea = tomar_instantanea(objeto_padre, candidatos, bpy.data.objects)
+        plan = planificar_seleccion(instantanea, objeto_padre, candidatos, lote=True)
+        renombrados += sum(1 for accion in plan.acciones
+                           if accion.nombre_nuevo is not None and not accion.nombre_nuevo.startswith(PREFIJO_TEMPORAL))
+        emparentados += sum(1 for accion in plan.acciones if accion.padre_nuevo is not None)
+        fallos.extend(f"{objeto_padre.name}: {mensaje}" for mensaje in plan.mensajes)
+        fallos.extend(f"{objeto_padre.name}: {texto}" for nivel, texto in plan.informes if nivel == 'WARNING')
+        if aplicar:
+            aplicar_plan(context, plan)
+    return {"padres": len(padres), "renombrados": renombrados, "emparentados": emparentados, "fallos": fallos}
 
 
 class OBJECT_OT_reparent_and_rename_smart(bpy.types.Operator):
@@ -225,6 +284,45 @@ class OBJECT_OT_reparent_and_rename_smart(bpy.types.Operator):
     bl_label = "Emparentar y Renombrar Inteligente"
     bl_options = {'REGISTER', 'UNDO'}
 
+    solo_previsualizar: bpy.props.BoolProperty(
+        name="Solo previsualizar",
+        description="Calcula el plan de renombrado y emparentado y lo muestra en el reporte sin modificar la escena",
+        default=False,
+    )
+    procesar_lote: bpy.props.BoolProperty(
+        name="Procesar por lotes",
+        description="Procesa en una sola ejecución cualquier mezcla de primitivos, puertas y closets seleccionados, con índices consecutivos y un solo paso de deshacer",
+        default=False,
+    )
+    asignar_por_cercania: bpy.props.BoolProperty(
+        name="Asignar al padre más cercano",
+        description="Toma todos los wall/interiorwall/ceiling seleccionados y asigna cada objeto al más cercano antes de aplicar las reglas (en lote)",
+        default=False,
+    )
+    medir_ejecucion: bpy.props.BoolProperty(
+        name="Medir ejecución",
+        description="Reporta el tiempo por fase y los contadores de la ejecución (llamadas a bpy.ops, regex, búsquedas por nombre, renombrados)",
+        default=False,
+    )
+    registro_medicion: bpy.props.StringProperty(
+        name="Registro de mediciones",
+        description="Archivo JSON-lines al que se agrega cada medición (vacío: solo reporte)",
+        default="",
+        subtype='FILE_PATH',
+    )
+    manifiesto: bpy.props.StringProperty(
+        name="Manifiesto",
+        description="Archivo JSON-lines (o .csv) al que se agrega cada cambio aplicado para repetirlo con Aplicar manifiesto (vacío: no se escribe)",
+        default="",
+        subtype='FILE_PATH',
+    )
+    clave_manifiesto: bpy.props.EnumProperty(
+        name="Clave del manifiesto",
+        description="Cómo se identifica cada objeto en el manifiesto",
+        items=ELEMENTOS_CLAVE_MANIFIESTO,
+        default=CLAVE_DATOS,
+    )
+
     @classmethod
     def poll(cls, context):
         """Valida que haya objeto activo y mas de un seleccionado."""
@@ -232,169 +330,381 @@ class OBJECT_OT_reparent_and_rename_smart(bpy.types.Operator):
 
     def execute(self, context):
         """
-        Valida el objeto padre, procesa jerarquias o primitivos y restaura seleccion.
+        Valida el objeto padre, planifica jerarquias o primitivos, aplica el plan y restaura seleccion.
+        Con solo_previsualizar reporta el plan sin modificar la escena.
+        Con medir_ejecucion agrega al reporte el tiempo por fase y los contadores.
         Modifica nombres y jerarquias en la escena y usa reportes para feedback.
         Retorna {'FINISHED'} o {'CANCELLED'}.
         """
-        original_active = context.view_layer.objects.active
-        original_selection = context.selected_objects[:]
+        instrumentacion = Instrumentacion(self.medir_ejecucion)
+        with instrumentacion.fase("total"):
+            resultado = self._ejecutar(context, instrumentacion)
+        if instrumentacion.activa:
+            self._reportar_medicion(context, instrumentacion)
+        return resultado
+
+    def _reportar_medicion(self, context, instrumentacion: Instrumentacion):
+        self.report({'INFO'}, instrumentacion.resumen())
+        if self.registro_medicion:
+            ruta = bpy.path.abspath(self.registro_medicion)
+            try:
+                instrumentacion.anexar_jsonl(ruta, archivo=bpy.data.filepath, padre=context.active_object.name)
+            except OSError as error:
+                self.report({'WARNING'}, f"No se pudo escribir el registro de mediciones: {error}")
+
+    def _ejecutar(self, context, instrumentacion: Instrumentacion):
+        # La seleccion se restaura en _finalizar o, si algo falla antes, al salir del with.
+        with SeleccionGuardada(context) as self._seleccion_guardada:
+            plan = self._preparar(context, instrumentacion)
+            if plan is None:
+                return {'CANCELLED'}
+            with instrumentacion.fase("aplicacion"):
+                aplicar_plan(context, plan)
+            self._finalizar(context, plan, instrumentacion)
+        return {'FINISHED'}
+
+    def _preparar(self, context, instrumentacion: Instrumentacion):
+        """
+        Valida la seleccion y calcula el plan. Retorna None si no hay nada que aplicar
+        (validacion fallida o solo previsualizar, ya reportados).
+        Quien llama guarda antes la seleccion en self._seleccion_guardada para _finalizar.
+        """
         objeto_padre = context.active_object
+        # Con la medicion activa, los accesos por nombre pasan por un contador.
+        objetos_escena = ObjetosContados(bpy.data.objects, instrumentacion) if instrumentacion.activa else bpy.data.objects
         
         # --- Paso 1: Validar objeto padre y seleccion ---
-        match_padre = re.match(r'^(wall|interiorwall|ceiling)\d+$', objeto_padre.name)
-        if not match_padre:
+        if clasificar_nombre(objeto_padre.name).categoria != CATEGORIA_PADRE:
             self.report({'WARNING'}, "Padre activo debe ser 'wall<índice>', 'interiorwall<índice>' o 'ceiling<índice>'.")
-            return {'CANCELLED'}
+            return None
             
         objetos_a_procesar = [obj for obj in context.selected_objects if obj != objeto_padre]
+        if self.asignar_por_cercania:
+            padres = [objeto_padre]
+            padres += [obj for obj in objetos_a_procesar if clasificar_nombre(obj.name).categoria == CATEGORIA_PADRE]
+            objetos_a_procesar = [obj for obj in objetos_a_procesar if obj not in padres]
         
         if not objetos_a_procesar:
             self.report({'WARNING'}, "No se seleccionaron objetos para procesar (además del padre activo).")
+            return None
+
+        # --- Paso 2: Planificar y aplicar jerarquias o primitivos ---
+        # El plan se calcula sobre una instantanea, sin modificar la escena.
+        if self.asignar_por_cercania:
+            # Cada objeto va al padre mas cercano (KD-tree) y todos los grupos forman un solo plan.
+            with instrumentacion.fase("asignacion"):
+                grupos = asignar_por_cercania(padres, objetos_a_procesar)
+            with instrumentacion.fase("instantanea"):
+                instantanea = tomar_instantanea_grupos(grupos, objetos_escena)
+            with instrumentacion.fase("planificacion"):
+                plan = planificar_grupos(instantanea, grupos)
+        else:
+            with instrumentacion.fase("instantanea"):
+                instantanea = tomar_instantanea(objeto_padre, objetos_a_procesar, objetos_escena)
+            with instrumentacion.fase("planificacion"):
+                plan = planificar_seleccion(instantanea, objeto_padre, objetos_a_procesar, lote=self.procesar_lote)
+        for mensaje in plan.mensajes:
+            print(mensaje)
+        instrumentacion.contar("objetos_seleccionados", len(objetos_a_procesar))
+        instrumentacion.contar("objetos_procesados", plan.estadisticas["nodos"])
+        instrumentacion.contar("coincidencias_regex", plan.estadisticas["coincidencias_regex"])
+
+        if self.solo_previsualizar:
+            lineas = describir_plan(plan)
+            self.report({'INFO'}, f"Previsualización: {len(lineas)} cambios planificados (sin aplicar).")
+            for linea in lineas[:LIMITE_LINEAS_PREVISUALIZACION]:
+                self.report({'INFO'}, linea)
+            if len(lineas) > LIMITE_LINEAS_PREVISUALIZACION:
+                self.report({'INFO'}, f"... y {len(lineas) - LIMITE_LINEAS_PREVISUALIZACION} cambios más.")
+            for nivel, texto in plan.informes:
+                self.report({nivel}, texto)
+            return None
+
+        return plan
+
+    def _finalizar(self, context, plan: Plan, instrumentacion: Instrumentacion):
+        """
+        Reporta el plan ya aplicado, lo agrega al manifiesto si hay ruta y restaura la
+        seleccion guardada en _preparar.
+        """
+        if self.manifiesto:
+            ruta = bpy.path.abspath(self.manifiesto)
+            try:
+                escritas = escribir_manifiesto(ruta, entradas_plan(plan, self.clave_manifiesto))
+            except OSError as error:
+                self.report({'WARNING'}, f"No se pudo escribir el manifiesto: {error}")
+            else:
+                self.report({'INFO'}, f"Manifiesto: {escritas} entradas agregadas a {ruta}.")
+        instrumentacion.contar("renombrados", sum(1 for accion in plan.acciones if accion.nombre_nuevo is not None))
+        instrumentacion.contar("emparentados", sum(1 for accion in plan.acciones if accion.padre_nuevo is not None))
+        for nivel, texto in plan.informes:
+            self.report({nivel}, texto)
+
+        with instrumentacion.fase("seleccion"):
+            self._restaurar_seleccion(instrumentacion)
+
+    def _restaurar_seleccion(self, instrumentacion):
+        # --- Paso 3: Restaurar seleccion original ---
+        # Las referencias guardadas siguen validas tras renombrar: sin select_all ni busquedas por nombre.
+        seleccion = self._seleccion_guardada
+        seleccion.restaurar()
+        instrumentacion.contar("seleccion_restaurada", len(seleccion.seleccionados))
+        if seleccion.omitidos:
+            print(f"Advertencia: {seleccion.omitidos} objetos de la selección original ya no existen y no se restauraron.")
+        if not seleccion.activo_restaurado:
+            print("Advertencia: el objeto activo original ya no existe y no se restauró.")
+
+class OBJECT_OT_reparent_and_rename_smart_modal(OBJECT_OT_reparent_and_rename_smart):
+    """
+    Igual que el operador principal, pero aplica el plan por partes desde un temporizador
+    con barra de progreso; Esc deshace lo aplicado y deja la escena como estaba.
+    """
+    bl_idname = "object.reparent_and_rename_smart_modal"
+    bl_label = "Emparentar y Renombrar Inteligente (por partes)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def invoke(self, context, event):
+        """
+        Planifica como execute y arranca el temporizador que aplica el plan por partes.
+        Retorna {'RUNNING_MODAL'} o {'CANCELLED'} si no hay nada que aplicar.
+        """
+        self._instrumentacion = Instrumentacion(self.medir_ejecucion)
+        self._inicio = time.perf_counter()
+        self._seleccion_guardada = SeleccionGuardada(context)
+        with self._instrumentacion.fase("preparacion"):
+            self._plan = self._preparar(context, self._instrumentacion)
+        if self._plan is None:
+            return {'CANCELLED'}
+        self._siguiente = 0
+        self._deshacer = []  # (objeto, nombre, padre, matrix_parent_inverse, matrix_basis) antes de cada accion.
+        window_manager = context.window_manager
+        window_manager.progress_begin(0, len(self._plan.acciones))
+        self._temporizador = window_manager.event_timer_add(INTERVALO_TEMPORIZADOR, window=context.window)
+        window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        """Aplica acciones hasta agotar PRESUPUESTO_POR_PASO por tick; Esc cancela con reversion."""
+        if event.type == 'ESC':
+            self._cancelar(context)
+            self.report({'WARNING'}, "Cancelado: se revirtieron los cambios aplicados.")
             return {'CANCELLED'}
+        if event.type != 'TIMER':
+            # Bloquea otros eventos para que nadie modifique la escena a mitad del plan.
+            return {'RUNNING_MODAL'}
 
-        # --- Paso 2: Procesar jerarquias o primitivos ---
-        # Priorizar el procesamiento de jerarquías si solo se selecciona una (además del padre)
-        if len(objetos_a_procesar) == 1 and objetos_a_procesar[0].children:
-            objeto_raiz_jerarquia = objetos_a_procesar[0]
-            nombre_raiz_lower = objeto_raiz_jerarquia.name.lower()
-
-            # Guardar el estado actual para una posible reversión o referencia
-            # active_obj_before_processing = context.active_object
-            # selected_before_processing = context.selected_objects[:]
-
-            if "closet" in nombre_raiz_lower or "wardrobe" in nombre_raiz_lower:
-                procesar_jerarquia_puerta_closet(context, objeto_raiz_jerarquia, objeto_padre)
-                self.report({'INFO'}, f"Jerarquía de puerta de closet '{objeto_raiz_jerarquia.name}' procesada.")
-            else: 
-                procesar_jerarquia_puerta(context, objeto_raiz_jerarquia, objeto_padre)
-                self.report({'INFO'}, f"Jerarquía de puerta estándar '{objeto_raiz_jerarquia.name}' procesada.")
-        else: # Procesar como primitivos o múltiples objetos sin hijos (o advertir si tienen hijos)
-            count_primitivos = 0
-            jerarquias_omitidas = 0
-            # Patron especial para mantener nomenclaturas definidas y limpiar sufijo .###.
-            nombre_especial_re = re.compile(
-                r'^(?:'
-                r'(?:wall|interiorwall|ceiling)\d+_(?:'
-                r'alacena\d+|apagador\d+|board\d+|closet\d+'
-                r'|closet\d+_door\d+_frame\d+'
-                r'|closet\d+_door\d+_closedleftpanel\d+(?:_hardware\d+)?'
-                r'|closet\d+_door\d+_openleftpanel\d+(?:_hardware\d+)?'
-                r'|closet\d+_door\d+_closedrightpanel\d+(?:_hardware\d+)?'
-                r'|closet\d+_door\d+_openrightpanel\d+(?:_hardware\d+)?'
-                r'|closet\d+_door\d+_closedleftpanel\d+_door\d+'
-                r'|closet\d+_door\d+_closedrightpanel\d+_door\d+'
-                r'|closet\d+_door\d+_door\d+'
-                r'|closet\d+_door\d+_openleftpanel\d+_door\d+'
-                r'|closet\d+_door\d+_openrightpanel\d+_door\d+'
-                r'|coladera\d+|colgador\d+|door\d+|glass\d+'
-                r'|door\d+_door\d+|door\d+_leftpanel\d+_door\d+|door\d+_rightpanel\d+_door\d+'
-                r'|enchufe\d+|estufa\d+|faucet\d+|fridge&micro\d+|fridge\d+|hvac\d+'
-                r'|jaladera\d+|lampara\d+|lamp\d+|lavabo\d+|luz\d+|mirror\d+'
-                r'|perchero\d+|regadera\d+|repisa\d+|seat\d+|stuff\d+|trim\d+|vent\d+|window\d+|collider\d+|\d+'
-                r')'
-                r'|toallero_colgador\d+'
-                r')(?:\.\d+)?$',
-                re.IGNORECASE,
-            )
-            for obj_individual in objetos_a_procesar:
-                if obj_individual.children:
-                    # Si estamos en este bloque, significa que o se seleccionaron múltiples objetos,
-                    # y este en particular tiene hijos, o se seleccionó uno solo sin hijos (que se procesaría abajo).
-                    # Si len(objetos_a_procesar) > 1 y este tiene hijos, se omite.
-                    self.report({'WARNING'}, f"Omitiendo jerarquía '{obj_individual.name}' al procesar múltiples objetos. Procese jerarquías de una en una.")
-                    jerarquias_omitidas +=1
-                    continue
-                
-                # Mantener enchufeN/apagadorN (limpiar .###); si hay conflicto, buscar siguiente indice
-                nombre_obj = obj_individual.name
-                match_especial = nombre_especial_re.match(nombre_obj)
-                if not match_especial and nombre_obj != nombre_obj.strip():
-                    # Tolerar espacios accidentales sin cambiar la intencion del nombre.
-                    match_especial = nombre_especial_re.match(nombre_obj.strip())
-                if match_especial:
-                    nombre_base = nombre_obj.strip() if nombre_obj != nombre_obj.strip() else nombre_obj
-                    nombre_base = re.sub(r'\.\d+$', '', nombre_base)
-                    # Alinear el prefijo wall/interiorwall/ceiling con el objeto padre activo.
-                    match_prefijo = re.match(r'^(?:wall|interiorwall|ceiling)\d+_(.+)$', nombre_base, re.IGNORECASE)
-                    if match_prefijo:
-                        nombre_base = f"{objeto_padre.name}_{match_prefijo.group(1)}"
-                    existente = bpy.data.objects.get(nombre_base)
-                    # Si el nombre base ya existe, buscar el siguiente indice disponible.
-                    while existente and existente != obj_individual:
-                        match_ultimo = re.search(r'(\d+)(?!.*\d)', nombre_base)
-                        if not match_ultimo:
-                            break
-                        inicio, fin = match_ultimo.span(1)
-                        indice_especial = int(match_ultimo.group(1)) + 1
-                        nombre_base = f"{nombre_base[:inicio]}{indice_especial}{nombre_base[fin:]}"
-                        existente = bpy.data.objects.get(nombre_base)
-                    obj_individual.name = nombre_base
-                    emparentar_con_operador_seguro(context, obj_individual, objeto_padre)
-                    count_primitivos += 1
-                    continue
-
-                # Tratar como primitivo
-                indice_primitivo = encontrar_siguiente_indice(objeto_padre, f"{objeto_padre.name}_primitive", exclude_obj=obj_individual)
-                obj_individual.name = f"{objeto_padre.name}_primitive{indice_primitivo}"
-                emparentar_con_operador_seguro(context, obj_individual, objeto_padre)
-                count_primitivos += 1
-            
-            if count_primitivos > 0:
-                self.report({'INFO'}, f"Se procesaron {count_primitivos} objetos primitivos.")
-            if jerarquias_omitidas == 0 and count_primitivos == 0 and not (len(objetos_a_procesar) == 1 and objetos_a_procesar[0].children) :
-                 self.report({'WARNING'}, "No se procesó ningún objeto primitivo válido.")
-            elif jerarquias_omitidas > 0 and count_primitivos == 0:
-                 self.report({'WARNING'}, "No se procesaron primitivos. Se omitieron jerarquías (procesar de una en una).")
+        acciones = self._plan.acciones
+        limite = time.perf_counter() + PRESUPUESTO_POR_PASO
+        with self._instrumentacion.fase("aplicacion"):
+            try:
+                while self._siguiente < len(acciones) and time.perf_counter() < limite:
+                    accion = acciones[self._siguiente]
+                    objeto = accion.objeto
+                    self._deshacer.append((objeto, objeto.name, objeto.parent,
+                                           objeto.matrix_parent_inverse.copy(), objeto.matrix_basis.copy()))
+                    aplicar_accion(accion)
+                    self._siguiente += 1
+            except Exception:
+                # Sin esto el temporizador seguiria registrado con la escena a medio aplicar.
+                self._cancelar(context)
+                raise
+        context.window_manager.progress_update(self._siguiente)
+        context.workspace.status_text_set(f"Emparentar y renombrar: {self._siguiente}/{len(acciones)} cambios (Esc para cancelar)")
+        if self._siguiente < len(acciones):
+            return {'RUNNING_MODAL'}
+
+        # Un solo update del view layer y contadores guardados, como en aplicar_plan.
+        context.view_layer.update()
+        guardar_contadores(self._plan)
+        notificar_validador(accion.objeto for accion in self._plan.acciones)
+        self._terminar(context)
+        self._finalizar(context, self._plan, self._instrumentacion)
+        self._instrumentacion.fases["total"] = time.perf_counter() - self._inicio
+        if self._instrumentacion.activa:
+            self._reportar_medicion(context, self._instrumentacion)
+        return {'FINISHED'}
 
+    def _cancelar(self, context):
+        """Revierte lo aplicado, detiene el temporizador y restaura la seleccion guardada."""
+        self._revertir(context)
+        self._terminar(context)
+        self._restaurar_seleccion(self._instrumentacion)
+
+    def _revertir(self, context):
+        """Deshace las acciones aplicadas en orden inverso, sin colisiones de nombres."""
+        for objeto, nombre, padre, matriz_inversa, matriz_base in reversed(self._deshacer):
+            objeto.name = nombre
+            objeto.parent = padre
+            objeto.matrix_parent_inverse = matriz_inversa
+            objeto.matrix_basis = matriz_base
+        notificar_validador(objeto for objeto, *_ in self._deshacer)
+        self._deshacer.clear()
+        context.view_layer.update()
+
+    def _terminar(self, context):
+        window_manager = context.window_manager
+        window_manager.event_timer_remove(self._temporizador)
+        window_manager.progress_end()
+        context.workspace.status_text_set(None)
+
+class OBJECT_OT_rebuild_index_counters(bpy.types.Operator):
+    """Recalcula los contadores de índices guardados en cada wall/interiorwall/ceiling del archivo."""
+    bl_idname = "object.rebuild_index_counters"
+    bl_label = "Reconstruir contadores de índices"
+    bl_options = {'REGISTER', 'UNDO'}
 
-        # --- Paso 3: Restaurar seleccion original ---
-        # Restaurar selección y activo (intentar con nombres, ya que las referencias directas pueden cambiar)
-        bpy.ops.object.select_all(action='DESELECT')
-        
-        # Guardar los nombres actuales de la selección original, ya que los objetos pudieron ser renombrados.
-        # Esto es un poco más complejo porque el objeto original podría no existir o su "identidad" haber cambiado.
-        # La referencia directa 'original_selection' es la más robusta si los objetos no son eliminados/recreados.
-        
-        # Si la reseleccion falla, inspeccionar original_selection y bpy.data.objects.
-        for obj_ref in original_selection:
-            try:
-                # obj_ref es la referencia original al objeto. Si fue renombrado, la referencia sigue siendo válida
-                # mientras el objeto no sea eliminado y recreado.
-                if obj_ref and obj_ref.name in bpy.data.objects: # Comprobar si el objeto aún existe y es accesible
-                     bpy.data.objects[obj_ref.name].select_set(True)
-                # else: # Si el objeto fue renombrado y queremos buscarlo por su nombre original (más complejo)
-                    # No es necesario aquí, ya que obj_ref debería seguir apuntando al mismo bloque de datos del objeto
-            except ReferenceError:
-                 # El objeto original ya no existe en la escena (p.ej. fue eliminado por otro script o manualmente de forma inesperada)
-                print(f"Advertencia: No se pudo reseleccionar un objeto de la selección original porque ya no existe.")
-                pass 
-        
+    def execute(self, context):
+        """
+        Reescribe los contadores de todos los padres con un recorrido por padre.
+        Usar despues de renombrar hijos a mano. Retorna {'FINISHED'}.
+        """
+        padres = reconstruir_contadores_escena()
+        self.report({'INFO'}, f"Contadores de índices reconstruidos en {padres} padres.")
+        return {'FINISHED'}
+
+class OBJECT_OT_apply_manifest(bpy.types.Operator):
+    """Repite en un solo lote los renombrados y emparentados de un manifiesto."""
+    bl_idname = "object.apply_manifest"
+    bl_label = "Aplicar manifiesto"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(name="Manifiesto", subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default="*.jsonl;*.json;*.csv", options={'HIDDEN'})
+    clave_manifiesto: bpy.props.EnumProperty(
+        name="Clave del manifiesto",
+        description="Cómo se identifican en la escena los objetos del manifiesto",
+        items=ELEMENTOS_CLAVE_MANIFIESTO,
+        default=CLAVE_DATOS,
+    )
+    solo_previsualizar: bpy.props.BoolProperty(
+        name="Solo previsualizar",
+        description="Calcula el plan del manifiesto y lo muestra en el reporte sin modificar la escena",
+        default=False,
+    )
+
+    def invoke(self, context, event):
+        """Abre el selector de archivos. Retorna {'RUNNING_MODAL'}."""
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        """
+        Indexa la escena por clave en un recorrido, lee el manifiesto en streaming, planifica
+        todas las entradas y aplica el plan en un solo lote.
+        Retorna {'FINISHED'} o {'CANCELLED'} si el archivo no se puede leer o solo previsualiza.
+        """
+        ruta = bpy.path.abspath(self.filepath)
+        indice = indice_claves(bpy.data.objects, self.clave_manifiesto)
         try:
-            if original_active and original_active.name in bpy.data.objects: # Comprobar si el objeto activo original aún existe
-                context.view_layer.objects.active = bpy.data.objects[original_active.name]
-        except ReferenceError:
-            print(f"Advertencia: No se pudo restaurar el objeto activo original porque ya no existe.")
-            pass 
-            
+            plan = planificar_manifiesto(bpy.data.objects, leer_manifiesto(ruta), indice)
+        except (OSError, ValueError) as error:
+            self.report({'ERROR'}, f"No se pudo leer el manifiesto: {error}")
+            return {'CANCELLED'}
+        for mensaje in plan.mensajes:
+            print(mensaje)
+        if self.solo_previsualizar:
+            lineas = describir_plan(plan)
+            self.report({'INFO'}, f"Previsualización: {len(lineas)} cambios planificados (sin aplicar).")
+            for linea in lineas[:LIMITE_LINEAS_PREVISUALIZACION]:
+                self.report({'INFO'}, linea)
+            if len(lineas) > LIMITE_LINEAS_PREVISUALIZACION:
+                self.report({'INFO'}, f"... y {len(lineas) - LIMITE_LINEAS_PREVISUALIZACION} cambios más.")
+        else:
+            aplicar_plan(context, plan)
+        for nivel, texto in plan.informes:
+            self.report({nivel}, texto)
+        return {'CANCELLED'} if self.solo_previsualizar else {'FINISHED'}
+
+class OBJECT_OT_naming_validator_start(bpy.types.Operator):
+    """Clasifica la escena y mantiene al día las violaciones de nomenclatura con cada cambio."""
+    bl_idname = "object.naming_validator_start"
+    bl_label = "Validar nomenclatura"
+
+    def execute(self, context):
+        """
+        Clasifica todos los objetos y registra el handler incremental si no estaba.
+        Retorna {'FINISHED'}.
+        """
+        validador_nombres.reconstruir(bpy.data.objects)
+        if not validacion_activa():
+            bpy.app.handlers.depsgraph_update_post.append(validar_en_depsgraph)
+        self.report({'INFO'}, f"{len(validador_nombres.violaciones)} violaciones en {validador_nombres.descendientes} objetos.")
         return {'FINISHED'}
 
+class OBJECT_OT_naming_validator_stop(bpy.types.Operator):
+    """Detiene la validación incremental y libera la cache."""
+    bl_idname = "object.naming_validator_stop"
+    bl_label = "Detener validación"
+
+    def execute(self, context):
+        """Quita el handler y vacia la cache. Retorna {'FINISHED'}."""
+        detener_validacion()
+        return {'FINISHED'}
+
+class VIEW3D_PT_naming_validator(bpy.types.Panel):
+    """Conteos de violaciones de nomenclatura bajo los wall/interiorwall/ceiling."""
+    bl_label = "Validador de nomenclatura"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Emparentar"
+
+    def draw(self, context):
+        layout = self.layout
+        if not validacion_activa():
+            layout.operator(OBJECT_OT_naming_validator_start.bl_idname)
+            return
+        layout.label(text=f"Objetos bajo walls: {validador_nombres.descendientes}")
+        layout.label(text=f"Violaciones: {len(validador_nombres.violaciones)}")
+        for motivo, cantidad in sorted(validador_nombres.conteo_motivos.items()):
+            layout.label(text=f"{motivo}: {cantidad}", icon='ERROR')
+        columna = layout.column(align=True)
+        for objeto, motivo in itertools.islice(validador_nombres.violaciones.items(), LIMITE_VIOLACIONES_PANEL):
+            try:
+                columna.label(text=objeto.name, icon='OBJECT_DATA')
+            except ReferenceError:
+                # Borrado desde el ultimo update; el handler lo quita en el proximo.
+                continue
+        fila = layout.row()
+        fila.operator(OBJECT_OT_naming_validator_start.bl_idname, text="Revalidar", icon='FILE_REFRESH')
+        fila.operator(OBJECT_OT_naming_validator_stop.bl_idname, icon='CANCEL')
+
 # --- Registro del Addon ---
 
 def menu_func(self, context):
     """
-    Agrega el operador al menu Object del View3D.
+    Agrega los operadores (y la previsualizacion) al menu Object del View3D.
     Se usa en register() para insertar el acceso en la UI.
     """
     self.layout.operator(OBJECT_OT_reparent_and_rename_smart.bl_idname)
+    # El mismo operador en modo previsualizacion, para revisar el plan antes de aplicarlo.
+    previsualizar = self.layout.operator(OBJECT_OT_reparent_and_rename_smart.bl_idname,
+                                         text="Previsualizar emparentado y renombrado", icon='HIDE_OFF')
+    previsualizar.solo_previsualizar = True
+    self.layout.operator(OBJECT_OT_reparent_and_rename_smart_modal.bl_idname)
+    self.layout.operator(OBJECT_OT_rebuild_index_counters.bl_idname)
+    self.layout.operator(OBJECT_OT_apply_manifest.bl_idname)
+
+CLASES = (
+    OBJECT_OT_reparent_and_rename_smart,
+    OBJECT_OT_reparent_and_rename_smart_modal,
+    OBJECT_OT_rebuild_index_counters,
+    OBJECT_OT_apply_manifest,
+    OBJECT_OT_naming_validator_start,
+    OBJECT_OT_naming_validator_stop,
+    VIEW3D_PT_naming_validator,
+)
 
 def register():
-    """Registra el operador y el menu en Blender al habilitar el addon."""
-    bpy.utils.register_class(OBJECT_OT_reparent_and_rename_smart)
+    """Registra los operadores, el panel y el menu en Blender al habilitar el addon."""
+    for clase in CLASES:
+        bpy.utils.register_class(clase)
     bpy.types.VIEW3D_MT_object.append(menu_func)
 
 def unregister():
-    """Desregistra el operador y el menu al deshabilitar el addon."""
-    bpy.utils.unregister_class(OBJECT_OT_reparent_and_rename_smart)
+    """Desregistra los operadores, el panel, el menu y el handler del validador al deshabilitar el addon."""
+    detener_validacion()
+    for clase in reversed(CLASES):
+        bpy.utils.unregister_class(clase)
     bpy.types.VIEW3D_MT_object.remove(menu_func)
 
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+"""
+Asignacion espacial de objetos sueltos al wall/interiorwall/ceiling mas cercano.
+La distancia de un objeto a un padre es la de su centro a la caja envolvente del padre.
+Un mathutils.kdtree.KDTree con el centro de la caja de cada padre da una primera cota y
+find_range limita la comparacion exacta a los padres que todavia pueden estar mas cerca.
+Requiere mathutils (Blender).
+"""
+from mathutils import Vector
+from mathutils.kdtree import KDTree
+
+
+def _limites_locales(objeto):
+    esquinas = [Vector(esquina) for esquina in objeto.bound_box]
+    minimo = Vector((min(v.x for v in esquinas), min(v.y for v in esquinas), min(v.z for v in esquinas)))
+    maximo = Vector((max(v.x for v in esquinas), max(v.y for v in esquinas), max(v.z for v in esquinas)))
+    return minimo, maximo
+
+
+def centro_mundial(objeto) -> Vector:
+    """Centro de la caja envolvente de objeto en espacio mundial."""
+    minimo, maximo = _limites_locales(objeto)
+    return objeto.matrix_world @ ((minimo + maximo) * 0.5)
+
+
+class CajaPadre:
+    """Caja envolvente de un padre con su matriz mundial, su centro y su radio en espacio mundial."""
+    __slots__ = ("matriz", "inversa", "minimo", "maximo", "centro", "radio")
+
+    def __init__(self, objeto):
+        self.matriz = objeto.matrix_world.copy()
+        self.inversa = self.matriz.inverted_safe()
+        self.minimo, self.maximo = _limites_locales(objeto)
+        self.centro = self.matriz @ ((self.minimo + self.maximo) * 0.5)
+        self.radio = max((self.matriz @ Vector(esquina) - self.centro).length for esquina in objeto.bound_box)
+
+    def distancia(self, punto) -> float:
+        """
+        Distancia de punto (mundial) a la caja: se recorta el punto a la caja en espacio
+        local y se mide en espacio mundial. Es exacta para matrices sin cizalla
+        (traslacion, rotacion y escala, aunque no sea uniforme).
+        """
+        local = self.inversa @ punto
+        cercano = Vector(tuple(min(max(valor, bajo), alto) for valor, bajo, alto in zip(local, self.minimo, self.maximo)))
+        return (self.matriz @ cercano - punto).length
+
+
+def construir_arbol_padres(cajas) -> KDTree:
+    """KD-tree con el centro de cada caja; el indice de cada punto es el de la caja."""
+    arbol = KDTree(len(cajas))
+    for indice, caja in enumerate(cajas):
+        arbol.insert(caja.centro, indice)
+    arbol.balance()
+    return arbol
+
+
+def padre_mas_cercano(cajas, arbol: KDTree, radio_maximo: float, punto) -> int:
+    """
+    Indice de la caja mas cercana a punto. Ninguna caja cuyo centro este a mas de
+    cota + radio_maximo puede quedar a menos de cota, asi que solo se miden esas.
+    Con la misma distancia gana el centro mas cercano.
+    """
+    _, indice, distancia_centro = arbol.find(punto)
+    mejor = (cajas[indice].distancia(punto), distancia_centro, indice)
+    for _, candidato, distancia_centro in arbol.find_range(punto, mejor[0] + radio_maximo):
+        actual = (cajas[candidato].distancia(punto), distancia_centro, candidato)
+        if actual < mejor:
+            mejor = actual
+    return mejor[2]
+
+
+def asignar_por_cercania(padres, objetos) -> list:
+    """
+    Agrupa objetos por su padre mas cercano y retorna [(padre, objetos)] en el orden
+    de padres, omitiendo los padres sin objetos. Los objetos que descienden de otro
+    objeto de la lista se dejan a su jerarquia, que se asigna como un todo.
+    """
+    padres = list(padres)
+    if not padres:
+        return []
+    seleccion = set(objetos)
+    cajas = [CajaPadre(padre) for padre in padres]
+    arbol = construir_arbol_padres(cajas)
+    radio_maximo = max(caja.radio for caja in cajas)
+    grupos = [[] for _ in padres]
+    for objeto in objetos:
+        ancestro = objeto.parent
+        while ancestro is not None and ancestro not in seleccion:
+            ancestro = ancestro.parent
+        if ancestro is not None:
+            continue
+        grupos[padre_mas_cercano(cajas, arbol, radio_maximo, centro_mundial(objeto))].append(objeto)
+    return [(padre, grupo) for padre, grupo in zip(padres, grupos) if grupo]
@@ -0,0 +1,330 @@
+"""
+Mediciones de rendimiento del addon fuera de Blender.
+Uso: python benchmark.py [repeticiones]
+     python benchmark.py --escenas [--escalas 10 100 ...] [--salida resultados.json]
+Sin --escenas compara el clasificador de nombres contra la cadena de regex anterior
+sobre el corpus de tests/test_clasificador.py, y verifica que ambos coincidan con el
+resultado esperado antes de medir.
+Con --escenas genera escenas sinteticas sobre un bpy simulado (bpy_simulado.py) y mide
+execute, procesar_jerarquia_puerta, procesar_jerarquia_puerta_closet y el validador de
+nomenclatura (clasificacion completa y actualizacion incremental), contando llamadas a
+bpy.ops y busquedas por nombre en bpy.data.objects.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import re
+import sys
+import time
+from datetime import datetime, timezone
+
+_DIR_ADDON = os.path.dirname(os.path.abspath(__file__))
+if _DIR_ADDON not in sys.path:
+    sys.path.insert(0, _DIR_ADDON)
+
+from clasificador import clasificar_nombre  # noqa: E402
+
+
+def _corpus_nombres() -> tuple:
+    """CORPUS_NOMBRES de tests/test_clasificador.py, donde pytest tambien lo verifica."""
+    directorio = os.path.join(_DIR_ADDON, "tests")
+    if directorio not in sys.path:
+        sys.path.insert(0, directorio)
+    from test_clasificador import CORPUS_NOMBRES
+    return CORPUS_NOMBRES
+
+
+# --- Cadena anterior (una regex por pregunta), solo como referencia de medicion ---
+_NOMBRE_ESPECIAL_RE = re.compile(
+    r'^(?:'
+    r'(?:wall|interiorwall|ceiling)\d+_(?:'
+    r'alacena\d+|apagador\d+|board\d+|closet\d+'
+    r'|closet\d+_door\d+_frame\d+'
+    r'|closet\d+_door\d+_closedleftpanel\d+(?:_hardware\d+)?'
+    r'|closet\d+_door\d+_openleftpanel\d+(?:_hardware\d+)?'
+    r'|closet\d+_door\d+_closedrightpanel\d+(?:_hardware\d+)?'
+    r'|closet\d+_door\d+_openrightpanel\d+(?:_hardware\d+)?'
+    r'|closet\d+_door\d+_closedleftpanel\d+_door\d+'
+    r'|closet\d+_door\d+_closedrightpanel\d+_door\d+'
+    r'|closet\d+_door\d+_door\d+'
+    r'|closet\d+_door\d+_openleftpanel\d+_door\d+'
+    r'|closet\d+_door\d+_openrightpanel\d+_door\d+'
+    r'|coladera\d+|colgador\d+|door\d+|glass\d+'
+    r'|door\d+_door\d+|door\d+_leftpanel\d+_door\d+|door\d+_rightpanel\d+_door\d+'
+    r'|enchufe\d+|estufa\d+|faucet\d+|fridge&micro\d+|fridge\d+|hvac\d+'
+    r'|jaladera\d+|lampara\d+|lamp\d+|lavabo\d+|luz\d+|mirror\d+'
+    r'|perchero\d+|regadera\d+|repisa\d+|seat\d+|stuff\d+|trim\d+|vent\d+|window\d+|collider\d+|\d+'
+    r')'
+    r'|toallero_colgador\d+'
+    r')(?:\.\d+)?$',
+    re.IGNORECASE,
+)
+
+
+def _clasificar_anterior(nombre: str, nombre_padre: str):
+    """Reproduce la cadena de regex y busquedas de subcadenas previa al clasificador."""
+    es_padre = bool(re.match(r'^(wall|interiorwall|ceiling)\d+$', nombre))
+    match_especial = _NOMBRE_ESPECIAL_RE.match(nombre)
+    if not match_especial and nombre != nombre.strip():
+        match_especial = _NOMBRE_ESPECIAL_RE.match(nombre.strip())
+    nombre_base = nombre.strip() if nombre != nombre.strip() else nombre
+    nombre_base = re.sub(r'\.\d+$', '', nombre_base)
+    match_prefijo = re.match(r'^(?:wall|interiorwall|ceiling)\d+_(.+)$', nombre_base, re.IGNORECASE)
+    if match_prefijo:
+        nombre_base = f"{nombre_padre}_{match_prefijo.group(1)}"
+
+    nombre_lower = nombre.lower()
+    if "left" in nombre_lower:
+        tipo_puerta = "leftpanel"
+    elif "right" in nombre_lower:
+        tipo_puerta = "rightpanel"
+    else:
+        tipo_puerta = None
+    is_left = "left" in nombre_lower
+    is_right = "right" in nombre_lower
+    is_closed = "closed" in nombre_lower
+    is_open = "open" in nombre_lower
+    if is_closed and is_left:
+        tipo_closet = "closedleftpanel"
+    elif is_open and is_left:
+        tipo_closet = "openleftpanel"
+    elif is_closed and is_right:
+        tipo_closet = "closedrightpanel"
+    elif is_open and is_right:
+        tipo_closet = "openrightpanel"
+    else:
+        tipo_closet = None
+    patron_prefijo_closet = re.compile(
+        r'^(?:wall|interiorwall|ceiling)\d+_closet\d+_door\d+_(.+)$',
+        re.IGNORECASE,
+    )
+    match_closet = patron_prefijo_closet.match(nombre)
+    es_closet = "closet" in nombre_lower or "wardrobe" in nombre_lower
+    return (es_padre, bool(match_especial), nombre_base if match_especial else None,
+            tipo_puerta, tipo_closet, match_closet.group(1) if match_closet else None, es_closet)
+
+
+def _clasificar_nuevo(nombre: str, nombre_padre: str):
+    clasificacion = clasificar_nombre(nombre)
+    return (clasificacion.categoria == "padre", clasificacion.es_especial,
+            clasificacion.nombre_alineado(nombre_padre) if clasificacion.es_especial else None,
+            clasificacion.tipo_panel_puerta, clasificacion.tipo_panel_closet,
+            clasificacion.closet_cola, clasificacion.es_closet)
+
+
+def verificar_corpus() -> list:
+    """Retorna la lista de discrepancias entre el corpus, el clasificador y la cadena anterior."""
+    errores = []
+    for nombre, categoria, alineado, tipo_puerta, tipo_closet, cola in _corpus_nombres():
+        clasificacion = clasificar_nombre(nombre)
+        obtenido = (clasificacion.categoria, clasificacion.nombre_alineado("wall9"),
+                    clasificacion.tipo_panel_puerta, clasificacion.tipo_panel_closet, clasificacion.closet_cola)
+        esperado = (categoria, alineado, tipo_puerta, tipo_closet, cola)
+        if obtenido != esperado:
+            errores.append(f"{nombre!r}: esperado {esperado}, obtenido {obtenido}")
+        if _clasificar_nuevo(nombre, "wall9") != _clasificar_anterior(nombre, "wall9"):
+            errores.append(f"{nombre!r}: difiere de la cadena anterior")
+    return errores
+
+
+def medir_clasificador(repeticiones: int = 2000) -> dict:
+    """Mide ambas rutas sobre el corpus completo y retorna tiempos en segundos."""
+    nombres = [fila[0] for fila in _corpus_nombres()]
+    resultados = {}
+    for etiqueta, funcion in (("cadena_anterior", _clasificar_anterior), ("clasificador", _clasificar_nuevo)):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            for nombre in nombres:
+                funcion(nombre, "wall9")
+        resultados[etiqueta] = time.perf_counter() - inicio
+    resultados["nombres"] = len(nombres) * repeticiones
+    return resultados
+
+
+# --- Escenas sinteticas sobre bpy simulado ---
+
+ESCALAS_POR_DEFECTO = (10, 100, 1000, 10000, 50000)
+_TIPOS_ESPECIALES = ("enchufe", "apagador", "lamp", "luz")
+_PANELES_PUERTA = ("Left", "Right")
+_PANELES_CLOSET = ("closed_left", "open_right", "closed_right", "open_left")
+
+
+def _importar_addon_simulado():
+    """Instala el bpy simulado e importa el paquete del addon; retorna (bpy, addon)."""
+    import bpy_simulado
+    bpy = bpy_simulado.instalar()
+    directorio_padre, nombre_paquete = os.path.split(_DIR_ADDON)
+    if directorio_padre not in sys.path:
+        sys.path.insert(0, directorio_padre)
+    return bpy, importlib.import_module(nombre_paquete)
+
+
+def _crear_jerarquia(objetos, nombre_raiz: str, nombres_paneles, paneles: int, hardware: int):
+    raiz = objetos.new(nombre_raiz)
+    for indice_panel in range(paneles):
+        panel = objetos.new(f"{nombres_paneles[indice_panel % len(nombres_paneles)]}_{nombre_raiz}_{indice_panel}")
+        panel.parent = raiz
+        for indice_hardware in range(hardware):
+            objetos.new(f"Handle_{panel.name}_{indice_hardware}").parent = panel
+    return raiz
+
+
+def generar_escena(bpy, primitivos: int = 0, especiales: int = 0, puertas: int = 0, closets: int = 0,
+                   paneles: int = 2, hardware: int = 1, existentes: int = 0, nombre_padre: str = "wall1"):
+    """
+    Crea en el bpy simulado un padre con existentes hijos ya normalizados y objetos
+    sueltos: primitivos, nombres especiales (enchufeN, apagadorN...) con prefijo de otro
+    wall y sufijos .###, puertas y closets con paneles y hardware.
+    Retorna (padre, sueltos) con sueltos en orden de creacion.
+    """
+    objetos = bpy.data.objects
+    padre = objetos.new(nombre_padre)
+    for indice in range(existentes):
+        objetos.new(f"{nombre_padre}_primitive{indice}").parent = padre
+    sueltos = [objetos.new(f"Cube{indice}") for indice in range(primitivos)]
+    for indice in range(especiales):
+        tipo = _TIPOS_ESPECIALES[indice % len(_TIPOS_ESPECIALES)]
+        sufijo = ".001" if indice % 3 == 0 else ""
+        sueltos.append(objetos.new(f"wall9_{tipo}{indice // len(_TIPOS_ESPECIALES)}{sufijo}"))
+    for indice in range(puertas):
+        sueltos.append(_crear_jerarquia(objetos, f"Door{indice}", _PANELES_PUERTA, paneles, hardware))
+    for indice in range(closets):
+        sueltos.append(_crear_jerarquia(objetos, f"Closet{indice}", _PANELES_CLOSET, paneles, hardware))
+    return padre, sueltos
+
+
+def _preparar_operador(bpy, addon, padre, seleccion, **propiedades):
+    for obj in bpy.data.objects:
+        obj.select_set(False)
+    for obj in seleccion:
+        obj.select_set(True)
+    padre.select_set(True)
+    bpy.context.view_layer.objects.active = padre
+    clase = addon.OBJECT_OT_reparent_and_rename_smart
+    operador = clase()
+    # Las propiedades del operador son anotaciones; el bpy simulado no las instancia.
+    for nombre, valor in clase.__annotations__.items():
+        setattr(operador, nombre, propiedades.get(nombre, valor))
+    return operador
+
+
+def _medir(funcion) -> dict:
+    import bpy_simulado
+    bpy_simulado.contadores.reiniciar()
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    return dict(segundos=segundos, **bpy_simulado.contadores.como_dict())
+
+
+def _casos_escena(bpy, addon, objetos: int):
+    """Genera (caso, funcion a medir) para una escala; cada caso arma su propia escena."""
+    import bpy_simulado
+
+    def execute_lote():
+        # Mezcla: mitad primitivos, un quinto especiales y el resto puertas y closets de 5 objetos.
+        jerarquias = max(1, objetos * 3 // 10 // 5)
+        padre, sueltos = generar_escena(bpy, primitivos=objetos // 2, especiales=objetos // 5,
+                                        puertas=jerarquias // 2, closets=jerarquias - jerarquias // 2)
+        operador = _preparar_operador(bpy, addon, padre, sueltos, procesar_lote=True)
+        return lambda: operador.execute(bpy.context)
+
+    def execute_primitivos():
+        padre, sueltos = generar_escena(bpy, primitivos=objetos * 7 // 10, especiales=objetos - objetos * 7 // 10)
+        operador = _preparar_operador(bpy, addon, padre, sueltos)
+        return lambda: operador.execute(bpy.context)
+
+    def jerarquia_puerta():
+        padre, (raiz,) = generar_escena(bpy, puertas=1, paneles=2, hardware=2, existentes=objetos)
+        return lambda: addon.procesar_jerarquia_puerta(bpy.context, raiz, padre)
+
+    def jerarquia_closet():
+        padre, (raiz,) = generar_escena(bpy, closets=1, paneles=4, hardware=2, existentes=objetos)
+        return lambda: addon.procesar_jerarquia_puerta_closet(bpy.context, raiz, padre)
+
+    def validador_reconstruir():
+        # Al menos una puerta: la primera se procesa para que haya jerarquias ya nombradas.
+        padre, sueltos = generar_escena(bpy, puertas=max(1, objetos // 20), closets=objetos // 20,
+                                        existentes=objetos // 2)
+        addon.procesar_jerarquia_puerta(bpy.context, sueltos[0], padre)
+        return lambda: addon.validador_nombres.reconstruir(bpy.data.objects)
+
+    def validador_actualizar():
+        # Un renombrado a mano sobre la cache ya construida: solo ese objeto se reclasifica.
+        padre, _ = generar_escena(bpy, existentes=objetos)
+        addon.validador_nombres.reconstruir(bpy.data.objects)
+        hijo = padre.children[-1]
+
+        def renombrar():
+            hijo.name = "Cube"
+            addon.validador_nombres.sincronizar([hijo], bpy.data.objects)
+        return renombrar
+
+    for caso, preparar in (("execute_lote", execute_lote), ("execute_primitivos", execute_primitivos),
+                           ("procesar_jerarquia_puerta", jerarquia_puerta),
+                           ("procesar_jerarquia_puerta_closet", jerarquia_closet),
+                           ("validador_reconstruir", validador_reconstruir),
+                           ("validador_actualizar", validador_actualizar)):
+        bpy_simulado.reiniciar(bpy)
+        yield caso, preparar()
+
+
+def medir_escenas(escalas=ESCALAS_POR_DEFECTO) -> list:
+    """Mide cada caso en cada escala y retorna una fila (dict) por medicion."""
+    import contextlib
+    import io
+    bpy, addon = _importar_addon_simulado()
+    filas = []
+    for objetos in escalas:
+        for caso, funcion in _casos_escena(bpy, addon, objetos):
+            escena = len(bpy.data.objects)
+            # Los mensajes de consola del addon no forman parte de la medicion.
+            with contextlib.redirect_stdout(io.StringIO()):
+                medicion = _medir(funcion)
+            filas.append(dict(caso=caso, escala=objetos, objetos_escena=escena, **medicion))
+    return filas
+
+
+def _main_escenas(opciones) -> int:
+    filas = medir_escenas(opciones.escalas)
+    for fila in filas:
+        print(f"{fila['caso']:34s} {fila['escala']:>6d} {fila['segundos']:9.4f} s "
+              f"ops={fila['llamadas_ops']:<3d} busquedas={fila['busquedas_nombre']:<7d} "
+              f"renombrados={fila['renombrados']}")
+    if opciones.salida:
+        resultado = {
+            "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "resultados": filas,
+        }
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, indent=2)
+    return 0
+
+
+def _main_clasificador(opciones) -> int:
+    errores = verificar_corpus()
+    for error in errores:
+        print(error)
+    if errores:
+        return 1
+    resultados = medir_clasificador(opciones.repeticiones)
+    for etiqueta in ("cadena_anterior", "clasificador"):
+        por_nombre = resultados[etiqueta] / resultados["nombres"] * 1e6
+        print(f"{etiqueta:16s} {resultados[etiqueta]:.3f} s ({por_nombre:.2f} us/nombre)")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mediciones de rendimiento del addon fuera de Blender")
+    parser.add_argument("repeticiones", type=int, nargs="?", default=2000,
+                        help="Repeticiones del corpus del clasificador")
+    parser.add_argument("--escenas", action="store_true", help="Medir el operador sobre escenas sintéticas")
+    parser.add_argument("--escalas", type=int, nargs="+", default=list(ESCALAS_POR_DEFECTO),
+                        help="Cantidad de objetos por escena")
+    parser.add_argument("--salida", default=None, help="Ruta del JSON de resultados (solo con --escenas)")
+    opciones = parser.parse_args()
+    sys.exit(_main_escenas(opciones) if opciones.escenas else _main_clasificador(opciones))
@@ -0,0 +1,407 @@
+"""
+Sustituto minimo de bpy y mathutils para medir el addon sin Blender (p. ej. en CI).
+Solo cubre lo que usa el addon: objetos con nombre unico (sufijo .### como Blender),
+padre, hijos, seleccion, propiedades personalizadas y matrices 4x4; operadores
+bpy.ops que cuentan sus llamadas y contadores de busquedas por nombre en bpy.data.objects.
+Se instala con instalar() antes de importar el addon.
+"""
+import math
+import re
+import sys
+import types
+
+_SUFIJO_DUPLICADO = re.compile(r'\.\d+$')
+_LARGO_MAXIMO_NOMBRE = 63
+
+
+class Contadores:
+    """Llamadas observadas desde el ultimo reiniciar()."""
+
+    def __init__(self):
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.llamadas_ops = 0
+        self.busquedas_nombre = 0
+        self.renombrados = 0
+
+    def como_dict(self) -> dict:
+        return {"llamadas_ops": self.llamadas_ops, "busquedas_nombre": self.busquedas_nombre,
+                "renombrados": self.renombrados}
+
+
+contadores = Contadores()
+
+
+# --- mathutils ---
+
+class Vector(tuple):
+    """Vector 3D inmutable con las operaciones que usa el addon."""
+
+    def __new__(cls, valores=(0.0, 0.0, 0.0)):
+        return tuple.__new__(cls, (float(v) for v in valores))
+
+    x = property(lambda self: self[0])
+    y = property(lambda self: self[1])
+    z = property(lambda self: self[2])
+
+    def __add__(self, otro):
+        return Vector(a + b for a, b in zip(self, otro))
+
+    def __sub__(self, otro):
+        return Vector(a - b for a, b in zip(self, otro))
+
+    def __mul__(self, escalar):
+        return Vector(a * escalar for a in self)
+
+    @property
+    def length(self) -> float:
+        return math.sqrt(sum(a * a for a in self))
+
+
+_IDENTIDAD = tuple(tuple(1.0 if i == j else 0.0 for j in range(4)) for i in range(4))
+
+
+class Matrix:
+    """
+    Matriz de transformacion 4x4 por filas (traslacion, rotacion y escala), con el producto,
+    la inversa y los constructores de mathutils.Matrix que usan el addon y las pruebas.
+    """
+    __slots__ = ("filas",)
+
+    def __init__(self, filas=None):
+        self.filas = _IDENTIDAD if filas is None else tuple(tuple(float(v) for v in fila) for fila in filas)
+
+    @classmethod
+    def Identity(cls, tamano: int = 4):
+        return cls()
+
+    @classmethod
+    def Translation(cls, vector):
+        x, y, z = vector
+        return cls(((1, 0, 0, x), (0, 1, 0, y), (0, 0, 1, z), (0, 0, 0, 1)))
+
+    @classmethod
+    def Rotation(cls, angulo: float, tamano: int, eje: str):
+        """Rotacion de angulo (radianes) alrededor de 'X', 'Y' o 'Z'; tamano se ignora (siempre 4x4)."""
+        c, s = math.cos(angulo), math.sin(angulo)
+        i, j = {"X": (1, 2), "Y": (2, 0), "Z": (0, 1)}[eje]
+        filas = [list(fila) for fila in cls().filas]
+        filas[i][i], filas[i][j], filas[j][i], filas[j][j] = c, -s, s, c
+        return cls(filas)
+
+    @classmethod
+    def Diagonal(cls, escala):
+        x, y, z = escala
+        return cls(((x, 0, 0, 0), (0, y, 0, 0), (0, 0, z, 0), (0, 0, 0, 1)))
+
+    @classmethod
+    def LocRotScale(cls, ubicacion, rotacion, escala):
+        """Traslacion @ rotacion (Matrix o None) @ escala, como en mathutils."""
+        return (cls.Translation(ubicacion or (0.0, 0.0, 0.0)) @ (rotacion or cls())
+                @ cls.Diagonal(escala or (1.0, 1.0, 1.0)))
+
+    @property
+    def translation(self) -> "Vector":
+        return Vector(fila[3] for fila in self.filas[:3])
+
+    def __iter__(self):
+        return iter(self.filas)
+
+    def copy(self):
+        return Matrix(self.filas)
+
+    def inverted(self):
+        """Inversa de una matriz afin; ValueError si es singular, como mathutils."""
+        (a, b, c, x), (d, e, f, y), (g, h, k, z) = self.filas[:3]
+        cofactores = ((e * k - f * h, c * h - b * k, b * f - c * e),
+                      (f * g - d * k, a * k - c * g, c * d - a * f),
+                      (d * h - e * g, b * g - a * h, a * e - b * d))
+        determinante = a * cofactores[0][0] + b * cofactores[1][0] + c * cofactores[2][0]
+        if abs(determinante) < 1e-12:
+            raise ValueError("Matrix.inverted(): matriz singular")
+        inversa = [[valor / determinante for valor in fila] for fila in cofactores]
+        for fila in inversa:
+            fila.append(-(fila[0] * x + fila[1] * y + fila[2] * z))
+        return Matrix(inversa + [[0.0, 0.0, 0.0, 1.0]])
+
+    def inverted_safe(self):
+        try:
+            return self.inverted()
+        except ValueError:
+            return Matrix()
+
+    def __matmul__(self, otro):
+        if isinstance(otro, Matrix):
+            columnas = tuple(zip(*otro.filas))
+            return Matrix([[sum(a * b for a, b in zip(fila, columna)) for columna in columnas] for fila in self.filas])
+        x, y, z = otro
+        return Vector(f[0] * x + f[1] * y + f[2] * z + f[3] for f in self.filas[:3])
+
+
+class KDTree:
+    """Busqueda lineal con la interfaz de mathutils.kdtree.KDTree."""
+
+    def __init__(self, tamano: int):
+        self._puntos = []
+
+    def insert(self, punto, indice: int):
+        self._puntos.append((Vector(punto), indice))
+
+    def balance(self):
+        pass
+
+    def find(self, punto):
+        punto = Vector(punto)
+        distancia, co, indice = min(
+            (sum((a - b) ** 2 for a, b in zip(co, punto)) ** 0.5, co, indice) for co, indice in self._puntos)
+        return co, indice, distancia
+
+    def find_range(self, punto, radio: float) -> list:
+        punto = Vector(punto)
+        encontrados = [(co, indice, (co - punto).length) for co, indice in self._puntos]
+        return sorted((fila for fila in encontrados if fila[2] <= radio), key=lambda fila: fila[2])
+
+
+# --- bpy ---
+
+_CAJA_UNITARIA = tuple((x, y, z) for x in (-1.0, 1.0) for y in (-1.0, 1.0) for z in (-1.0, 1.0))
+
+
+class Objeto:
+    """Objeto de escena con nombre unico, padre, hijos, seleccion, matrices y propiedades personalizadas."""
+
+    def __init__(self, coleccion, nombre: str):
+        self._coleccion = coleccion
+        self._name = None
+        self._parent = None
+        self._hijos = {}  # dict como conjunto ordenado.
+        self._seleccionado = False
+        self.matrix_basis = Matrix()
+        self.matrix_parent_inverse = Matrix()
+        self.bound_box = _CAJA_UNITARIA
+        self.data = None
+        self._propiedades = {}
+        self.name = nombre
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, nombre: str):
+        self._coleccion._renombrar(self, nombre[:_LARGO_MAXIMO_NOMBRE])
+
+    @property
+    def original(self):
+        """Como en Blender fuera del depsgraph evaluado: el propio objeto."""
+        return self
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, padre):
+        if self._parent is not None:
+            del self._parent._hijos[self]
+        self._parent = padre
+        if padre is not None:
+            padre._hijos[self] = None
+
+    @property
+    def children(self) -> tuple:
+        return tuple(self._hijos)
+
+    @property
+    def matrix_world(self) -> Matrix:
+        if self._parent is None:
+            return self.matrix_basis.copy()
+        return self._parent.matrix_world @ self.matrix_parent_inverse @ self.matrix_basis
+
+    def select_set(self, estado: bool):
+        self._seleccionado = bool(estado)
+
+    def select_get(self) -> bool:
+        return self._seleccionado
+
+    def get(self, clave: str, defecto=None):
+        return self._propiedades.get(clave, defecto)
+
+    def keys(self):
+        return self._propiedades.keys()
+
+    def __getitem__(self, clave: str):
+        return self._propiedades[clave]
+
+    def __setitem__(self, clave: str, valor):
+        self._propiedades[clave] = valor
+
+    def __delitem__(self, clave: str):
+        del self._propiedades[clave]
+
+    def __contains__(self, clave: str) -> bool:
+        return clave in self._propiedades
+
+    def __repr__(self):
+        return f"<Objeto {self._name!r}>"
+
+
+class ColeccionObjetos:
+    """bpy.data.objects: acceso por nombre contado en contadores.busquedas_nombre."""
+
+    def __init__(self):
+        self._por_nombre = {}
+
+    def new(self, nombre: str, data=None) -> Objeto:
+        objeto = Objeto(self, nombre)
+        objeto.data = data
+        return objeto
+
+    def remove(self, objeto: Objeto):
+        objeto.parent = None
+        for hijo in objeto.children:
+            hijo.parent = None
+        del self._por_nombre[objeto.name]
+
+    def _renombrar(self, objeto: Objeto, nombre: str):
+        if nombre == objeto._name:
+            return
+        if objeto._name is not None:
+            del self._por_nombre[objeto._name]
+            contadores.renombrados += 1
+        if nombre in self._por_nombre:
+            base = _SUFIJO_DUPLICADO.sub('', nombre)
+            numero = 1
+            while f"{base}.{numero:03d}" in self._por_nombre:
+                numero += 1
+            nombre = f"{base}.{numero:03d}"
+        objeto._name = nombre
+        self._por_nombre[nombre] = objeto
+
+    def get(self, nombre: str, defecto=None):
+        contadores.busquedas_nombre += 1
+        return self._por_nombre.get(nombre, defecto)
+
+    def __getitem__(self, nombre: str) -> Objeto:
+        contadores.busquedas_nombre += 1
+        return self._por_nombre[nombre]
+
+    def __contains__(self, nombre: str) -> bool:
+        contadores.busquedas_nombre += 1
+        return nombre in self._por_nombre
+
+    def __iter__(self):
+        return iter(list(self._por_nombre.values()))
+
+    def __len__(self) -> int:
+        return len(self._por_nombre)
+
+
+class _CapaVista:
+    def __init__(self):
+        self.objects = types.SimpleNamespace(active=None)
+        self.actualizaciones = 0
+
+    def update(self):
+        self.actualizaciones += 1
+
+
+class Contexto:
+    """bpy.context con capa de vista, objeto activo y seleccion."""
+
+    def __init__(self, datos):
+        self._datos = datos
+        self.view_layer = _CapaVista()
+        self.scene = types.SimpleNamespace(objects=datos.objects)
+
+    @property
+    def active_object(self):
+        return self.view_layer.objects.active
+
+    @property
+    def selected_objects(self) -> list:
+        return [obj for obj in self._datos.objects._por_nombre.values() if obj._seleccionado]
+
+
+class Operator:
+    """bpy.types.Operator: guarda los reportes en self.reportes."""
+
+    def report(self, nivel, texto: str):
+        self.__dict__.setdefault("reportes", []).append((nivel, texto))
+
+
+def _contar_ops(funcion):
+    def envoltura(*args, **kwargs):
+        contadores.llamadas_ops += 1
+        return funcion(*args, **kwargs)
+    return envoltura
+
+
+def _propiedad(**opciones):
+    return opciones.get("default")
+
+
+def crear_bpy() -> types.ModuleType:
+    """Crea un modulo bpy simulado con datos vacios."""
+    bpy = types.ModuleType("bpy")
+    bpy.data = types.SimpleNamespace(objects=ColeccionObjetos(), filepath="")
+    bpy.context = Contexto(bpy.data)
+
+    def select_all(action='TOGGLE'):
+        seleccionar = action == 'SELECT'
+        for obj in bpy.data.objects._por_nombre.values():
+            obj._seleccionado = (not obj._seleccionado) if action == 'TOGGLE' else seleccionar
+        return {'FINISHED'}
+
+    def parent_set(type='OBJECT', keep_transform=False):
+        # Como ED_object_parent_set: con keep_transform aplica la matriz mundial a la base
+        # antes de cambiar el padre; la inversa del padre siempre es la de su matriz mundial.
+        activo = bpy.context.view_layer.objects.active
+        for obj in bpy.context.selected_objects:
+            if obj is not activo:
+                if keep_transform:
+                    obj.matrix_basis = obj.matrix_world
+                obj.parent = activo
+                obj.matrix_parent_inverse = activo.matrix_world.inverted()
+        return {'FINISHED'}
+
+    bpy.ops = types.SimpleNamespace(
+        object=types.SimpleNamespace(select_all=_contar_ops(select_all), parent_set=_contar_ops(parent_set)),
+        wm=types.SimpleNamespace(save_mainfile=_contar_ops(lambda **kwargs: {'FINISHED'})),
+    )
+    menu = types.SimpleNamespace(append=lambda funcion: None, remove=lambda funcion: None)
+    bpy.types = types.SimpleNamespace(Operator=Operator, Panel=object, Context=Contexto, Object=Objeto,
+                                      VIEW3D_MT_object=menu)
+    bpy.app = types.SimpleNamespace(handlers=types.SimpleNamespace(depsgraph_update_post=[]))
+    bpy.props = types.SimpleNamespace(BoolProperty=_propiedad, StringProperty=_propiedad, EnumProperty=_propiedad)
+    bpy.path = types.SimpleNamespace(abspath=lambda ruta: ruta)
+    bpy.utils = types.SimpleNamespace(register_class=lambda clase: None, unregister_class=lambda clase: None)
+    return bpy
+
+
+def crear_mathutils() -> types.ModuleType:
+    mathutils = types.ModuleType("mathutils")
+    mathutils.Vector = Vector
+    mathutils.Matrix = Matrix
+    mathutils.kdtree = types.ModuleType("mathutils.kdtree")
+    mathutils.kdtree.KDTree = KDTree
+    return mathutils
+
+
+def instalar() -> types.ModuleType:
+    """Registra bpy y mathutils simulados en sys.modules (si no existen) y retorna bpy."""
+    if "bpy" not in sys.modules:
+        mathutils = crear_mathutils()
+        sys.modules["bpy"] = crear_bpy()
+        sys.modules["mathutils"] = mathutils
+        sys.modules["mathutils.kdtree"] = mathutils.kdtree
+    return sys.modules["bpy"]
+
+
+def reiniciar(bpy):
+    """Vacia la escena simulada, la seleccion y los contadores."""
+    bpy.data.objects._por_nombre.clear()
+    bpy.context.view_layer.objects.active = None
+    bpy.context.view_layer.actualizaciones = 0
+    contadores.reiniciar()
@@ -0,0 +1,140 @@
+"""
+Clasificador de nombres de objetos segun la nomenclatura del addon.
+Compila una sola vez al importar y resuelve cada nombre con un solo match:
+categoria, prefijo wall/interiorwall/ceiling, sufijo de duplicado .### y tipo de panel.
+No depende de bpy, por lo que se puede usar y medir fuera de Blender.
+"""
+import re
+from typing import NamedTuple, Optional
+
+# Nombres que se conservan (solo se alinea el prefijo del wall y se limpia el .###).
+_ALTERNATIVAS_ESPECIALES = (
+    r'alacena\d+|apagador\d+|board\d+|closet\d+'
+    r'|closet\d+_door\d+_frame\d+'
+    r'|closet\d+_door\d+_closedleftpanel\d+(?:_hardware\d+)?'
+    r'|closet\d+_door\d+_openleftpanel\d+(?:_hardware\d+)?'
+    r'|closet\d+_door\d+_closedrightpanel\d+(?:_hardware\d+)?'
+    r'|closet\d+_door\d+_openrightpanel\d+(?:_hardware\d+)?'
+    r'|closet\d+_door\d+_closedleftpanel\d+_door\d+'
+    r'|closet\d+_door\d+_closedrightpanel\d+_door\d+'
+    r'|closet\d+_door\d+_door\d+'
+    r'|closet\d+_door\d+_openleftpanel\d+_door\d+'
+    r'|closet\d+_door\d+_openrightpanel\d+_door\d+'
+    r'|coladera\d+|colgador\d+|door\d+|glass\d+'
+    r'|door\d+_door\d+|door\d+_leftpanel\d+_door\d+|door\d+_rightpanel\d+_door\d+'
+    r'|enchufe\d+|estufa\d+|faucet\d+|fridge&micro\d+|fridge\d+|hvac\d+'
+    r'|jaladera\d+|lampara\d+|lamp\d+|lavabo\d+|luz\d+|mirror\d+'
+    r'|perchero\d+|regadera\d+|repisa\d+|seat\d+|stuff\d+|trim\d+|vent\d+|window\d+|collider\d+|\d+'
+)
+
+# Un solo patron para todo el nombre. El resto tras "wallN_" prueba primero las
+# alternativas especiales y, si no, cualquier texto; el lookahead captura la cola de
+# los nombres "<wall>_closetN_doorM_<cola>" (incluido un posible .###).
+_PATRON_NOMBRE = re.compile(
+    r'^(?:'
+    r'(?P<wall>(?P<wall_tipo>wall|interiorwall|ceiling)\d+)'
+    r'(?:_(?:(?=closet\d+_door\d+_(?P<closet_cola>.+)$))?'
+    r'(?P<resto>(?P<especial>' + _ALTERNATIVAS_ESPECIALES + r')|.*?))?'
+    r'|(?P<toallero>toallero_colgador\d+)'
+    r'|[\s\S]*?'
+    r')(?P<dup>\.\d+)?$',
+    re.IGNORECASE,
+)
+
+# Palabras clave de paneles y raices de closet. Ninguna se solapa con otra,
+# asi que un solo findall sobre el nombre en minusculas las encuentra todas.
+_PATRON_PALABRAS = re.compile(r'left|right|closed|open|closet|wardrobe')
+
+_PATRON_DIGITOS = re.compile(r'\d+')
+
+_TIPOS_PADRE = ("wall", "interiorwall", "ceiling")
+
+CATEGORIA_PADRE = "padre"
+CATEGORIA_ESPECIAL = "especial"
+CATEGORIA_WALL = "wall"
+CATEGORIA_LIBRE = "libre"
+
+
+class ClasificacionNombre(NamedTuple):
+    """Resultado inmutable de clasificar_nombre."""
+    categoria: str
+    prefijo_wall: Optional[str]
+    nombre_base: str
+    resto: Optional[str]
+    sufijo_duplicado: str
+    closet_cola: Optional[str]
+    tipo_panel_puerta: Optional[str]
+    tipo_panel_closet: Optional[str]
+    es_closet: bool
+
+    @property
+    def es_especial(self) -> bool:
+        return self.categoria == CATEGORIA_ESPECIAL
+
+    @property
+    def indices(self) -> tuple:
+        """Numeros del nombre base en orden de aparicion (p. ej. wall1_door2_frame0 -> (1, 2, 0))."""
+        return tuple(int(digitos) for digitos in _PATRON_DIGITOS.findall(self.nombre_base))
+
+    def nombre_alineado(self, nombre_padre: str) -> str:
+        """Nombre base con el prefijo wall/interiorwall/ceiling reemplazado por nombre_padre."""
+        if self.resto is None:
+            return self.nombre_base
+        return f"{nombre_padre}_{self.resto}"
+
+
+_TIPOS_PANEL_CLOSET = {
+    ("closed", "left"): "closedleftpanel",
+    ("open", "left"): "openleftpanel",
+    ("closed", "right"): "closedrightpanel",
+    ("open", "right"): "openrightpanel",
+}
+
+_nueva_clasificacion = tuple.__new__
+
+
+def clasificar_nombre(nombre: str) -> ClasificacionNombre:
+    """
+    Clasifica un nombre de objeto en una sola pasada.
+    Los espacios accidentales al inicio o al final se toleran para detectar nombres
+    especiales; la cola de closet y la deteccion de padre usan el nombre tal cual.
+    """
+    recortado = nombre.strip()
+    wall, wall_tipo, resto, especial, toallero, dup, closet_cola = _PATRON_NOMBRE.match(recortado).group(
+        "wall", "wall_tipo", "resto", "especial", "toallero", "dup", "closet_cola")
+    sin_espacios = recortado == nombre
+    if not sin_espacios:
+        closet_cola = _PATRON_NOMBRE.match(nombre).group("closet_cola")
+
+    if especial is not None or toallero is not None:
+        categoria = CATEGORIA_ESPECIAL
+    elif wall is None:
+        categoria = CATEGORIA_LIBRE
+    elif resto is None and dup is None and sin_espacios and wall_tipo in _TIPOS_PADRE:
+        categoria = CATEGORIA_PADRE
+    else:
+        categoria = CATEGORIA_WALL
+
+    if dup is None:
+        dup = ""
+        nombre_base = recortado
+    else:
+        nombre_base = recortado[:-len(dup)]
+
+    tipo_panel_puerta = tipo_panel_closet = None
+    es_closet = False
+    palabras = _PATRON_PALABRAS.findall(nombre.lower())
+    if palabras:
+        es_closet = "closet" in palabras or "wardrobe" in palabras
+        lado = "left" if "left" in palabras else "right" if "right" in palabras else None
+        if lado is not None:
+            tipo_panel_puerta = lado + "panel"
+            # Prioridad: closed+left, open+left, closed+right, open+right.
+            estado = "closed" if "closed" in palabras else "open" if "open" in palabras else None
+            if estado is not None:
+                tipo_panel_closet = _TIPOS_PANEL_CLOSET[estado, lado]
+
+    return _nueva_clasificacion(ClasificacionNombre, (
+        categoria, wall, nombre_base, resto or None, dup, closet_cola,
+        tipo_panel_puerta, tipo_panel_closet, es_closet,
+    ))
@@ -0,0 +1,332 @@
+"""
+Asignacion de indices numericos para nombres "<prefijo><N>" bajo un objeto padre.
+No depende de bpy: trabaja con cualquier objeto que exponga name, parent y children,
+asi sirve tanto para objetos de Blender como para instantaneas de datos.
+Los contadores persistentes se guardan como propiedad personalizada del padre
+(objeto_padre[PROPIEDAD_CONTADORES]) y se leen con get(), como en bpy.
+"""
+import bisect
+import re
+import zlib
+
+# Propiedad personalizada de cada wall/interiorwall/ceiling con sus contadores de indices:
+# {clave: {"padre": nombre del padre, "siguiente": N, "ultimo": nombre del hijo con N - 1,
+#          "huella": huella_hijos del padre al escribirlo}}.
+# La clave es el prefijo sin el nombre del padre: "door", "closet", "closet<N>_door", "primitive".
+PROPIEDAD_CONTADORES = "emparentar_indices"
+
+# Claves que reconstruir_contadores guarda siempre, aunque no haya hijos con ese prefijo.
+CLAVES_CONTADOR = ("door", "closet", "primitive")
+
+
+def patron_indice(prefijo_hijo: str, sufijo: str = r"($|_)"):
+    """Regex de "<prefijo><N><sufijo>" con N en el grupo 1."""
+    return re.compile(f"^{re.escape(prefijo_hijo)}(\\d+){sufijo}")
+
+
+def sufijo_contador(clave: str) -> str:
+    """Sufijo de la regex para una clave de contador: "closet" cuenta los "<padre>_closetN_door"."""
+    return "_door" if clave == "closet" else r"($|_)"
+
+
+def huella_hijos(objeto_padre) -> int:
+    """
+    Suma (mod 2**32) del crc32 de los nombres de los hijos de objeto_padre. No depende del
+    orden de los hijos y cambia si se agrega, quita o renombra alguno. Un recorrido sin regex
+    ni copias: es lo unico que cuesta validar un contador.
+    """
+    huella = 0
+    for hijo in objeto_padre.children:
+        huella += zlib.crc32(hijo.name.encode())
+    return huella & 0xFFFFFFFF
+
+
+class AsignadorIndices:
+    """
+    Reparte indices libres para un prefijo bajo un padre con un solo recorrido inicial.
+    El siguiente indice es el maximo encontrado + 1, ignorando opcionalmente un objeto
+    (exclude_obj).
+    Despues del recorrido, siguiente() y reservar() son O(1) y registrar() es O(log n).
+    Con contador=(siguiente, portador) de leer_contador no recorre los hijos: solo conoce
+    el maximo y su portador, que basta mientras el portador no se excluya ni se reserve.
+    """
+
+    def __init__(self, objeto_padre, prefijo_hijo: str, sufijo: str = r"($|_)", contador=None):
+        self.objeto_padre = objeto_padre
+        self.prefijo_hijo = prefijo_hijo
+        self._patron = patron_indice(prefijo_hijo, sufijo)
+        self.coincidencias = 0  # Llamadas a la regex del prefijo, para estadisticas.
+        self.recorrido = False  # True si conoce todos los hijos, no solo el portador del contador.
+        self._indice_por_obj = {}
+        self._conteo = {}
+        self._ordenados = []  # Indices distintos en uso, ordenados de menor a mayor.
+        if contador is not None:
+            siguiente, portador = contador
+            if portador is not None:
+                self._agregar(portador, siguiente - 1)
+            return
+        for hijo in self.objeto_padre.children:
+            indice = self._indice_de(hijo.name)
+            if indice is not None:
+                self._agregar(hijo, indice)
+        self.recorrido = True
+
+    def _indice_de(self, nombre: str):
+        self.coincidencias += 1
+        match = self._patron.match(nombre)
+        return int(match.group(1)) if match else None
+
+    def _agregar(self, obj, indice: int):
+        self._indice_por_obj[obj] = indice
+        if indice in self._conteo:
+            self._conteo[indice] += 1
+        else:
+            self._conteo[indice] = 1
+            bisect.insort(self._ordenados, indice)
+
+    def _quitar(self, obj):
+        indice = self._indice_por_obj.pop(obj, None)
+        if indice is None:
+            return
+        self._conteo[indice] -= 1
+        if self._conteo[indice] == 0:
+            del self._conteo[indice]
+            del self._ordenados[bisect.bisect_left(self._ordenados, indice)]
+
+    def siguiente(self, exclude_obj=None) -> int:
+        """
+        Retorna el siguiente indice libre sin reservarlo.
+        exclude_obj se ignora en el calculo.
+        """
+        if not self._ordenados:
+            return 0
+        maximo = self._ordenados[-1]
+        if (exclude_obj is not None
+                and self._indice_por_obj.get(exclude_obj) == maximo
+                and self._conteo[maximo] == 1):
+            # El unico portador del maximo esta excluido: vale el segundo mayor.
+            return self._ordenados[-2] + 1 if len(self._ordenados) > 1 else 0
+        return maximo + 1
+
+    def reservar(self, obj) -> int:
+        """
+        Retorna el siguiente indice libre (excluyendo obj) y lo reserva para obj.
+        El llamador debe renombrar obj a "<prefijo><indice>" y emparentarlo al padre.
+        """
+        indice = self.siguiente(exclude_obj=obj)
+        self._quitar(obj)
+        self._agregar(obj, indice)
+        return indice
+
+    def maximo(self, excluir=()):
+        """Retorna (indice, objeto) del mayor indice registrado fuera de excluir, o (-1, None)."""
+        mejor = (-1, None)
+        for obj, indice in self._indice_por_obj.items():
+            if indice > mejor[0] and obj not in excluir:
+                mejor = (indice, obj)
+        return mejor
+
+    def registrar(self, obj):
+        """
+        Sincroniza el estado de obj despues de renombrarlo o emparentarlo.
+        Cubre los casos en que Blender agrega un sufijo .### o el objeto deja el padre.
+        """
+        self._quitar(obj)
+        if obj.parent == self.objeto_padre:
+            indice = self._indice_de(obj.name)
+            if indice is not None:
+                self._agregar(obj, indice)
+
+
+def leer_contador(objeto_padre, clave: str, objetos_escena, huella=None):
+    """
+    Lee el contador de "<padre>_<clave>N" guardado en objeto_padre y lo valida sin regex
+    sobre sus hijos: el padre conserva su nombre, la huella_hijos guardada coincide (ningun
+    hijo se agrego, quito ni renombro a mano desde que se escribio) y el ultimo hijo
+    asignado sigue bajo el padre con el indice siguiente - 1. huella evita recalcularla
+    si quien llama lee varias claves del mismo padre.
+    Retorna (siguiente, portador), con portador None si no hay indices, o None si no hay
+    contador o no es consistente.
+    """
+    contadores = objeto_padre.get(PROPIEDAD_CONTADORES)
+    datos = contadores.get(clave) if contadores is not None else None
+    if datos is None or datos.get("padre") != objeto_padre.name:
+        return None
+    if datos.get("huella") != (huella_hijos(objeto_padre) if huella is None else huella):
+        return None
+    siguiente = datos.get("siguiente", 0)
+    ultimo = datos.get("ultimo", "")
+    if not ultimo:
+        return (0, None) if siguiente == 0 else None
+    portador = objetos_escena.get(ultimo)
+    if portador is None or portador.parent != objeto_padre:
+        return None
+    match = patron_indice(f"{objeto_padre.name}_{clave}", sufijo_contador(clave)).match(ultimo)
+    if not match or int(match.group(1)) != siguiente - 1:
+        return None
+    return siguiente, portador
+
+
+def escribir_contadores(objeto_padre, contadores: dict):
+    """
+    Actualiza la propiedad de contadores de objeto_padre con {clave: (siguiente, portador)};
+    un valor None borra la clave. Conserva las demas claves guardadas y anota en todas la
+    huella_hijos actual: quien cambia los hijos de un padre pasa todas sus claves.
+    """
+    guardados = objeto_padre.get(PROPIEDAD_CONTADORES)
+    datos = {clave: dict(valor) for clave, valor in guardados.items()} if guardados is not None else {}
+    huella = huella_hijos(objeto_padre)
+    for valor in datos.values():
+        valor["huella"] = huella
+    for clave, contador in contadores.items():
+        if contador is None:
+            datos.pop(clave, None)
+            continue
+        siguiente, portador = contador
+        datos[clave] = {"padre": objeto_padre.name, "siguiente": siguiente,
+                        "ultimo": portador.name if portador is not None else "", "huella": huella}
+    objeto_padre[PROPIEDAD_CONTADORES] = datos
+
+
+def patron_contadores(nombre_padre: str):
+    """Una regex para todas las claves de contador de un padre, para indices_contador."""
+    return re.compile(
+        f"^{re.escape(nombre_padre)}_(?:(door|primitive)(\\d+)(?:$|_)|closet(\\d+)_door(?:(\\d+)(?:$|_))?)")
+
+
+def indices_contador(patron, nombre: str) -> tuple:
+    """
+    Pares (clave, indice) que cuenta el nombre de un hijo con un solo match, con las mismas
+    reglas que el recorrido de AsignadorIndices para cada clave.
+    """
+    match = patron.match(nombre)
+    if not match:
+        return ()
+    clave, indice, closet, puerta = match.groups()
+    if clave is not None:
+        return ((clave, int(indice)),)
+    if puerta is None:
+        return (("closet", int(closet)),)
+    return ("closet", int(closet)), (f"closet{closet}_door", int(puerta))
+
+
+def reconstruir_contadores(objeto_padre) -> dict:
+    """
+    Recalcula todos los contadores de objeto_padre con un solo recorrido de sus hijos y una
+    regex por hijo. Retorna {clave: (siguiente, portador)} para escribir_contadores.
+    """
+    patron = patron_contadores(objeto_padre.name)
+    maximos = {clave: (-1, None) for clave in CLAVES_CONTADOR}
+    for hijo in objeto_padre.children:
+        for clave, indice in indices_contador(patron, hijo.name):
+            if indice > maximos.get(clave, (-1, None))[0]:
+                maximos[clave] = (indice, hijo)
+    return {clave: (indice + 1, portador) for clave, (indice, portador) in maximos.items()}
+
+
+_ULTIMO_NUMERO = re.compile(r'(\d+)(?!.*\d)')
+
+
+def _clave_numerica(nombre: str):
+    """
+    Separa nombre en ((prefijo, sufijo), numero) usando su ultimo grupo de digitos.
+    Solo acepta numeros canonicos (sin ceros a la izquierda), que son los unicos que
+    genera el incremento de indices. Retorna None si no aplica.
+    """
+    match = _ULTIMO_NUMERO.search(nombre)
+    if not match:
+        return None
+    digitos = match.group(1)
+    if digitos != str(int(digitos)):
+        return None
+    inicio, fin = match.span(1)
+    return (nombre[:inicio], nombre[fin:]), int(digitos)
+
+
+class IndiceNombres:
+    """
+    Indice de nombres de objetos construido una sola vez por ejecucion.
+    Agrupa los nombres por raiz (texto antes y despues del ultimo numero) con el
+    conjunto de numeros usados, y resuelve el siguiente nombre libre saltando
+    tramos ocupados con punteros comprimidos (tiempo amortizado casi constante).
+    Debe recibir registrar() despues de cada renombrado para mantenerse al dia.
+    """
+
+    def __init__(self, objetos):
+        self._por_nombre = {}
+        self._usados = {}
+        self._saltos = {}  # Por raiz: numero ocupado -> candidato siguiente a revisar.
+        self.coincidencias = 0  # Busquedas de la regex del ultimo numero, para estadisticas.
+        for obj in objetos:
+            self._agregar(obj.name, obj)
+
+    def _agregar(self, nombre: str, obj):
+        self._por_nombre[nombre] = obj
+        self.coincidencias += 1
+        clave = _clave_numerica(nombre)
+        if clave is not None:
+            raiz, numero = clave
+            self._usados.setdefault(raiz, set()).add(numero)
+
+    def _quitar(self, nombre: str):
+        del self._por_nombre[nombre]
+        self.coincidencias += 1
+        clave = _clave_numerica(nombre)
+        if clave is not None:
+            raiz, numero = clave
+            self._usados[raiz].discard(numero)
+            # Los saltos comprimidos pueden pasar por encima del hueco nuevo.
+            self._saltos.pop(raiz, None)
+
+    def get(self, nombre: str):
+        """Retorna el objeto con ese nombre o None, como bpy.data.objects.get."""
+        return self._por_nombre.get(nombre)
+
+    def _primero_libre(self, raiz, desde: int) -> int:
+        usados = self._usados.get(raiz)
+        if not usados:
+            return desde
+        saltos = self._saltos.setdefault(raiz, {})
+        numero = desde
+        camino = []
+        while numero in usados:
+            camino.append(numero)
+            numero = saltos.get(numero, numero + 1)
+        for visitado in camino:
+            saltos[visitado] = numero
+        return numero
+
+    def siguiente_libre(self, nombre_base: str, obj=None) -> str:
+        """
+        Retorna nombre_base si esta libre (o ya es de obj); si no, incrementa su ultimo
+        numero hasta el primer nombre libre o perteneciente a obj.
+        Equivale a repetir bpy.data.objects.get con cada indice, sin recorrerlos uno a uno.
+        """
+        existente = self._por_nombre.get(nombre_base)
+        if existente is None or existente == obj:
+            return nombre_base
+        match = _ULTIMO_NUMERO.search(nombre_base)
+        if not match:
+            return nombre_base
+        inicio, fin = match.span(1)
+        raiz = (nombre_base[:inicio], nombre_base[fin:])
+        numero_base = int(match.group(1))
+        numero = self._primero_libre(raiz, numero_base + 1)
+        # Si obj ya ocupa un numero de la misma raiz antes del primer hueco, se queda con el.
+        clave_propia = _clave_numerica(obj.name) if obj is not None else None
+        if clave_propia is not None and clave_propia[0] == raiz and numero_base < clave_propia[1] < numero:
+            numero = clave_propia[1]
+        return f"{raiz[0]}{numero}{raiz[1]}"
+
+    def sustituir(self, anterior, nuevo):
+        """Pasa el nombre de anterior a nuevo, que lo representa con el mismo nombre."""
+        if self._por_nombre.get(nuevo.name) is anterior:
+            self._por_nombre[nuevo.name] = nuevo
+
+    def registrar(self, obj, nombre_anterior: str):
+        """Actualiza el indice despues de renombrar obj desde nombre_anterior."""
+        if nombre_anterior == obj.name:
+            return
+        if self._por_nombre.get(nombre_anterior) == obj:
+            self._quitar(nombre_anterior)
+        self._agregar(obj.name, obj)
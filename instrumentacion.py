@@ -0,0 +1,90 @@
+"""
+Instrumentacion opcional de una ejecucion del operador: tiempo por fase y contadores
+(llamadas a bpy.ops, coincidencias de regex, busquedas en bpy.data.objects, renombrados
+y objetos procesados). Desactivada, fase() retorna un contexto nulo compartido y
+contar() no hace nada, asi el costo es una comprobacion por llamada.
+No depende de bpy.
+"""
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+_CONTEXTO_NULO = nullcontext()
+
+
+class Instrumentacion:
+    """Acumula tiempos por fase (en orden de inicio) y contadores de una ejecucion."""
+
+    def __init__(self, activa: bool = False):
+        self.activa = activa
+        self.fases = {}
+        self.contadores = {}
+
+    def fase(self, nombre: str):
+        """Contexto que suma el tiempo de pared del bloque a la fase nombre."""
+        if not self.activa:
+            return _CONTEXTO_NULO
+        return self._medir_fase(nombre)
+
+    @contextmanager
+    def _medir_fase(self, nombre: str):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fases[nombre] = self.fases.get(nombre, 0.0) + time.perf_counter() - inicio
+
+    def contar(self, clave: str, cantidad: int = 1):
+        if self.activa:
+            self.contadores[clave] = self.contadores.get(clave, 0) + cantidad
+
+    def resumen(self) -> str:
+        """Una linea para self.report con fases en milisegundos y contadores."""
+        fases = ", ".join(f"{nombre} {segundos * 1000:.1f} ms" for nombre, segundos in self.fases.items())
+        contadores = ", ".join(f"{clave} {valor}" for clave, valor in self.contadores.items())
+        return f"Medición: {fases}; {contadores}"
+
+    def registro(self, **datos) -> dict:
+        """Registro serializable de la ejecucion con datos adicionales (p. ej. archivo y padre)."""
+        return {
+            "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **datos,
+            "fases_ms": {nombre: round(segundos * 1000, 3) for nombre, segundos in self.fases.items()},
+            "contadores": dict(self.contadores),
+        }
+
+    def anexar_jsonl(self, ruta: str, **datos):
+        """Agrega el registro como una linea JSON al final de ruta."""
+        with open(ruta, "a", encoding="utf-8") as archivo:
+            archivo.write(json.dumps(self.registro(**datos), ensure_ascii=False) + "\n")
+
+
+class ObjetosContados:
+    """
+    Envuelve bpy.data.objects (o cualquier coleccion por nombre) y cuenta cada acceso
+    por nombre y cada recorrido completo en la instrumentacion.
+    """
+
+    def __init__(self, objetos, instrumentacion: Instrumentacion):
+        self._objetos = objetos
+        self._instrumentacion = instrumentacion
+
+    def get(self, nombre: str, defecto=None):
+        self._instrumentacion.contar("busquedas_nombre")
+        return self._objetos.get(nombre, defecto)
+
+    def __getitem__(self, nombre: str):
+        self._instrumentacion.contar("busquedas_nombre")
+        return self._objetos[nombre]
+
+    def __contains__(self, nombre: str) -> bool:
+        self._instrumentacion.contar("busquedas_nombre")
+        return nombre in self._objetos
+
+    def __iter__(self):
+        self._instrumentacion.contar("recorridos_escena")
+        return iter(self._objetos)
+
+    def __len__(self) -> int:
+        return len(self._objetos)
@@ -0,0 +1,130 @@
+"""
+Manifiesto de renombrados y emparentados para repetirlos sobre otra version de la geometria.
+Cada entrada es clave estable, nombre anterior, nombre nuevo y padre (nombre final).
+Se escribe en streaming como JSON lines o CSV (segun la extension .csv) y se lee de la
+misma forma, sin cargar el archivo entero.
+La clave estable es el nombre de los datos (malla) del objeto o un UUID guardado como
+propiedad personalizada; si falta, la entrada se resuelve por el nombre anterior.
+No depende de bpy.
+"""
+import csv
+import json
+import os
+import uuid
+
+CLAVE_DATOS = 'DATOS'
+CLAVE_UUID = 'UUID'
+
+# Propiedad personalizada con el UUID de cada objeto exportado con CLAVE_UUID.
+PROPIEDAD_UUID = "emparentar_uuid"
+
+CAMPOS = ("clave", "nombre_anterior", "nombre_nuevo", "padre")
+
+
+def clave_objeto(obj, tipo_clave: str, asignar: bool = False) -> str:
+    """
+    Clave estable de obj: nombre de sus datos o su UUID. Con asignar, crea el UUID si
+    falta (modifica obj). Retorna "" si no hay clave.
+    """
+    if tipo_clave == CLAVE_UUID:
+        valor = obj.get(PROPIEDAD_UUID)
+        if valor is None and asignar:
+            valor = obj[PROPIEDAD_UUID] = uuid.uuid4().hex
+        return valor or ""
+    return obj.data.name if obj.data is not None else ""
+
+
+def entradas_plan(plan, tipo_clave: str):
+    """
+    Una entrada por objeto de un plan ya aplicado, en el orden del plan: nombre antes del
+    plan, nombre y padre actuales. Los nombres temporales intermedios no aparecen.
+    """
+    anteriores = {}
+    for accion in plan.acciones:
+        anteriores.setdefault(accion.objeto, accion.nombre_anterior)
+    for obj, nombre_anterior in anteriores.items():
+        yield {
+            "clave": clave_objeto(obj, tipo_clave, asignar=True),
+            "nombre_anterior": nombre_anterior,
+            "nombre_nuevo": obj.name,
+            "padre": obj.parent.name if obj.parent is not None else "",
+        }
+
+
+def _es_csv(ruta: str) -> bool:
+    return os.path.splitext(ruta)[1].lower() == ".csv"
+
+
+def escribir_manifiesto(ruta: str, entradas) -> int:
+    """
+    Agrega las entradas al final de ruta (JSON lines, o CSV con encabezado si el archivo
+    es nuevo). Retorna la cantidad escrita.
+    """
+    escritas = 0
+    if _es_csv(ruta):
+        nuevo = not os.path.exists(ruta) or os.path.getsize(ruta) == 0
+        with open(ruta, "a", encoding="utf-8", newline="") as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=CAMPOS)
+            if nuevo:
+                escritor.writeheader()
+            for entrada in entradas:
+                escritor.writerow(entrada)
+                escritas += 1
+        return escritas
+    with open(ruta, "a", encoding="utf-8") as archivo:
+        for entrada in entradas:
+            archivo.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+            escritas += 1
+    return escritas
+
+
+def _filas_jsonl(archivo):
+    """(numero de linea, objeto) por cada linea no vacia; una linea que no es un objeto JSON lanza ValueError."""
+    for numero, linea in enumerate(archivo, 1):
+        if not linea.strip():
+            continue
+        try:
+            fila = json.loads(linea)
+        except ValueError as error:
+            raise ValueError(f"línea {numero}: {error}") from error
+        if not isinstance(fila, dict):
+            raise ValueError(f"línea {numero}: se esperaba un objeto JSON")
+        yield numero, fila
+
+
+def _filas_csv(archivo):
+    filas = csv.DictReader(archivo)
+    try:
+        for fila in filas:
+            yield filas.line_num, fila
+    except csv.Error as error:
+        raise ValueError(f"línea {filas.line_num}: {error}") from error
+
+
+def leer_manifiesto(ruta: str):
+    """
+    Genera las entradas de ruta (JSON lines o CSV) de una en una, con los CAMPOS como str.
+    Un archivo mal formado (una linea que no es un objeto o un campo que no es texto)
+    lanza ValueError con el numero de linea.
+    """
+    with open(ruta, encoding="utf-8", newline="" if _es_csv(ruta) else None) as archivo:
+        filas = _filas_csv(archivo) if _es_csv(ruta) else _filas_jsonl(archivo)
+        for numero, fila in filas:
+            entrada = {campo: fila.get(campo) or "" for campo in CAMPOS}
+            for campo, valor in entrada.items():
+                if not isinstance(valor, str):
+                    raise ValueError(f"línea {numero}: el campo '{campo}' no es texto")
+            yield entrada
+
+
+def indice_claves(objetos, tipo_clave: str) -> dict:
+    """
+    {clave: objeto} con un recorrido de objetos. Una clave compartida por varios objetos
+    (p. ej. mallas enlazadas) queda en None porque no identifica a ninguno.
+    """
+    indice = {}
+    for obj in objetos:
+        clave = clave_objeto(obj, tipo_clave)
+        if clave:
+            indice[clave] = None if clave in indice else obj
+    return indice
@@ -0,0 +1,154 @@
+"""
+Normalizacion sin interfaz de archivos .blend completos.
+Dentro de Blender aplica las reglas del addon a los hijos candidatos de cada
+wallN/interiorwallN/ceilingN del archivo abierto y lo guarda:
+    blender -b archivo.blend --factory-startup --python normalizar.py -- [--solo-previsualizar]
+Fuera de Blender reparte los .blend de un directorio entre varios procesos de Blender
+e imprime un resumen por archivo (renombrados, tiempo y fallos de reglas):
+    python normalizar.py DIRECTORIO [--procesos N] [--blender RUTA] [--jsonl RUTA]
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+_RUTA_SCRIPT = os.path.abspath(__file__)
+_DIR_ADDON = os.path.dirname(_RUTA_SCRIPT)
+
+# Prefijo de la linea de stdout con la que cada proceso de Blender entrega su resumen.
+MARCA_RESUMEN = "NORMALIZAR_RESUMEN "
+
+
+def _importar_addon():
+    """Importa el paquete del addon desde su carpeta, aunque no este instalado en Blender."""
+    import importlib
+    directorio_padre, nombre_paquete = os.path.split(_DIR_ADDON)
+    if directorio_padre not in sys.path:
+        sys.path.insert(0, directorio_padre)
+    return importlib.import_module(nombre_paquete)
+
+
+def normalizar_archivo_abierto(solo_previsualizar: bool = False) -> dict:
+    """
+    Normaliza el archivo abierto en Blender y lo guarda (salvo solo_previsualizar).
+    Retorna el resumen de normalizar_escena con el archivo y los segundos empleados.
+    """
+    import bpy
+    addon = _importar_addon()
+    inicio = time.perf_counter()
+    resumen = addon.normalizar_escena(bpy.context, aplicar=not solo_previsualizar)
+    if not solo_previsualizar and resumen["renombrados"] + resumen["emparentados"] > 0:
+        bpy.ops.wm.save_mainfile()
+    resumen["archivo"] = bpy.data.filepath
+    resumen["segundos"] = time.perf_counter() - inicio
+    return resumen
+
+
+def _normalizar_en_proceso(archivo: str, blender: str, solo_previsualizar: bool, timeout: float) -> dict:
+    """Lanza un proceso de Blender sobre archivo y lee su resumen de stdout."""
+    comando = [blender, "-b", archivo, "--factory-startup", "--python-exit-code", "1",
+               "--python", _RUTA_SCRIPT, "--"]
+    if solo_previsualizar:
+        comando.append("--solo-previsualizar")
+    inicio = time.perf_counter()
+    resumen = {"archivo": archivo, "renombrados": 0, "emparentados": 0, "fallos": [], "error": None}
+    try:
+        proceso = subprocess.run(comando, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as error:
+        resumen["error"] = str(error)
+    else:
+        for linea in proceso.stdout.splitlines():
+            if linea.startswith(MARCA_RESUMEN):
+                resumen.update(json.loads(linea[len(MARCA_RESUMEN):]))
+                break
+        else:
+            salida = (proceso.stderr or proceso.stdout).strip().splitlines()
+            resumen["error"] = salida[-1] if salida else f"Blender terminó con código {proceso.returncode}"
+    resumen["archivo"] = archivo
+    resumen["segundos_proceso"] = time.perf_counter() - inicio
+    return resumen
+
+
+def normalizar_directorio(directorio: str, blender: str = "blender", procesos: int = None,
+                          solo_previsualizar: bool = False, recursivo: bool = False,
+                          timeout: float = None):
+    """
+    Normaliza cada .blend de directorio en un proceso de Blender propio, con hasta
+    procesos en paralelo (por defecto, uno por nucleo). Genera los resumenes en el
+    orden en que terminan.
+    """
+    patron = os.path.join(directorio, "**", "*.blend") if recursivo else os.path.join(directorio, "*.blend")
+    archivos = sorted(glob.glob(patron, recursive=recursivo))
+    # Cada hilo solo espera a su proceso de Blender; el trabajo ocurre en los procesos.
+    with ThreadPoolExecutor(max_workers=procesos or os.cpu_count() or 1) as pool:
+        futuros = [pool.submit(_normalizar_en_proceso, archivo, blender, solo_previsualizar, timeout)
+                   for archivo in archivos]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+
+def _formatear_resumen(resumen: dict) -> str:
+    if resumen.get("error"):
+        return f"ERROR {resumen['archivo']}: {resumen['error']}"
+    linea = (f"{resumen['archivo']}: {resumen['renombrados']} renombrados, "
+             f"{resumen['emparentados']} emparentados, {resumen['segundos']:.2f} s")
+    if resumen["fallos"]:
+        linea += f", {len(resumen['fallos'])} fallos"
+        linea += "".join(f"\n    {fallo}" for fallo in resumen["fallos"])
+    return linea
+
+
+def _main_blender(argumentos: list) -> int:
+    parser = argparse.ArgumentParser(prog="normalizar.py (Blender)")
+    parser.add_argument("--solo-previsualizar", action="store_true",
+                        help="Cuenta los cambios sin aplicarlos ni guardar el archivo")
+    opciones = parser.parse_args(argumentos)
+    resumen = normalizar_archivo_abierto(opciones.solo_previsualizar)
+    print(MARCA_RESUMEN + json.dumps(resumen, ensure_ascii=False))
+    return 0
+
+
+def _main_directorio(argumentos: list) -> int:
+    parser = argparse.ArgumentParser(prog="normalizar.py")
+    parser.add_argument("directorio", help="Carpeta con archivos .blend")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos de Blender en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Ejecutable de Blender")
+    parser.add_argument("--recursivo", action="store_true", help="Incluir subcarpetas")
+    parser.add_argument("--solo-previsualizar", action="store_true", help="No aplicar cambios ni guardar")
+    parser.add_argument("--timeout", type=float, default=None, help="Segundos máximos por archivo")
+    parser.add_argument("--jsonl", default=None, help="Escribe un resumen JSON por línea en esta ruta")
+    opciones = parser.parse_args(argumentos)
+
+    salida_jsonl = open(opciones.jsonl, "w", encoding="utf-8") if opciones.jsonl else None
+    totales = {"archivos": 0, "renombrados": 0, "fallos": 0, "errores": 0}
+    inicio = time.perf_counter()
+    try:
+        for resumen in normalizar_directorio(opciones.directorio, opciones.blender, opciones.procesos,
+                                             opciones.solo_previsualizar, opciones.recursivo, opciones.timeout):
+            print(_formatear_resumen(resumen), flush=True)
+            if salida_jsonl is not None:
+                salida_jsonl.write(json.dumps(resumen, ensure_ascii=False) + "\n")
+            totales["archivos"] += 1
+            totales["renombrados"] += resumen["renombrados"]
+            totales["fallos"] += len(resumen["fallos"])
+            totales["errores"] += resumen["error"] is not None
+    finally:
+        if salida_jsonl is not None:
+            salida_jsonl.close()
+    print(f"{totales['archivos']} archivos, {totales['renombrados']} renombrados, "
+          f"{totales['fallos']} fallos de reglas, {totales['errores']} errores en "
+          f"{time.perf_counter() - inicio:.1f} s")
+    return 1 if totales["errores"] else 0
+
+
+if __name__ == "__main__":
+    try:
+        import bpy  # noqa: F401
+    except ImportError:
+        sys.exit(_main_directorio(sys.argv[1:]))
+    argumentos_script = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    sys.exit(_main_blender(argumentos_script))
@@ -0,0 +1,806 @@
+"""
+Planificador de renombrados y emparentados sin tocar bpy.
+Lee una instantanea ligera (nombres, padres e hijos de los objetos involucrados) y
+produce un plan inmutable de acciones (objeto, nombre nuevo, padre nuevo) que luego
+aplica el addon en un solo lote. Sirve para previsualizar (dry-run), probar y medir
+las reglas fuera de Blender con cualquier objeto que exponga name, parent y children.
+"""
+import re
+from collections import deque
+from typing import NamedTuple, Optional
+
+from .clasificador import CATEGORIA_PADRE, clasificar_nombre
+from .indices import (
+    PROPIEDAD_CONTADORES,
+    AsignadorIndices,
+    IndiceNombres,
+    huella_hijos,
+    indices_contador,
+    leer_contador,
+    patron_contadores,
+    sufijo_contador,
+)
+
+_SUFIJO_NUMERICO = re.compile(r'^(.*)\.(\d+)$')
+
+# Prefijo de los nombres temporales usados para romper ciclos de intercambio de nombres.
+PREFIJO_TEMPORAL = "__emparentar_tmp"
+
+
+class AccionPlan(NamedTuple):
+    """
+    Cambio sobre un objeto real. nombre_nuevo o padre_nuevo en None significa sin cambio.
+    Cada objeto aparece una vez, salvo que un ciclo de intercambios obligue a pasar
+    antes por un nombre temporal (PREFIJO_TEMPORAL).
+    """
+    objeto: object
+    nombre_anterior: str
+    nombre_nuevo: Optional[str]
+    padre_nuevo: Optional[object]
+
+
+class Plan(NamedTuple):
+    """
+    Resultado inmutable de planificar una seleccion.
+    acciones se aplica en orden, sin colisiones de nombres en ningun paso; informes son
+    (nivel, texto) para self.report y mensajes son diagnosticos de consola.
+    estadisticas cuenta nodos, clasificaciones y coincidencias de regex de la planificacion.
+    contadores es {objeto padre: {clave: (siguiente, portador) o None}} con el estado de los
+    contadores persistentes despues de aplicar el plan (None los invalida), para
+    indices.escribir_contadores.
+    """
+    acciones: tuple
+    informes: tuple
+    mensajes: tuple
+    estadisticas: Optional[dict] = None
+    contadores: Optional[dict] = None
+
+
+class NodoInstantanea:
+    """
+    Copia ligera de un objeto: nombre, padre e hijos, modificables durante la planificacion.
+    Los hijos reales se copian en el primer acceso a children, no al crear el nodo.
+    """
+    __slots__ = ("objeto", "name", "nombre_original", "padre_original", "_parent", "_hijos", "_pendiente")
+
+    def __init__(self, objeto, nombre: str, instantanea=None):
+        self.objeto = objeto
+        self.name = nombre
+        self.nombre_original = nombre
+        self.padre_original = None
+        self._parent = None
+        self._hijos = []
+        self._pendiente = instantanea  # Instantanea que copia los hijos reales en el primer acceso.
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, nodo_padre):
+        if self._parent is not None:
+            self._parent._hijos.remove(self)
+        self._parent = nodo_padre
+        if nodo_padre is not None:
+            nodo_padre._hijos.append(self)
+
+    @property
+    def children(self) -> tuple:
+        if self._pendiente is not None:
+            instantanea, self._pendiente = self._pendiente, None
+            # Los hijos que ya tenian nodo estan en _hijos o el plan ya los movio.
+            for hijo in self.objeto.children:
+                instantanea.agregar(hijo)
+        return tuple(self._hijos)
+
+    def __repr__(self):
+        return f"<NodoInstantanea {self.name!r}>"
+
+
+class Instantanea:
+    """
+    Estado de escena que necesita el planificador: un nodo por objeto involucrado (wall,
+    seleccion y sus ancestros; los hijos se agregan al recorrer children) y acceso por
+    nombre a los demas objetos de la escena para detectar colisiones.
+    Cada instantanea se consume en una sola planificacion, que modifica sus nodos.
+    """
+
+    def __init__(self, objetos_escena):
+        self.objetos_escena = objetos_escena
+        self.nodos = {}
+        self.seleccion = set()  # Objetos a procesar; sus contadores no se pueden usar como portadores.
+        self._asignados = {}  # Nombres dados durante la planificacion -> nodo.
+        self._indice_nombres = None
+        self._huellas = {}  # Objeto padre -> indices.huella_hijos, una vez por padre.
+
+    def agregar(self, objeto) -> NodoInstantanea:
+        """Agrega objeto (y su padre, sin hijos) si no estaba; retorna su nodo."""
+        nodo = self.nodos.get(objeto)
+        if nodo is not None:
+            return nodo
+        nodo = NodoInstantanea(objeto, objeto.name, self)
+        self.nodos[objeto] = nodo
+        if self._indice_nombres is not None:
+            self._indice_nombres.sustituir(objeto, nodo)
+        if objeto.parent is not None:
+            nodo.parent = self.agregar(objeto.parent)
+            nodo.padre_original = nodo.parent
+        return nodo
+
+    def nodo(self, objeto) -> NodoInstantanea:
+        return self.nodos[objeto]
+
+    def contador(self, nodo_padre: NodoInstantanea, clave: str):
+        """
+        Contador guardado de "<padre>_<clave>N" (indices.leer_contador) con el portador como
+        nodo. Se descarta si el portador esta en la seleccion, porque el plan lo moveria.
+        Retorna (siguiente, nodo portador o None) o None.
+        """
+        objeto = nodo_padre.objeto
+        if objeto.get(PROPIEDAD_CONTADORES) is None:
+            return None
+        if objeto not in self._huellas:
+            self._huellas[objeto] = huella_hijos(objeto)
+        lectura = leer_contador(objeto, clave, self.objetos_escena, self._huellas[objeto])
+        if lectura is None:
+            return None
+        siguiente, portador = lectura
+        if portador is None:
+            return siguiente, None
+        if portador in self.seleccion:
+            return None
+        nodo = self.agregar(portador)
+        if nodo.parent is not nodo_padre:
+            return None
+        return siguiente, nodo
+
+    @property
+    def indice_nombres(self) -> IndiceNombres:
+        """Indice de nombres de toda la escena; se construye en el primer uso (ver siguiente_libre)."""
+        if self._indice_nombres is None:
+            self._indice_nombres = IndiceNombres(self.nodos.get(obj, obj) for obj in self.objetos_escena)
+        return self._indice_nombres
+
+    def dueno(self, nombre: str):
+        """Retorna el nodo u objeto externo que tendria ese nombre en el estado planificado."""
+        if self._indice_nombres is not None:
+            return self._indice_nombres.get(nombre)
+        nodo = self._asignados.get(nombre)
+        if nodo is not None and nodo.name == nombre:
+            return nodo
+        objeto = self.objetos_escena.get(nombre)
+        if objeto is None:
+            return None
+        nodo = self.nodos.get(objeto)
+        if nodo is None:
+            return objeto
+        # El objeto real sigue con ese nombre, pero el plan ya lo renombro.
+        return nodo if nodo.name == nombre else None
+
+    def siguiente_libre(self, nombre_base: str, nodo: NodoInstantanea) -> str:
+        """
+        nombre_base si esta libre (o ya es de nodo) en el estado planificado; si no, el
+        siguiente libre segun IndiceNombres.siguiente_libre. El indice de toda la escena
+        solo se construye en la primera colision.
+        """
+        dueno = self.dueno(nombre_base)
+        if dueno is None or dueno is nodo:
+            return nombre_base
+        return self.indice_nombres.siguiente_libre(nombre_base, nodo)
+
+    def es_externo(self, nombre: str) -> bool:
+        """Indica si el nombre lo tiene un objeto de la escena que no esta en la instantanea."""
+        dueno = self.dueno(nombre)
+        return dueno is not None and not isinstance(dueno, NodoInstantanea)
+
+    def nombre_libre(self, nombre: str, ocupados) -> bool:
+        """Libre en el estado final: ni en ocupados (nombres de nodos) ni en un objeto externo."""
+        if nombre in ocupados:
+            return False
+        objeto = self.objetos_escena.get(nombre)
+        return objeto is None or objeto in self.nodos
+
+    def nombre_unico(self, nombre: str, nodo: NodoInstantanea) -> str:
+        """Simula el sufijo .### que Blender agrega al asignar un nombre ocupado."""
+        dueno = self.dueno(nombre)
+        if dueno is None or dueno is nodo:
+            return nombre
+        match = _SUFIJO_NUMERICO.match(nombre)
+        base = match.group(1) if match else nombre
+        numero = 1
+        while True:
+            candidato = f"{base}.{numero:03d}"
+            dueno = self.dueno(candidato)
+            if dueno is None or dueno is nodo:
+                return candidato
+            numero += 1
+
+    def renombrar(self, nodo: NodoInstantanea, nombre: str) -> str:
+        """
+        Asigna al nodo su nombre planificado y retorna el nombre resultante.
+        Solo un objeto externo a la instantanea fuerza el sufijo .###: si el nombre lo
+        tiene otro nodo, se permite durante la planificacion porque ese nodo puede
+        cambiar de nombre mas adelante; los duplicados que queden se resuelven al final.
+        """
+        if nombre == nodo.name:
+            return nombre
+        if self.es_externo(nombre):
+            nombre = self.nombre_unico(nombre, nodo)
+        nombre_anterior = nodo.name
+        nodo.name = nombre
+        self._asignados[nombre] = nodo
+        if self._indice_nombres is not None:
+            self._indice_nombres.registrar(nodo, nombre_anterior)
+        return nombre
+
+
+def tomar_instantanea(objeto_padre, objetos_a_procesar, objetos_escena) -> Instantanea:
+    """
+    Copia el estado minimo para planificar: el padre y cada objeto a procesar; sus hijos
+    se copian solo si el plan los recorre. objetos_escena debe ofrecer get(nombre) e iteracion
+    (p. ej. bpy.data.objects) y solo se recorre si hace falta resolver nombres especiales.
+    """
+    return tomar_instantanea_grupos([(objeto_padre, objetos_a_procesar)], objetos_escena)
+
+
+def tomar_instantanea_grupos(grupos, objetos_escena) -> Instantanea:
+    """Como tomar_instantanea, para varios padres: grupos es [(objeto_padre, objetos_a_procesar)]."""
+    instantanea = Instantanea(objetos_escena)
+    for objeto_padre, objetos_a_procesar in grupos:
+        instantanea.agregar(objeto_padre)
+        instantanea.seleccion.update(objetos_a_procesar)
+        for obj in objetos_a_procesar:
+            instantanea.agregar(obj)
+    return instantanea
+
+
+class _ConstructorPlan:
+    """
+    Simula los cambios sobre la instantanea y, al construir, los reduce a un nombre y un
+    padre final por objeto, ordenados para que ningun renombrado choque con otro.
+    """
+
+    def __init__(self, instantanea: Instantanea):
+        self.instantanea = instantanea
+        self.tocados = {}  # Nodos modificados, en orden de primera modificacion.
+        self.informes = []
+        self.mensajes = []
+        self.clasificaciones = 0
+        self._asignadores = []
+        self._coincidencias_contadores = 0
+        # (nodo padre, clave) -> (asignador, (indice maximo, nodo portador) de los hijos sin tocar).
+        self._contados = {}
+
+    def clasificar(self, nombre: str):
+        """clasificar_nombre contando la llamada para las estadisticas del plan."""
+        self.clasificaciones += 1
+        return clasificar_nombre(nombre)
+
+    def asignador(self, objeto_padre, prefijo_hijo: str, **opciones) -> AsignadorIndices:
+        """Crea un AsignadorIndices cuyas coincidencias de regex suman en las estadisticas."""
+        asignador = AsignadorIndices(objeto_padre, prefijo_hijo, **opciones)
+        self._asignadores.append(asignador)
+        return asignador
+
+    def asignador_contado(self, wall: NodoInstantanea, clave: str) -> AsignadorIndices:
+        """
+        Asignador de "<wall>_<clave>N" que parte del contador guardado en el wall si es
+        consistente, sin copiar sus hijos a la instantanea. Su estado final entra en
+        Plan.contadores.
+        """
+        contador = self.instantanea.contador(wall, clave)
+        asignador = self.asignador(wall, f"{wall.name}_{clave}", sufijo=sufijo_contador(clave), contador=contador)
+        if contador is not None:
+            # El contador describe la escena antes del plan: sumar los hijos ya movidos o renombrados.
+            for nodo in self.tocados:
+                if nodo.parent is wall:
+                    asignador.registrar(nodo)
+        if (wall, clave) not in self._contados:
+            self._contados[(wall, clave)] = (asignador, asignador.maximo(excluir=self.tocados))
+        return asignador
+
+    def mover(self, nodo: NodoInstantanea, nombre: Optional[str] = None, padre: Optional[NodoInstantanea] = None):
+        """Simula renombrar y/o emparentar nodo."""
+        if nombre is not None and nombre != nodo.name:
+            self.instantanea.renombrar(nodo, nombre)
+            self.tocados[nodo] = None
+        if padre is not None and nodo.parent is not padre:
+            nodo.parent = padre
+            self.tocados[nodo] = None
+
+    def informar(self, nivel: str, texto: str):
+        self.informes.append((nivel, texto))
+
+    def _resolver_duplicados(self):
+        """Deja un solo dueno por nombre final; los nodos sin renombrar conservan el suyo."""
+        por_nombre = {}
+        for nodo in self.instantanea.nodos.values():
+            por_nombre.setdefault(nodo.name, []).append(nodo)
+        ocupados = set(por_nombre)
+        orden = {nodo: posicion for posicion, nodo in enumerate(self.tocados)}
+        for nombre, nodos in por_nombre.items():
+            if len(nodos) < 2:
+                continue
+            quietos = [nodo for nodo in nodos if nodo.name == nodo.nombre_original]
+            conservador = quietos[0] if quietos else min(nodos, key=orden.__getitem__)
+            match = _SUFIJO_NUMERICO.match(nombre)
+            base = match.group(1) if match else nombre
+            numero = 1
+            for nodo in nodos:
+                if nodo is conservador:
+                    continue
+                while not self.instantanea.nombre_libre(f"{base}.{numero:03d}", ocupados):
+                    numero += 1
+                nodo.name = f"{base}.{numero:03d}"
+                ocupados.add(nodo.name)
+
+    def _nombre_temporal(self, usados: set) -> str:
+        numero = len(usados)
+        while True:
+            candidato = f"{PREFIJO_TEMPORAL}{numero}"
+            if candidato not in usados and self.instantanea.objetos_escena.get(candidato) is None:
+                usados.add(candidato)
+                return candidato
+            numero += 1
+
+    def _ordenar_renombrados(self, renombrados: list) -> list:
+        """
+        Ordena los renombrados para aplicarlos sin colisiones: cada uno espera a que el
+        dueno actual de su nombre final lo libere. Si todos esperan en un ciclo (p. ej.
+        A <-> B), uno pasa primero por un nombre temporal.
+        Retorna pasos (nodo, nombre_anterior, nombre_nuevo, es_final).
+        """
+        ocupante = {nodo.nombre_original: nodo for nodo in renombrados}
+        actual = {nodo: nodo.nombre_original for nodo in renombrados}
+        listos = deque()
+        esperando = {}
+        for nodo in renombrados:
+            dueno = ocupante.get(nodo.name)
+            if dueno is None or dueno is nodo:
+                listos.append(nodo)
+            else:
+                esperando.setdefault(nodo.name, []).append(nodo)
+
+        pasos = []
+        temporales = set()
+        pendientes = len(renombrados)
+        while pendientes:
+            if not listos:
+                # Todos esperan: seguir la cadena de esperas hasta encontrar un ciclo.
+                nodo = next(iter(esperando.values()))[0]
+                vistos = set()
+                while nodo not in vistos:
+                    vistos.add(nodo)
+                    nodo = ocupante[nodo.name]
+                temporal = self._nombre_temporal(temporales)
+                liberado = actual[nodo]
+                pasos.append((nodo, liberado, temporal, False))
+                del ocupante[liberado]
+                ocupante[temporal] = nodo
+                actual[nodo] = temporal
+                listos.extend(esperando.pop(liberado, ()))
+                continue
+            nodo = listos.popleft()
+            liberado = actual[nodo]
+            pasos.append((nodo, liberado, nodo.name, True))
+            del ocupante[liberado]
+            actual[nodo] = nodo.name
+            pendientes -= 1
+            listos.extend(esperando.pop(liberado, ()))
+        return pasos
+
+    def construir(self) -> Plan:
+        self._resolver_duplicados()
+        renombrados = [nodo for nodo in self.tocados if nodo.name != nodo.nombre_original]
+        acciones = []
+        for nodo, anterior, nuevo, es_final in self._ordenar_renombrados(renombrados):
+            padre_nuevo = None
+            if es_final and nodo.parent is not nodo.padre_original:
+                padre_nuevo = nodo.parent.objeto
+            acciones.append(AccionPlan(nodo.objeto, anterior, nuevo, padre_nuevo))
+        for nodo in self.tocados:
+            if nodo.name == nodo.nombre_original and nodo.parent is not nodo.padre_original:
+                acciones.append(AccionPlan(nodo.objeto, nodo.name, None, nodo.parent.objeto))
+        contadores = self._contadores()
+        return Plan(tuple(acciones), tuple(self.informes), tuple(self.mensajes), self._estadisticas(), contadores)
+
+    def _contadores(self) -> dict:
+        """
+        Contadores de cada padre despues del plan: los usados en la planificacion y los ya
+        guardados en padres que ganan o pierden hijos. El maximo de los hijos sin tocar se
+        conserva y solo se revisan, con una regex por nodo, los nombres finales de los nodos
+        movidos o renombrados. Un asignador que recorrio los hijos da el maximo exacto al
+        final; si el portador de un maximo contado cambia en el plan, queda en None.
+        """
+        tocados_por_padre = {}
+        for nodo in self.tocados:
+            tocados_por_padre.setdefault(nodo.parent, []).append(nodo)
+        por_padre = {}
+        for (padre, clave), (asignador, maximo) in self._contados.items():
+            if asignador.recorrido:
+                maximo = asignador.maximo(excluir=self.tocados)
+            por_padre.setdefault(padre, {})[clave] = maximo
+        for padre in {*tocados_por_padre, *(nodo.padre_original for nodo in self.tocados)}:
+            if padre is None or clasificar_nombre(padre.name).categoria != CATEGORIA_PADRE:
+                continue
+            guardados = padre.objeto.get(PROPIEDAD_CONTADORES)
+            for clave in (guardados.keys() if guardados is not None else ()):
+                maximos = por_padre.setdefault(padre, {})
+                if clave not in maximos:
+                    contador = self.instantanea.contador(padre, clave)
+                    maximos[clave] = (contador[0] - 1, contador[1]) if contador is not None else None
+
+        resultado = {}
+        for padre, maximos in por_padre.items():
+            maximos = {clave: (None if maximo is None or maximo[1] in self.tocados else maximo)
+                       for clave, maximo in maximos.items()}
+            patron = patron_contadores(padre.name)
+            for nodo in tocados_por_padre.get(padre, ()):
+                self._coincidencias_contadores += 1
+                for clave, indice in indices_contador(patron, nodo.name):
+                    maximo = maximos.get(clave)
+                    if maximo is not None and indice > maximo[0]:
+                        maximos[clave] = (indice, nodo)
+            resultado[padre.objeto] = {
+                clave: (None if maximo is None else (maximo[0] + 1, maximo[1].objeto if maximo[1] is not None else None))
+                for clave, maximo in maximos.items()}
+        return resultado
+
+    def _estadisticas(self) -> dict:
+        indice_nombres = self.instantanea._indice_nombres
+        coincidencias = self._coincidencias_contadores
+        coincidencias += sum(asignador.coincidencias for asignador in self._asignadores)
+        if indice_nombres is not None:
+            coincidencias += indice_nombres.coincidencias
+        return {
+            "nodos": len(self.instantanea.nodos),
+            "clasificaciones": self.clasificaciones,
+            # Cada clasificacion es un match y un findall sobre el nombre.
+            "coincidencias_regex": coincidencias + 2 * self.clasificaciones,
+        }
+
+
+def _planificar_puerta(plan: _ConstructorPlan, raiz: NodoInstantanea, wall: NodoInstantanea,
+                       asignador_puertas: Optional[AsignadorIndices] = None):
+    # --- Paso 1: Definir prefijos base ---
+    # En lote, el asignador se comparte para que cada puerta tome el siguiente indice.
+    if asignador_puertas is None:
+        asignador_puertas = plan.asignador_contado(wall, "door")
+    base_door_idx = asignador_puertas.siguiente(exclude_obj=raiz)
+    nombre_base_puerta = f"{wall.name}_door{base_door_idx}"
+
+    # Guardar hijos (paneles) del objeto raíz ANTES de renombrar/reemparentar el objeto raíz
+    hijos_originales_paneles = raiz.children
+
+    # --- Paso 2: Renombrar marco y emparentar ---
+    plan.mover(raiz, f"{nombre_base_puerta}_frame0", wall)
+    asignador_puertas.registrar(raiz)
+
+    # --- Paso 3: Renombrar paneles y hardware ---
+    # Un asignador por tipo de panel bajo el marco; se crea en su primer uso.
+    asignadores_paneles = {}
+    for panel in hijos_originales_paneles:
+        # Guardar hijos (hardware) del panel ANTES de renombrar/reemparentar el panel
+        hijos_originales_hardware = panel.children
+
+        panel_type_base = plan.clasificar(panel.name).tipo_panel_puerta
+        if panel_type_base is None:
+            plan.mensajes.append(f"Panel estándar '{panel.name}' omitido por no ser 'left' ni 'right'.")
+            continue
+
+        prefijo_panel = f"{nombre_base_puerta}_{panel_type_base}"
+        if prefijo_panel not in asignadores_paneles:
+            asignadores_paneles[prefijo_panel] = plan.asignador(raiz, prefijo_panel)
+        panel_idx = asignadores_paneles[prefijo_panel].reservar(panel)
+        plan.mover(panel, f"{prefijo_panel}{panel_idx}", raiz)
+        for asignador in asignadores_paneles.values():
+            asignador.registrar(panel)
+
+        # Renombrar hardware bajo el panel ya renombrado.
+        _planificar_hardware(plan, panel, hijos_originales_hardware)
+
+
+def _planificar_hardware(plan: _ConstructorPlan, panel: NodoInstantanea, hijos_originales_hardware):
+    asignador_hardware = plan.asignador(panel, f"{panel.name}_hardware")
+    for hardware in hijos_originales_hardware:
+        hardware_idx = asignador_hardware.reservar(hardware)
+        plan.mover(hardware, f"{asignador_hardware.prefijo_hijo}{hardware_idx}", panel)
+        asignador_hardware.registrar(hardware)
+
+
+def _iterar_hijos_recursivos(nodo: NodoInstantanea):
+    for hijo in nodo.children:
+        yield hijo
+        yield from _iterar_hijos_recursivos(hijo)
+
+
+def _planificar_puerta_closet(plan: _ConstructorPlan, raiz: NodoInstantanea, wall: NodoInstantanea,
+                              asignador_closets: Optional[AsignadorIndices] = None):
+    # --- Paso 1: Definir prefijos base para closet ---
+    if asignador_closets is None:
+        asignador_closets = plan.asignador_contado(wall, "closet")
+    closet_idx = asignador_closets.siguiente()
+    prefijo_puerta_en_closet = f"{wall.name}_closet{closet_idx}_door"
+    door_idx = plan.asignador_contado(wall, f"closet{closet_idx}_door").siguiente(exclude_obj=raiz)
+    nombre_base_puerta_actual_closet = f"{prefijo_puerta_en_closet}{door_idx}"
+
+    # Guardar hijos (paneles) del objeto raíz del closet ANTES de renombrar/reemparentar el objeto raíz
+    hijos_originales_paneles = raiz.children
+
+    # --- Paso 2: Renombrar marco y emparentar ---
+    plan.mover(raiz, f"{nombre_base_puerta_actual_closet}_frame0", wall)
+    asignador_closets.registrar(raiz)
+
+    # Alinear el prefijo "<wall>_closetN_doorM_" de todos los descendientes ya nombrados.
+    for hijo in _iterar_hijos_recursivos(raiz):
+        closet_cola = plan.clasificar(hijo.name).closet_cola
+        if closet_cola is not None:
+            plan.mover(hijo, f"{nombre_base_puerta_actual_closet}_{closet_cola}")
+
+    # --- Paso 3: Renombrar paneles y hardware ---
+    asignadores_paneles = {}
+    for panel in hijos_originales_paneles:
+        hijos_originales_hardware = panel.children
+
+        # Detectar combinaciones closed/open + left/right desde el nombre original.
+        panel_type = plan.clasificar(panel.name).tipo_panel_closet
+        if panel_type is None:
+            plan.mensajes.append(f"Panel de closet '{panel.name}' no coincide con nomenclatura esperada (closed/open + left/right). Omitiendo.")
+            continue
+
+        # El padre para encontrar el índice del panel es el marco del closet (ya renombrado)
+        prefijo_panel = f"{nombre_base_puerta_actual_closet}_{panel_type}"
+        if prefijo_panel not in asignadores_paneles:
+            asignadores_paneles[prefijo_panel] = plan.asignador(raiz, prefijo_panel)
+        panel_idx = asignadores_paneles[prefijo_panel].reservar(panel)
+        plan.mover(panel, f"{prefijo_panel}{panel_idx}", raiz)
+        for asignador in asignadores_paneles.values():
+            asignador.registrar(panel)
+
+        _planificar_hardware(plan, panel, hijos_originales_hardware)
+
+
+def _planificar_primitivos(plan: _ConstructorPlan, nodos, wall: NodoInstantanea):
+    instantanea = plan.instantanea
+    count_primitivos = 0
+    jerarquias_omitidas = 0
+    # Un solo recorrido de los hijos del padre para todos los primitivos de esta ejecucion,
+    # en el primer primitivo: los nombres especiales no lo necesitan.
+    asignador_primitivos = None
+    for nodo in nodos:
+        if nodo.children:
+            plan.informar('WARNING', f"Omitiendo jerarquía '{nodo.name}' al procesar múltiples objetos. Procese jerarquías de una en una.")
+            jerarquias_omitidas += 1
+            continue
+
+        # Mantener enchufeN/apagadorN (limpiar .###); si hay conflicto, buscar siguiente indice
+        clasificacion = plan.clasificar(nodo.name)
+        if clasificacion.es_especial:
+            # Alinear el prefijo wall/interiorwall/ceiling con el objeto padre activo.
+            nombre_base = clasificacion.nombre_alineado(wall.name)
+            nombre_base = instantanea.siguiente_libre(nombre_base, nodo)
+        else:
+            # Tratar como primitivo
+            if asignador_primitivos is None:
+                asignador_primitivos = plan.asignador_contado(wall, "primitive")
+            nombre_base = f"{wall.name}_primitive{asignador_primitivos.reservar(nodo)}"
+        plan.mover(nodo, nombre_base, wall)
+        if asignador_primitivos is not None:
+            asignador_primitivos.registrar(nodo)
+        count_primitivos += 1
+
+    if count_primitivos > 0:
+        plan.informar('INFO', f"Se procesaron {count_primitivos} objetos primitivos.")
+    if jerarquias_omitidas == 0 and count_primitivos == 0:
+        plan.informar('WARNING', "No se procesó ningún objeto primitivo válido.")
+    elif jerarquias_omitidas > 0 and count_primitivos == 0:
+        plan.informar('WARNING', "No se procesaron primitivos. Se omitieron jerarquías (procesar de una en una).")
+
+
+def planificar_jerarquia_puerta(instantanea: Instantanea, objeto_raiz, objeto_padre_wall) -> Plan:
+    """Plan para una jerarquia de puerta estandar (marco, paneles left/right y hardware)."""
+    plan = _ConstructorPlan(instantanea)
+    _planificar_puerta(plan, instantanea.nodo(objeto_raiz), instantanea.nodo(objeto_padre_wall))
+    return plan.construir()
+
+
+def planificar_jerarquia_puerta_closet(instantanea: Instantanea, objeto_raiz, objeto_padre_wall) -> Plan:
+    """Plan para una jerarquia de puerta de closet (paneles closed/open + left/right y hardware)."""
+    plan = _ConstructorPlan(instantanea)
+    _planificar_puerta_closet(plan, instantanea.nodo(objeto_raiz), instantanea.nodo(objeto_padre_wall))
+    return plan.construir()
+
+
+def _planificar_lote(plan: _ConstructorPlan, nodos, wall: NodoInstantanea):
+    """Procesa cualquier mezcla de jerarquias y primitivos con indices consecutivos."""
+    seleccionados = set(nodos)
+    asignador_puertas = plan.asignador_contado(wall, "door")
+    asignador_closets = plan.asignador_contado(wall, "closet")
+    primitivos = []
+    puertas = closets = 0
+    for nodo in nodos:
+        # Un descendiente de otra jerarquia seleccionada se procesa con ella.
+        ancestro = nodo.parent
+        while ancestro is not None and ancestro not in seleccionados:
+            ancestro = ancestro.parent
+        if ancestro is not None:
+            plan.mensajes.append(f"'{nodo.nombre_original}' se procesa dentro de la jerarquía '{ancestro.nombre_original}'.")
+            continue
+        if not nodo.children:
+            primitivos.append(nodo)
+        elif plan.clasificar(nodo.name).es_closet:
+            _planificar_puerta_closet(plan, nodo, wall, asignador_closets)
+            asignador_puertas.registrar(nodo)
+            closets += 1
+        else:
+            _planificar_puerta(plan, nodo, wall, asignador_puertas)
+            asignador_closets.registrar(nodo)
+            puertas += 1
+
+    if puertas or closets:
+        plan.informar('INFO', f"Se procesaron {puertas} puertas estándar y {closets} puertas de closet.")
+    if primitivos or not (puertas or closets):
+        _planificar_primitivos(plan, primitivos, wall)
+
+
+def planificar_seleccion(instantanea: Instantanea, objeto_padre, objetos_a_procesar, lote: bool = False) -> Plan:
+    """
+    Plan completo para la seleccion del operador: una sola jerarquia (puerta o closet)
+    si es el unico objeto con hijos, o primitivos y nombres especiales en otro caso.
+    Con lote, procesa todas las jerarquias y primitivos seleccionados en el mismo plan.
+    """
+    plan = _ConstructorPlan(instantanea)
+    wall = instantanea.nodo(objeto_padre)
+    nodos = [instantanea.nodo(obj) for obj in objetos_a_procesar]
+    if lote:
+        _planificar_lote(plan, nodos, wall)
+        return plan.construir()
+    # Priorizar el procesamiento de jerarquías si solo se selecciona una (además del padre)
+    if len(nodos) == 1 and nodos[0].children:
+        raiz = nodos[0]
+        if plan.clasificar(raiz.name).es_closet:
+            _planificar_puerta_closet(plan, raiz, wall)
+            plan.informar('INFO', f"Jerarquía de puerta de closet '{raiz.name}' procesada.")
+        else:
+            _planificar_puerta(plan, raiz, wall)
+            plan.informar('INFO', f"Jerarquía de puerta estándar '{raiz.name}' procesada.")
+    else:
+        _planificar_primitivos(plan, nodos, wall)
+    return plan.construir()
+
+
+def planificar_grupos(instantanea: Instantanea, grupos) -> Plan:
+    """
+    Un solo plan en lote para varios padres, sin choques de nombres entre grupos.
+    grupos es [(objeto_padre, objetos_a_procesar)]; los informes llevan el nombre del padre.
+    """
+    plan = _ConstructorPlan(instantanea)
+    for objeto_padre, objetos_a_procesar in grupos:
+        wall = instantanea.nodo(objeto_padre)
+        desde = len(plan.informes)
+        _planificar_lote(plan, [instantanea.nodo(obj) for obj in objetos_a_procesar], wall)
+        plan.informes[desde:] = [(nivel, f"{wall.name}: {texto}") for nivel, texto in plan.informes[desde:]]
+    return plan.construir()
+
+
+def _nodo_por_nombre(instantanea: Instantanea, nombre: str):
+    """Nodo del objeto que tiene nombre en el estado planificado (agregandolo si hace falta), o None."""
+    dueno = instantanea.dueno(nombre)
+    if dueno is None or isinstance(dueno, NodoInstantanea):
+        return dueno
+    return instantanea.agregar(dueno)
+
+
+def planificar_manifiesto(objetos_escena, entradas, indice_claves: dict) -> Plan:
+    """
+    Un solo plan que repite un manifiesto (ver manifiesto.py) sobre la escena.
+    Cada entrada se resuelve por su clave en indice_claves o, sin clave, por su nombre
+    anterior en el estado ya planificado, y toma su nombre nuevo. Despues cada objeto se
+    emparenta al dueno planificado del nombre de su padre. Si un objeto aparece varias
+    veces, vale la ultima entrada. Todos los objetos de las entradas entran en la
+    instantanea antes de renombrar: un nombre que tiene otro objeto del manifiesto no
+    fuerza un sufijo .###, y los intercambios se resuelven al construir el plan.
+    Los nombres se resuelven con el indice de nombres de la instantanea, construido con
+    un solo recorrido de la escena, sin busquedas por entrada. Las entradas sin nombre
+    nuevo se omiten.
+    """
+    instantanea = Instantanea(objetos_escena)
+    plan = _ConstructorPlan(instantanea)
+    nombres = instantanea.indice_nombres
+    entradas = list(entradas)
+    for entrada in entradas:
+        clave = entrada["clave"]
+        obj = indice_claves.get(clave) if clave else nombres.get(entrada["nombre_anterior"])
+        if obj is not None:
+            instantanea.agregar(obj)
+
+    padres = []
+    sin_objeto = ambiguas = sin_nombre = 0
+    for entrada in entradas:
+        if not entrada["nombre_nuevo"]:
+            sin_nombre += 1
+            continue
+        clave = entrada["clave"]
+        if clave:
+            obj = indice_claves.get(clave)
+            if obj is None:
+                if clave in indice_claves:
+                    ambiguas += 1
+                else:
+                    sin_objeto += 1
+                continue
+            nodo = instantanea.agregar(obj)
+        else:
+            nodo = _nodo_por_nombre(instantanea, entrada["nombre_anterior"])
+            if nodo is None:
+                sin_objeto += 1
+                continue
+        plan.mover(nodo, entrada["nombre_nuevo"])
+        padres.append((nodo, entrada["padre"]))
+
+    sin_padre = ciclos = 0
+    for nodo, nombre_padre in padres:
+        if not nombre_padre:
+            continue
+        padre = _nodo_por_nombre(instantanea, nombre_padre)
+        if padre is None:
+            sin_padre += 1
+            continue
+        ancestro = padre
+        while ancestro is not None and ancestro is not nodo:
+            ancestro = ancestro.parent
+        if ancestro is nodo:
+            ciclos += 1
+            plan.mensajes.append(f"'{nodo.name}' no se emparenta a '{nombre_padre}': formaría un ciclo.")
+            continue
+        plan.mover(nodo, padre=padre)
+
+    plan.informar('INFO', f"Manifiesto: {len(padres)} entradas resueltas.")
+    for cantidad, texto in ((sin_nombre, "entradas sin nombre nuevo"),
+                            (sin_objeto, "entradas sin objeto en la escena"),
+                            (ambiguas, "entradas con clave compartida por varios objetos"),
+                            (sin_padre, "entradas cuyo padre no existe"),
+                            (ciclos, "entradas que formarían un ciclo de padres")):
+        if cantidad:
+            plan.informar('WARNING', f"Manifiesto: {cantidad} {texto} (omitidas).")
+    return plan.construir()
+
+
+def candidatos_normalizacion(objeto_padre) -> list:
+    """
+    Hijos de objeto_padre que las reglas todavia cambiarian. Se omiten los ya nombrados
+    <padre>_doorN_frame0, <padre>_closetN_doorM_frame0, <padre>_primitiveN y los nombres
+    especiales alineados con el padre, asi normalizar dos veces no cambia nada.
+    """
+    nombre_padre = objeto_padre.name
+    patron_normalizado = re.compile(
+        re.escape(nombre_padre) + r'_(?:door\d+_frame0|closet\d+_door\d+_frame0|primitive\d+)')
+    candidatos = []
+    for hijo in objeto_padre.children:
+        nombre = hijo.name
+        if patron_normalizado.fullmatch(nombre):
+            continue
+        clasificacion = clasificar_nombre(nombre)
+        if clasificacion.es_especial and clasificacion.nombre_alineado(nombre_padre) == nombre:
+            continue
+        candidatos.append(hijo)
+    return candidatos
+
+
+def describir_plan(plan: Plan) -> list:
+    """Lineas legibles del plan para reportes de previsualizacion, con los nombres planificados."""
+    nombres_finales = {}
+    for accion in plan.acciones:
+        if accion.nombre_nuevo is not None:
+            nombres_finales[accion.objeto] = accion.nombre_nuevo
+    lineas = []
+    for accion in plan.acciones:
+        if accion.nombre_nuevo is not None:
+            linea = f"'{accion.nombre_anterior}' -> '{accion.nombre_nuevo}'"
+        else:
+            linea = f"'{accion.nombre_anterior}'"
+        if accion.padre_nuevo is not None:
+            nombre_padre = nombres_finales.get(accion.padre_nuevo, accion.padre_nuevo.name)
+            linea += f", padre '{nombre_padre}'"
+        lineas.append(linea)
+    return lineas
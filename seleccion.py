@@ -0,0 +1,58 @@
+"""
+Instantanea ligera de la seleccion y el objeto activo de un view layer.
+Guarda los objetos por referencia (sobreviven a renombrados) y restaura el estado con
+select_set directos en un solo recorrido, sin bpy.ops ni busquedas por nombre.
+No importa bpy: recibe el contexto.
+"""
+
+
+class SeleccionGuardada:
+    """
+    Seleccion y objeto activo capturados una vez. restaurar() deshace cualquier cambio
+    intermedio de seleccion o activo; como contexto (with) restaura al salir si nadie lo
+    hizo antes, aunque haya una excepcion. El costo es lineal en los seleccionados, no en
+    la escena.
+    """
+
+    def __init__(self, context):
+        self._context = context
+        self.seleccionados = context.selected_objects[:]
+        self.activo = context.view_layer.objects.active
+        self.restaurada = False
+        self.omitidos = 0  # Seleccionados que ya no existen o salieron del view layer.
+        self.activo_restaurado = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if not self.restaurada:
+            self.restaurar()
+        return False
+
+    def restaurar(self):
+        """
+        Deselecciona solo lo que se selecciono despues de la captura, vuelve a seleccionar
+        lo capturado y restaura el activo. Los objetos borrados o fuera del view layer se
+        omiten: deja su cantidad en omitidos, y en activo_restaurado si se pudo volver a
+        poner el activo.
+        """
+        guardados = set(self.seleccionados)
+        for obj in self._context.selected_objects:
+            if obj not in guardados:
+                obj.select_set(False)
+        self.omitidos = 0
+        for obj in self.seleccionados:
+            try:
+                if not obj.select_get():
+                    obj.select_set(True)
+            except (ReferenceError, RuntimeError):
+                self.omitidos += 1
+        capa = self._context.view_layer
+        try:
+            if capa.objects.active != self.activo:
+                capa.objects.active = self.activo
+            self.activo_restaurado = True
+        except (ReferenceError, RuntimeError):
+            self.activo_restaurado = False
+        self.restaurada = True
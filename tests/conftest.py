@@ -0,0 +1,37 @@
+"""
+Configuracion comun de las pruebas: instala el bpy simulado (bpy_simulado.py) e importa
+el paquete del addon sobre el, como benchmark.py. Cada prueba parte de una escena vacia.
+"""
+import importlib
+import os
+import sys
+
+import pytest
+
+_DIR_ADDON = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DIR_PADRE, _NOMBRE_PAQUETE = os.path.split(_DIR_ADDON)
+for _directorio in (_DIR_ADDON, _DIR_PADRE):
+    if _directorio not in sys.path:
+        sys.path.insert(0, _directorio)
+
+import bpy_simulado  # noqa: E402
+
+_BPY = bpy_simulado.instalar()
+_ADDON = importlib.import_module(_NOMBRE_PAQUETE)
+
+
+def modulo_addon(nombre: str):
+    """Submodulo del paquete del addon (p. ej. "planificador")."""
+    return importlib.import_module(f"{_NOMBRE_PAQUETE}.{nombre}")
+
+
+@pytest.fixture
+def bpy():
+    """bpy simulado con la escena, la seleccion y los contadores vacios."""
+    bpy_simulado.reiniciar(_BPY)
+    return _BPY
+
+
+@pytest.fixture
+def addon(bpy):
+    return _ADDON
@@ -0,0 +1,75 @@
+"""
+Asignacion al padre mas cercano por distancia a su caja envolvente, no a puntos de muestra.
+"""
+import math
+import random
+
+from bpy_simulado import Matrix, Vector
+from conftest import modulo_addon
+
+asignacion = modulo_addon("asignacion")
+
+
+def _caja(minimo, maximo) -> tuple:
+    return tuple((x, y, z) for x in (minimo[0], maximo[0]) for y in (minimo[1], maximo[1]) for z in (minimo[2], maximo[2]))
+
+
+def _objeto(bpy, nombre: str, minimo=(-1.0, -1.0, -1.0), maximo=(1.0, 1.0, 1.0), matriz=None):
+    obj = bpy.data.objects.new(nombre)
+    obj.bound_box = _caja(minimo, maximo)
+    if matriz is not None:
+        obj.matrix_basis = matriz
+    return obj
+
+
+def _suelto(bpy, nombre: str, posicion):
+    return _objeto(bpy, nombre, (-0.05, -0.05, -0.05), (0.05, 0.05, 0.05), Matrix.Translation(posicion))
+
+
+def test_pared_larga_gana_a_la_vecina_corta(bpy):
+    # wall1 de 10 m sobre el eje X; wall2 perpendicular en x=0. El enchufe esta sobre la
+    # cara de wall1 en x=2, lejos de cualquier esquina de wall1 pero cerca del centro de wall2.
+    wall1 = _objeto(bpy, "wall1", (0.0, -0.1, 0.0), (10.0, 0.1, 3.0))
+    wall2 = _objeto(bpy, "wall2", (-0.1, 0.0, 0.0), (0.1, 4.0, 3.0))
+    enchufe = _suelto(bpy, "enchufe", (2.0, 0.15, 1.5))
+
+    assert asignacion.asignar_por_cercania([wall1, wall2], [enchufe]) == [(wall1, [enchufe])]
+    assert asignacion.asignar_por_cercania([wall2, wall1], [enchufe]) == [(wall1, [enchufe])]
+
+
+def test_distancia_exacta_con_rotacion_y_escala(bpy):
+    # Caja unitaria escalada a 4 x 0.2 x 2 y rotada 90 grados en Z: ocupa x en [-0.1, 0.1]
+    # e y en [-2, 2]. Un punto en (1, 3, 0) esta a hypot(0.9, 1) de la esquina mas cercana.
+    matriz = Matrix.LocRotScale(None, Matrix.Rotation(math.radians(90), 4, 'Z'), (2.0, 0.1, 1.0))
+    caja = asignacion.CajaPadre(_objeto(bpy, "wall1", matriz=matriz))
+
+    assert abs(caja.distancia(Vector((1.0, 3.0, 0.0))) - math.hypot(0.9, 1.0)) < 1e-9
+    assert caja.distancia(Vector((0.05, 1.5, 0.5))) < 1e-9
+
+
+def test_coincide_con_comparar_todos_los_padres(bpy):
+    azar = random.Random(7)
+    padres = []
+    for indice in range(30):
+        largo = azar.uniform(0.5, 12.0)
+        matriz = Matrix.LocRotScale((azar.uniform(-20, 20), azar.uniform(-20, 20), 0.0),
+                                    Matrix.Rotation(azar.uniform(0, math.pi), 4, 'Z'), (largo, 0.1, 1.5))
+        padres.append(_objeto(bpy, f"wall{indice}", matriz=matriz))
+    cajas = [asignacion.CajaPadre(padre) for padre in padres]
+    arbol = asignacion.construir_arbol_padres(cajas)
+    radio_maximo = max(caja.radio for caja in cajas)
+
+    for _ in range(300):
+        punto = Vector((azar.uniform(-25, 25), azar.uniform(-25, 25), azar.uniform(-1, 2)))
+        elegido = asignacion.padre_mas_cercano(cajas, arbol, radio_maximo, punto)
+        assert cajas[elegido].distancia(punto) == min(caja.distancia(punto) for caja in cajas)
+
+
+def test_descendientes_siguen_a_su_jerarquia(bpy):
+    wall1 = _objeto(bpy, "wall1", (0.0, -0.1, 0.0), (10.0, 0.1, 3.0))
+    wall2 = _objeto(bpy, "wall2", (-0.1, 20.0, 0.0), (0.1, 24.0, 3.0))
+    marco = _suelto(bpy, "Door", (5.0, 0.0, 1.0))
+    panel = _suelto(bpy, "Left", (0.0, 21.0, 1.0))
+    panel.parent = marco
+
+    assert asignacion.asignar_por_cercania([wall1, wall2], [marco, panel]) == [(wall1, [marco])]
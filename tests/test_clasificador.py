@@ -0,0 +1,52 @@
+"""
+Corpus del clasificador de nombres con el resultado esperado de cada nombre.
+benchmark.py importa CORPUS_NOMBRES de aqui para compararlo con la cadena de regex anterior.
+"""
+import pytest
+
+from conftest import modulo_addon
+
+clasificador = modulo_addon("clasificador")
+
+# (nombre, categoria, nombre alineado a "wall9", tipo panel puerta, tipo panel closet, cola closet)
+CORPUS_NOMBRES = (
+    ("wall1", "padre", "wall1", None, None, None),
+    ("interiorwall12", "padre", "interiorwall12", None, None, None),
+    ("ceiling3", "padre", "ceiling3", None, None, None),
+    ("Wall1", "wall", "Wall1", None, None, None),
+    ("wall1.001", "wall", "wall1", None, None, None),
+    ("wall1_enchufe3", "especial", "wall9_enchufe3", None, None, None),
+    ("wall2_apagador3.002", "especial", "wall9_apagador3", None, None, None),
+    ("WALL1_Enchufe3", "especial", "wall9_Enchufe3", None, None, None),
+    (" wall1_lamp2 ", "especial", "wall9_lamp2", None, None, None),
+    ("ceiling4_fridge&micro1", "especial", "wall9_fridge&micro1", None, None, None),
+    ("wall1_17.004", "especial", "wall9_17", None, None, None),
+    ("toallero_colgador2.001", "especial", "toallero_colgador2", None, None, None),
+    ("wall1_door2_leftpanel0_door1", "especial", "wall9_door2_leftpanel0_door1", "leftpanel", None, None),
+    ("wall3_closet5_door2_closedleftpanel0", "especial", "wall9_closet5_door2_closedleftpanel0",
+     "leftpanel", "closedleftpanel", "closedleftpanel0"),
+    ("wall3_closet5_door2_openrightpanel1_hardware4.001", "especial", "wall9_closet5_door2_openrightpanel1_hardware4",
+     "rightpanel", "openrightpanel", "openrightpanel1_hardware4.001"),
+    ("wall1_closet0_door0_frame0", "especial", "wall9_closet0_door0_frame0", None, None, "frame0"),
+    ("wall9_closet1_door1_x_hardware0", "wall", "wall9_closet1_door1_x_hardware0", None, None, "x_hardware0"),
+    ("wall1_primitive4", "wall", "wall9_primitive4", None, None, None),
+    ("wall1_door1_frame0", "wall", "wall9_door1_frame0", None, None, None),
+    ("wall5_.3", "wall", "wall5_", None, None, None),
+    ("enchufe1", "libre", "enchufe1", None, None, None),
+    ("Cube.001", "libre", "Cube", None, None, None),
+    ("Left_Door", "libre", "Left_Door", "leftpanel", None, None),
+    ("closed_left", "libre", "closed_left", "leftpanel", "closedleftpanel", None),
+    ("Open_Right.002", "libre", "Open_Right", "rightpanel", "openrightpanel", None),
+    ("LeftRight_closed", "libre", "LeftRight_closed", "leftpanel", "closedleftpanel", None),
+    ("Wardrobe_root", "libre", "Wardrobe_root", None, None, None),
+)
+
+
+@pytest.mark.parametrize("nombre, categoria, alineado, tipo_puerta, tipo_closet, cola", CORPUS_NOMBRES,
+                         ids=[fila[0] for fila in CORPUS_NOMBRES])
+def test_clasificar_nombre(nombre, categoria, alineado, tipo_puerta, tipo_closet, cola):
+    clasificacion = clasificador.clasificar_nombre(nombre)
+    obtenido = (clasificacion.categoria, clasificacion.nombre_alineado("wall9"),
+                clasificacion.tipo_panel_puerta, clasificacion.tipo_panel_closet, clasificacion.closet_cola)
+
+    assert obtenido == (categoria, alineado, tipo_puerta, tipo_closet, cola)
@@ -0,0 +1,168 @@
+"""
+Contadores de indices guardados en el wall: hijos agregados o renombrados a mano despues
+de una ejecucion no deben recibir un indice ya tomado.
+"""
+import random
+
+import bpy_simulado
+from conftest import modulo_addon
+
+indices = modulo_addon("indices")
+planificador = modulo_addon("planificador")
+
+
+def _ejecutar(bpy, addon, wall, seleccion, **opciones):
+    for obj in bpy.data.objects:
+        obj.select_set(False)
+    for obj in (*seleccion, wall):
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = wall
+    clase = addon.OBJECT_OT_reparent_and_rename_smart
+    operador = clase()
+    for nombre, valor in clase.__annotations__.items():
+        setattr(operador, nombre, opciones.get(nombre, valor))
+    assert operador.execute(bpy.context) == {'FINISHED'}
+
+
+def _hijo(bpy, nombre: str, padre):
+    obj = bpy.data.objects.new(nombre)
+    obj.parent = padre
+    return obj
+
+
+def _puerta(bpy, nombre: str = "Door", panel: str = "Left"):
+    raiz = bpy.data.objects.new(nombre)
+    _hijo(bpy, panel, raiz)
+    return raiz
+
+
+def _closet(bpy):
+    return _puerta(bpy, "Closet", "closed_left")
+
+
+def test_guarda_la_huella_de_los_hijos(bpy, addon):
+    wall = bpy.data.objects.new("wall1")
+    _ejecutar(bpy, addon, wall, [bpy.data.objects.new("Cube") for _ in range(3)])
+
+    assert wall[indices.PROPIEDAD_CONTADORES]["primitive"]["huella"] == indices.huella_hijos(wall)
+    assert indices.leer_contador(wall, "primitive", bpy.data.objects) == (3, bpy.data.objects["wall1_primitive2"])
+
+
+def test_hijo_agregado_a_mano_invalida_el_contador(bpy, addon):
+    wall = bpy.data.objects.new("wall1")
+    _ejecutar(bpy, addon, wall, [bpy.data.objects.new("Cube") for _ in range(3)])
+    _hijo(bpy, "wall1_primitive3", wall)
+    cubos = [bpy.data.objects.new("Cube") for _ in range(3)]
+
+    _ejecutar(bpy, addon, wall, cubos)
+
+    assert [cubo.name for cubo in cubos] == ["wall1_primitive4", "wall1_primitive5", "wall1_primitive6"]
+
+
+def test_puerta_agregada_a_mano_invalida_el_contador(bpy, addon):
+    wall = bpy.data.objects.new("wall1")
+    _ejecutar(bpy, addon, wall, [_puerta(bpy)])
+    _hijo(bpy, "wall1_door1_frame0", wall)
+    raiz = _puerta(bpy)
+
+    _ejecutar(bpy, addon, wall, [raiz])
+
+    assert raiz.name == "wall1_door2_frame0"
+
+
+def test_hijo_renombrado_a_mano_se_detecta_al_asignar(bpy, addon):
+    wall = bpy.data.objects.new("wall1")
+    esfera = _hijo(bpy, "Sphere", wall)
+    _ejecutar(bpy, addon, wall, [bpy.data.objects.new("Cube") for _ in range(2)])
+    esfera.name = "wall1_primitive2"
+    cubos = [bpy.data.objects.new("Cube") for _ in range(2)]
+
+    _ejecutar(bpy, addon, wall, cubos)
+
+    assert [cubo.name for cubo in cubos] == ["wall1_primitive3", "wall1_primitive4"]
+    assert indices.leer_contador(wall, "primitive", bpy.data.objects) == (5, cubos[-1])
+
+
+def test_primitivo_renombrado_a_un_indice_mayor(bpy, addon):
+    wall = bpy.data.objects.new("wall1")
+    _ejecutar(bpy, addon, wall, [bpy.data.objects.new("Cube") for _ in range(4)])
+    bpy.data.objects["wall1_primitive1"].name = "wall1_primitive7"
+    cubos = [bpy.data.objects.new("Cube") for _ in range(2)]
+
+    _ejecutar(bpy, addon, wall, cubos)
+
+    assert [cubo.name for cubo in cubos] == ["wall1_primitive8", "wall1_primitive9"]
+
+
+def test_closet_renombrado_a_mano_no_se_mezcla_con_el_nuevo(bpy, addon):
+    wall = bpy.data.objects.new("wall1")
+    _ejecutar(bpy, addon, wall, [_closet(bpy)])
+    _ejecutar(bpy, addon, wall, [bpy.data.objects.new("Cube")])
+    bpy.data.objects["wall1_primitive0"].name = "wall1_closet1_door1_frame0"
+    raiz = _closet(bpy)
+
+    _ejecutar(bpy, addon, wall, [raiz])
+
+    assert raiz.name == "wall1_closet2_door0_frame0"
+
+
+def _plan_sin_contadores(bpy, wall, seleccion):
+    guardados = wall.get(indices.PROPIEDAD_CONTADORES)
+    if guardados is not None:
+        del wall[indices.PROPIEDAD_CONTADORES]
+    try:
+        instantanea = planificador.tomar_instantanea(wall, seleccion, bpy.data.objects)
+        return planificador.describir_plan(planificador.planificar_seleccion(instantanea, wall, seleccion, lote=True))
+    finally:
+        if guardados is not None:
+            wall[indices.PROPIEDAD_CONTADORES] = guardados
+
+
+def test_ediciones_a_mano_al_azar_coinciden_con_recorrer_los_hijos(bpy, addon):
+    azar = random.Random(13)
+    nombres = ("wall1_primitive{}", "wall1_door{}_frame0", "wall1_closet{}_door0_frame0",
+               "wall1_closet0_door{}_frame0", "Sphere{}")
+    for _ in range(40):
+        bpy_simulado.reiniciar(bpy)
+        wall = bpy.data.objects.new("wall1")
+        for _ in range(6):
+            hijos = list(wall.children)
+            edicion = azar.randrange(4)
+            if edicion == 0:
+                _hijo(bpy, azar.choice(nombres).format(azar.randrange(8)), wall)
+            elif edicion == 1 and hijos:
+                azar.choice(hijos).name = azar.choice(nombres).format(azar.randrange(8))
+            elif edicion == 2 and hijos:
+                azar.choice(hijos).parent = None
+            fabricas = (lambda: bpy.data.objects.new("Cube"), lambda: _puerta(bpy), lambda: _closet(bpy))
+            seleccion = [azar.choice(fabricas)() for _ in range(azar.randrange(1, 4))]
+            instantanea = planificador.tomar_instantanea(wall, seleccion, bpy.data.objects)
+            con_contadores = planificador.describir_plan(
+                planificador.planificar_seleccion(instantanea, wall, seleccion, lote=True))
+
+            assert con_contadores == _plan_sin_contadores(bpy, wall, seleccion)
+            _ejecutar(bpy, addon, wall, seleccion, procesar_lote=True)
+
+
+def test_con_contador_no_copia_los_hijos_del_wall(bpy, addon):
+    wall = bpy.data.objects.new("wall1")
+    _ejecutar(bpy, addon, wall, [bpy.data.objects.new("Cube") for _ in range(50)])
+    cubo = bpy.data.objects.new("Cube")
+
+    instantanea = planificador.tomar_instantanea(wall, [cubo], bpy.data.objects)
+    plan = planificador.planificar_seleccion(instantanea, wall, [cubo])
+
+    assert planificador.describir_plan(plan) == ["'Cube' -> 'wall1_primitive50', padre 'wall1'"]
+    # wall, el cubo y el portador del contador.
+    assert plan.estadisticas["nodos"] == 3
+
+
+def test_envolturas_de_compatibilidad_usan_el_contador_valido(bpy, addon):
+    wall = bpy.data.objects.new("wall1")
+    _ejecutar(bpy, addon, wall, [_closet(bpy), bpy.data.objects.new("Cube"), bpy.data.objects.new("Cube")],
+              procesar_lote=True)
+
+    assert addon.encontrar_siguiente_indice(wall, "wall1_primitive") == 2
+    assert addon.encontrar_siguiente_indice_closet_global(wall, "wall1") == 1
+    bpy.data.objects["wall1_primitive0"].name = "wall1_primitive9"
+    assert addon.encontrar_siguiente_indice(wall, "wall1_primitive") == 10
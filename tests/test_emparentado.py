@@ -0,0 +1,101 @@
+"""
+emparentar_directo contra bpy.ops.object.parent_set(keep_transform=True) con rotacion,
+escala y un padre que a su vez tiene padre.
+"""
+import math
+
+from bpy_simulado import Matrix, Vector
+
+TOLERANCIA = 1e-9
+
+
+def _iguales(matriz_a, matriz_b) -> bool:
+    return all(abs(a - b) < TOLERANCIA for fila_a, fila_b in zip(matriz_a, matriz_b) for a, b in zip(fila_a, fila_b))
+
+
+def _escena(bpy):
+    """
+    abuelo (rotado y trasladado) > padre (escala no uniforme) y un objeto suelto rotado y
+    escalado con un hijo propio. Retorna (padre, objeto, hijo).
+    """
+    objetos = bpy.data.objects
+    abuelo = objetos.new("wall_abuelo")
+    abuelo.matrix_basis = Matrix.LocRotScale((5.0, -1.0, 2.0), Matrix.Rotation(math.radians(30), 4, 'X'), None)
+    padre = objetos.new("wall1")
+    padre.parent = abuelo
+    padre.matrix_basis = Matrix.LocRotScale((0.0, 3.0, 0.0), Matrix.Rotation(math.radians(45), 4, 'Z'),
+                                            (1.0, 2.0, 0.5))
+    objeto = objetos.new("Cube")
+    objeto.matrix_basis = Matrix.LocRotScale((1.0, 2.0, 3.0), Matrix.Rotation(math.radians(90), 4, 'Z'),
+                                             (2.0, 2.0, 2.0))
+    hijo = objetos.new("Handle")
+    hijo.parent = objeto
+    hijo.matrix_basis = Matrix.Translation((0.0, 0.0, 1.0))
+    return padre, objeto, hijo
+
+
+def test_conserva_la_matriz_mundial(bpy, addon):
+    padre, objeto, hijo = _escena(bpy)
+    mundo_objeto, mundo_hijo = objeto.matrix_world, hijo.matrix_world
+
+    addon.emparentar_directo(objeto, padre)
+
+    assert objeto.parent is padre
+    assert _iguales(objeto.matrix_world, mundo_objeto)
+    assert _iguales(hijo.matrix_world, mundo_hijo)
+    assert _iguales(objeto.matrix_parent_inverse @ padre.matrix_world, Matrix())
+    # (1, 0, 0) local: escala 2, rotacion de 90 grados en Z y traslacion (1, 2, 3).
+    esperado = Vector((1.0, 4.0, 3.0))
+    assert all(abs(a - b) < TOLERANCIA for a, b in zip(objeto.matrix_world @ Vector((1.0, 0.0, 0.0)), esperado))
+
+
+def test_coincide_con_parent_set(bpy, addon):
+    padre, objeto, hijo = _escena(bpy)
+    bpy.context.view_layer.objects.active = padre
+    objeto.select_set(True)
+    padre.select_set(True)
+    bpy.ops.object.parent_set(type='OBJECT', keep_transform=True)
+    por_operador = [obj.matrix_world for obj in (objeto, hijo)] + [objeto.matrix_parent_inverse]
+
+    bpy.data.objects.remove(objeto)
+    bpy.data.objects.remove(hijo)
+    bpy.data.objects.remove(padre.parent)
+    bpy.data.objects.remove(padre)
+    padre, objeto, hijo = _escena(bpy)
+    addon.emparentar_directo(objeto, padre)
+    directo = [obj.matrix_world for obj in (objeto, hijo)] + [objeto.matrix_parent_inverse]
+
+    assert all(_iguales(a, b) for a, b in zip(directo, por_operador))
+
+
+def test_reemparentar_entre_padres(bpy, addon):
+    padre, objeto, hijo = _escena(bpy)
+    addon.emparentar_directo(objeto, padre.parent)
+    mundo_objeto, mundo_hijo = objeto.matrix_world, hijo.matrix_world
+
+    addon.emparentar_directo(objeto, padre)
+
+    assert objeto.parent is padre
+    assert _iguales(objeto.matrix_world, mundo_objeto)
+    assert _iguales(hijo.matrix_world, mundo_hijo)
+
+
+def test_no_toca_seleccion_ni_activo(bpy, addon):
+    padre, objeto, _ = _escena(bpy)
+    objeto.select_set(True)
+    bpy.context.view_layer.objects.active = objeto
+
+    addon.emparentar_directo(objeto, padre)
+
+    assert bpy.context.selected_objects == [objeto]
+    assert bpy.context.view_layer.objects.active is objeto
+
+
+def test_ya_emparentado_no_cambia(bpy, addon):
+    padre, objeto, _ = _escena(bpy)
+    addon.emparentar_directo(objeto, padre)
+    inversa, base = objeto.matrix_parent_inverse, objeto.matrix_basis
+
+    addon.emparentar_directo(objeto, padre)
+
+    assert objeto.matrix_parent_inverse is inversa and objeto.matrix_basis is base
@@ -0,0 +1,129 @@
+"""
+Asignador de indices por padre e indice de nombres comparados con las busquedas que
+reemplazan: recorrer los hijos en cada consulta (encontrar_siguiente_indice) e
+incrementar el ultimo numero con bpy.data.objects.get hasta un nombre libre.
+"""
+import random
+import re
+
+import pytest
+
+import bpy_simulado
+from conftest import modulo_addon
+
+indices = modulo_addon("indices")
+
+PREFIJO = "wall1_door"
+
+
+def _recorrer(padre, prefijo: str, exclude_obj=None, sufijo: str = r"($|_)") -> int:
+    """Maximo indice de "<prefijo><N><sufijo>" entre los hijos de padre, mas uno."""
+    patron = re.compile(f"^{re.escape(prefijo)}(\\d+){sufijo}")
+    maximo = -1
+    for hijo in padre.children:
+        match = patron.match(hijo.name) if hijo != exclude_obj else None
+        if match:
+            maximo = max(maximo, int(match.group(1)))
+    return maximo + 1
+
+
+@pytest.mark.parametrize("nombre, siguiente", [
+    ("wall1_door4", 5),
+    ("wall1_door4_frame0", 5),
+    ("wall1_door4x", 0),
+    ("wall1_door4.001", 0),
+    ("wall1_doorway4", 0),
+    ("wall12_door4", 0),
+])
+def test_sufijo_del_indice(bpy, nombre, siguiente):
+    wall = bpy.data.objects.new("wall1")
+    bpy.data.objects.new(nombre).parent = wall
+
+    assert indices.AsignadorIndices(wall, PREFIJO).siguiente() == siguiente
+
+
+def test_exclude_obj_cae_al_segundo_mayor_solo_si_era_el_unico_portador(bpy):
+    wall = bpy.data.objects.new("wall1")
+    hijos = [bpy.data.objects.new(nombre) for nombre in ("wall1_door2", "wall1_door7_frame0", "wall1_door7_x")]
+    for hijo in hijos:
+        hijo.parent = wall
+    asignador = indices.AsignadorIndices(wall, PREFIJO)
+
+    assert asignador.siguiente(exclude_obj=hijos[1]) == 8
+    hijos[2].parent = None
+    asignador.registrar(hijos[2])
+    assert asignador.siguiente(exclude_obj=hijos[1]) == 3
+    assert asignador.siguiente(exclude_obj=hijos[0]) == 8
+    assert asignador.reservar(hijos[1]) == 3
+
+
+def test_operaciones_al_azar_coinciden_con_recorrer_los_hijos(bpy):
+    azar = random.Random(2)
+    nombres = ("wall1_door0", "wall1_door3_frame0", "wall1_door5x", "wall1_door9", "wall1_door1_hw",
+               "Cube", "wall1_doorway2", "wall1_door12")
+    for _ in range(200):
+        bpy_simulado.reiniciar(bpy)
+        wall = bpy.data.objects.new("wall1")
+        sueltos = [bpy.data.objects.new(azar.choice(nombres)) for _ in range(6)]
+        for obj in sueltos[:4]:
+            obj.parent = wall
+        asignador = indices.AsignadorIndices(wall, PREFIJO)
+        for _ in range(12):
+            obj = azar.choice(sueltos)
+            operacion = azar.randrange(3)
+            if operacion == 0:
+                indice = asignador.reservar(obj)
+                assert indice == _recorrer(wall, PREFIJO, exclude_obj=obj)
+                obj.name = f"{PREFIJO}{indice}"
+                obj.parent = wall
+            elif operacion == 1:
+                obj.name = azar.choice(nombres)
+            else:
+                obj.parent = azar.choice((wall, None))
+            asignador.registrar(obj)
+            for excluido in (None,) + tuple(wall.children):
+                assert asignador.siguiente(exclude_obj=excluido) == _recorrer(wall, PREFIJO, exclude_obj=excluido)
+
+
+def _incrementar(objetos, nombre_base: str, obj=None) -> str:
+    """Ultimo numero de nombre_base incrementado hasta un nombre libre o de obj."""
+    existente = objetos.get(nombre_base)
+    while existente and existente != obj:
+        match = re.search(r'(\d+)(?!.*\d)', nombre_base)
+        if not match:
+            break
+        inicio, fin = match.span(1)
+        nombre_base = f"{nombre_base[:inicio]}{int(match.group(1)) + 1}{nombre_base[fin:]}"
+        existente = objetos.get(nombre_base)
+    return nombre_base
+
+
+def test_nombre_propio_antes_del_primer_hueco(bpy):
+    for nombre in ("wall1_outlet0", "wall1_outlet1", "wall1_outlet2", "wall1_outlet4"):
+        bpy.data.objects.new(nombre)
+    nombres = indices.IndiceNombres(bpy.data.objects)
+
+    assert nombres.siguiente_libre("wall1_outlet0") == "wall1_outlet3"
+    assert nombres.siguiente_libre("wall1_outlet0", bpy.data.objects.get("wall1_outlet2")) == "wall1_outlet2"
+    assert nombres.siguiente_libre("wall1_outlet5") == "wall1_outlet5"
+    assert nombres.siguiente_libre("Cube") == "Cube"
+
+
+def test_renombrados_al_azar_coinciden_con_incrementar(bpy):
+    azar = random.Random(3)
+    bases = ("wall1_outlet{}", "wall1_outlet{}_cover", "wall1_sw{}_x{}", "wall1_outlet0{}")
+    for _ in range(200):
+        bpy_simulado.reiniciar(bpy)
+        objetos = [bpy.data.objects.new(azar.choice(bases).format(azar.randrange(6), azar.randrange(3)))
+                   for _ in range(15)]
+        nombres = indices.IndiceNombres(bpy.data.objects)
+        for _ in range(30):
+            obj = azar.choice(objetos)
+            nombre_base = azar.choice(bases).format(azar.randrange(6), azar.randrange(3))
+            libre = nombres.siguiente_libre(nombre_base, obj)
+            assert libre == _incrementar(bpy.data.objects, nombre_base, obj)
+
+            # Renombrar a mano (con sufijo .### si choca) tambien deja huecos y repetidos.
+            nombre_anterior = obj.name
+            obj.name = libre if azar.random() < 0.7 else azar.choice(bases).format(azar.randrange(6), 0)
+            nombres.registrar(obj, nombre_anterior)
@@ -0,0 +1,114 @@
+"""
+Instrumentacion: sin costo desactivada, tiempos por fase y contadores activada, y el
+reporte y el registro JSON-lines del operador con "Medir ejecución".
+"""
+import json
+
+import pytest
+
+from conftest import modulo_addon
+
+instrumentacion = modulo_addon("instrumentacion")
+
+
+class _Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self) -> float:
+        return self.ahora
+
+
+def test_desactivada_no_acumula_nada():
+    medicion = instrumentacion.Instrumentacion()
+
+    with medicion.fase("planificacion"):
+        medicion.contar("renombrados", 3)
+
+    assert medicion.fase("otra") is medicion.fase("planificacion")
+    assert (medicion.fases, medicion.contadores) == ({}, {})
+
+
+def test_suma_fases_repetidas_y_contadores(monkeypatch):
+    reloj = _Reloj()
+    monkeypatch.setattr(instrumentacion.time, "perf_counter", reloj)
+    medicion = instrumentacion.Instrumentacion(activa=True)
+
+    for duracion in (0.002, 0.003):
+        with medicion.fase("aplicacion"):
+            reloj.ahora += duracion
+        with medicion.fase("seleccion"):
+            reloj.ahora += 0.0005
+    with pytest.raises(RuntimeError):
+        with medicion.fase("aplicacion"):
+            reloj.ahora += 0.001
+            raise RuntimeError("fallo")
+    medicion.contar("renombrados", 2)
+    medicion.contar("renombrados")
+
+    assert list(medicion.fases) == ["aplicacion", "seleccion"]
+    assert medicion.fases["aplicacion"] == pytest.approx(0.006)
+    assert medicion.resumen() == "Medición: aplicacion 6.0 ms, seleccion 1.0 ms; renombrados 3"
+
+
+def test_anexa_un_registro_por_linea(tmp_path):
+    medicion = instrumentacion.Instrumentacion(activa=True)
+    medicion.contar("renombrados", 4)
+    ruta = tmp_path / "mediciones.jsonl"
+
+    medicion.anexar_jsonl(str(ruta), archivo="cuarto.blend", padre="wall1")
+    medicion.anexar_jsonl(str(ruta), archivo="cuarto.blend", padre="wall2")
+
+    filas = [json.loads(linea) for linea in ruta.read_text(encoding="utf-8").splitlines()]
+    assert [fila["padre"] for fila in filas] == ["wall1", "wall2"]
+    assert filas[0]["contadores"] == {"renombrados": 4} and filas[0]["fases_ms"] == {}
+
+
+def test_objetos_contados_cuenta_busquedas_y_recorridos(bpy):
+    bpy.data.objects.new("wall1")
+    medicion = instrumentacion.Instrumentacion(activa=True)
+    objetos = instrumentacion.ObjetosContados(bpy.data.objects, medicion)
+
+    objetos.get("wall1")
+    objetos["wall1"]
+    assert "Cube" not in objetos
+    list(objetos)
+
+    assert medicion.contadores == {"busquedas_nombre": 3, "recorridos_escena": 1}
+    assert len(objetos) == 1
+
+
+def _ejecutar_medido(bpy, addon, registro: str):
+    wall = bpy.data.objects.new("wall1")
+    for nombre in ("Cube", "Sphere"):
+        bpy.data.objects.new(nombre).select_set(True)
+    wall.select_set(True)
+    bpy.context.view_layer.objects.active = wall
+    clase = addon.OBJECT_OT_reparent_and_rename_smart
+    operador = clase()
+    for nombre, valor in clase.__annotations__.items():
+        setattr(operador, nombre, valor)
+    operador.medir_ejecucion = True
+    operador.registro_medicion = registro
+    assert operador.execute(bpy.context) == {'FINISHED'}
+    return operador
+
+
+def test_operador_reporta_y_registra_la_medicion(bpy, addon, tmp_path):
+    ruta = tmp_path / "mediciones.jsonl"
+
+    operador = _ejecutar_medido(bpy, addon, str(ruta))
+
+    medicion = [texto for nivel, texto in operador.reportes if texto.startswith("Medición: ")]
+    assert len(medicion) == 1
+    fila = json.loads(ruta.read_text(encoding="utf-8"))
+    assert fila["padre"] == "wall1"
+    assert {"total", "instantanea", "planificacion", "aplicacion", "seleccion"} <= set(fila["fases_ms"])
+    assert fila["contadores"]["objetos_seleccionados"] == 2
+    assert fila["contadores"]["renombrados"] == 2 and fila["contadores"]["emparentados"] == 2
+
+
+def test_registro_en_una_carpeta_inexistente_solo_advierte(bpy, addon, tmp_path):
+    operador = _ejecutar_medido(bpy, addon, str(tmp_path / "no_existe" / "mediciones.jsonl"))
+
+    assert operador.reportes[-1][0] == {'WARNING'}
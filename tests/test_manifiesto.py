@@ -0,0 +1,41 @@
+"""
+Lectura de manifiestos: entradas como str y ValueError con el numero de linea para
+cualquier linea mal formada.
+"""
+import pytest
+
+from conftest import modulo_addon
+
+manifiesto = modulo_addon("manifiesto")
+
+ENTRADA = {"clave": "k", "nombre_anterior": "Cube", "nombre_nuevo": "wall1_primitive0", "padre": "wall1"}
+
+
+def test_ida_y_vuelta_jsonl_y_csv(tmp_path):
+    for nombre in ("m.jsonl", "m.csv"):
+        ruta = str(tmp_path / nombre)
+        assert manifiesto.escribir_manifiesto(ruta, [ENTRADA, dict(ENTRADA, padre="")]) == 2
+
+        assert list(manifiesto.leer_manifiesto(ruta)) == [ENTRADA, dict(ENTRADA, padre="")]
+
+
+@pytest.mark.parametrize("linea", ["[]", "3", '"texto"', "null", "{no es json", '{"nombre_nuevo": 5}'])
+def test_linea_mal_formada_lanza_value_error_con_su_numero(tmp_path, linea):
+    ruta = tmp_path / "m.jsonl"
+    ruta.write_text(f'{{"nombre_nuevo": "a"}}\n\n{linea}\n', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="^línea 3: "):
+        list(manifiesto.leer_manifiesto(str(ruta)))
+
+
+def test_operador_reporta_el_manifiesto_mal_formado(bpy, addon, tmp_path):
+    ruta = tmp_path / "m.jsonl"
+    ruta.write_text("[]\n", encoding="utf-8")
+    clase = addon.OBJECT_OT_apply_manifest
+    operador = clase()
+    for nombre, valor in clase.__annotations__.items():
+        setattr(operador, nombre, valor)
+    operador.filepath = str(ruta)
+
+    assert operador.execute(bpy.context) == {'CANCELLED'}
+    assert operador.reportes[-1][0] == {'ERROR'}
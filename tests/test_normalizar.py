@@ -0,0 +1,114 @@
+"""
+Normalizacion sin interfaz: la escena completa dentro de Blender (idempotente) y el
+reparto de un directorio entre procesos, con un ejecutable de Blender simulado.
+"""
+import json
+import os
+import stat
+import sys
+import textwrap
+
+import bpy_simulado
+import normalizar
+
+
+def _hijo(bpy, nombre: str, padre):
+    obj = bpy.data.objects.new(nombre)
+    obj.parent = padre
+    return obj
+
+
+def _escena(bpy):
+    """Dos walls con hijos sin normalizar (puerta, primitivo, especial) y uno ya normalizado."""
+    wall1 = bpy.data.objects.new("wall1")
+    puerta = _hijo(bpy, "Door", wall1)
+    _hijo(bpy, "Left", puerta)
+    _hijo(bpy, "wall1_primitive0", wall1)
+    _hijo(bpy, "Cube", wall1)
+    ceiling = bpy.data.objects.new("ceiling1")
+    _hijo(bpy, "wall3_enchufe2", ceiling)
+    return wall1, ceiling
+
+
+def _nombres(bpy) -> dict:
+    return {obj.name: obj.parent.name if obj.parent else None for obj in bpy.data.objects}
+
+
+def test_normalizar_escena_es_idempotente(bpy, addon):
+    _escena(bpy)
+    antes = _nombres(bpy)
+
+    assert addon.normalizar_escena(bpy.context, aplicar=False)["renombrados"] == 4
+    assert _nombres(bpy) == antes
+
+    resumen = addon.normalizar_escena(bpy.context)
+
+    assert resumen == {"padres": 2, "renombrados": 4, "emparentados": 0, "fallos": []}
+    assert _nombres(bpy) == {
+        "wall1": None, "wall1_door0_frame0": "wall1", "wall1_door0_leftpanel0": "wall1_door0_frame0",
+        "wall1_primitive0": "wall1", "wall1_primitive1": "wall1", "ceiling1": None, "ceiling1_enchufe2": "ceiling1"}
+    assert addon.normalizar_escena(bpy.context)["renombrados"] == 0
+
+
+def test_archivo_abierto_solo_se_guarda_si_cambia(bpy, addon, monkeypatch):
+    _escena(bpy)
+    monkeypatch.setattr(bpy.data, "filepath", "/tmp/cuarto.blend")
+    bpy_simulado.contadores.reiniciar()
+
+    assert normalizar.normalizar_archivo_abierto(solo_previsualizar=True)["renombrados"] == 4
+    assert bpy_simulado.contadores.llamadas_ops == 0
+
+    resumen = normalizar.normalizar_archivo_abierto()
+
+    assert resumen["archivo"] == "/tmp/cuarto.blend" and resumen["renombrados"] == 4
+    assert bpy_simulado.contadores.llamadas_ops == 1
+    normalizar.normalizar_archivo_abierto()
+    assert bpy_simulado.contadores.llamadas_ops == 1
+
+
+def _blender_simulado(tmp_path) -> str:
+    """Ejecutable que responde como normalizar.py dentro de Blender; falla con los archivos "roto"."""
+    ruta = tmp_path / "blender"
+    ruta.write_text(textwrap.dedent(f"""\
+        #!{sys.executable}
+        import json, sys
+        archivo = sys.argv[2]
+        if "roto" in archivo:
+            sys.exit("Error: archivo dañado")
+        previsualizar = "--solo-previsualizar" in sys.argv
+        resumen = {{"padres": 1, "renombrados": 0 if previsualizar else 3, "emparentados": 0,
+                    "fallos": ["wall1: sin paneles"], "archivo": archivo, "segundos": 0.5}}
+        print("{normalizar.MARCA_RESUMEN}" + json.dumps(resumen))
+        """), encoding="utf-8")
+    ruta.chmod(ruta.stat().st_mode | stat.S_IXUSR)
+    return str(ruta)
+
+
+def test_directorio_resume_cada_archivo_y_los_errores(tmp_path, capsys):
+    blender = _blender_simulado(tmp_path)
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    for nombre in ("a.blend", "b.blend", "roto.blend", "notas.txt"):
+        (assets / nombre).write_text("", encoding="utf-8")
+    salida = tmp_path / "resumen.jsonl"
+
+    codigo = normalizar._main_directorio([str(assets), "--blender", blender, "--procesos", "2",
+                                          "--jsonl", str(salida)])
+
+    resumenes = {os.path.basename(fila["archivo"]): fila
+                 for fila in map(json.loads, salida.read_text(encoding="utf-8").splitlines())}
+    assert codigo == 1
+    assert sorted(resumenes) == ["a.blend", "b.blend", "roto.blend"]
+    assert resumenes["a.blend"]["renombrados"] == 3 and resumenes["a.blend"]["error"] is None
+    assert resumenes["roto.blend"]["error"] == "Error: archivo dañado"
+    assert capsys.readouterr().out.splitlines()[-1].startswith(
+        "3 archivos, 6 renombrados, 2 fallos de reglas, 1 errores en ")
+
+
+def test_directorio_pasa_solo_previsualizar_a_cada_proceso(tmp_path):
+    blender = _blender_simulado(tmp_path)
+    (tmp_path / "a.blend").write_text("", encoding="utf-8")
+
+    resumenes = list(normalizar.normalizar_directorio(str(tmp_path), blender, solo_previsualizar=True))
+
+    assert [resumen["renombrados"] for resumen in resumenes] == [0]
@@ -0,0 +1,306 @@
+"""
+Planificador sin bpy: nombres y padres planificados, previsualizacion sin cambios en la
+escena y aplicacion del plan en un lote.
+"""
+import random
+import types
+
+import bpy_simulado
+from conftest import modulo_addon
+
+planificador = modulo_addon("planificador")
+
+
+def _planificar(bpy, padre, seleccion, **opciones):
+    instantanea = planificador.tomar_instantanea(padre, seleccion, bpy.data.objects)
+    return planificador.planificar_seleccion(instantanea, padre, seleccion, **opciones)
+
+
+def _hijo(bpy, nombre: str, padre):
+    obj = bpy.data.objects.new(nombre)
+    obj.parent = padre
+    return obj
+
+
+def _puerta(bpy, nombre_raiz: str, *paneles):
+    """Raiz con un panel por nombre y un hardware bajo el ultimo."""
+    raiz = bpy.data.objects.new(nombre_raiz)
+    panel = None
+    for nombre in paneles:
+        panel = _hijo(bpy, nombre, raiz)
+    _hijo(bpy, "Handle", panel)
+    return raiz
+
+
+def test_primitivos_continuan_el_mayor_indice(bpy):
+    wall = bpy.data.objects.new("wall1")
+    _hijo(bpy, "wall1_primitive4", wall)
+    _hijo(bpy, "wall1_door0_frame0", wall)
+    cubos = [bpy.data.objects.new("Cube"), bpy.data.objects.new("Cube")]
+
+    plan = _planificar(bpy, wall, cubos)
+
+    assert planificador.describir_plan(plan) == [
+        "'Cube' -> 'wall1_primitive5', padre 'wall1'",
+        "'Cube.001' -> 'wall1_primitive6', padre 'wall1'",
+    ]
+    assert plan.informes == (('INFO', "Se procesaron 2 objetos primitivos."),)
+
+
+def test_planificar_no_modifica_la_escena(bpy):
+    wall = bpy.data.objects.new("wall1")
+    raiz = _puerta(bpy, "Door", "Left_panel", "Right_panel")
+    antes = {obj: (obj.name, obj.parent) for obj in bpy.data.objects}
+
+    plan = _planificar(bpy, wall, [raiz])
+
+    assert plan.acciones
+    assert {obj: (obj.name, obj.parent) for obj in bpy.data.objects} == antes
+
+
+def test_jerarquia_de_puerta(bpy):
+    wall = bpy.data.objects.new("wall1")
+    _hijo(bpy, "wall1_door0_frame0", wall)
+    raiz = _puerta(bpy, "Door", "Left_panel", "Right_panel")
+
+    plan = _planificar(bpy, wall, [raiz])
+
+    assert planificador.describir_plan(plan) == [
+        "'Door' -> 'wall1_door1_frame0', padre 'wall1'",
+        "'Left_panel' -> 'wall1_door1_leftpanel0'",
+        "'Right_panel' -> 'wall1_door1_rightpanel0'",
+        "'Handle' -> 'wall1_door1_rightpanel0_hardware0'",
+    ]
+
+
+def test_jerarquia_de_closet_usa_el_indice_global(bpy):
+    wall = bpy.data.objects.new("wall1")
+    _hijo(bpy, "wall1_closet2_door0_frame0", wall)
+    raiz = _puerta(bpy, "Closet", "closed_left", "open_right")
+
+    plan = _planificar(bpy, wall, [raiz])
+
+    assert planificador.describir_plan(plan) == [
+        "'Closet' -> 'wall1_closet3_door0_frame0', padre 'wall1'",
+        "'closed_left' -> 'wall1_closet3_door0_closedleftpanel0'",
+        "'open_right' -> 'wall1_closet3_door0_openrightpanel0'",
+        "'Handle' -> 'wall1_closet3_door0_openrightpanel0_hardware0'",
+    ]
+
+
+def test_nombres_especiales_se_alinean_y_evitan_colisiones(bpy):
+    wall = bpy.data.objects.new("wall1")
+    bpy.data.objects.new("wall1_enchufe1")
+    especiales = [bpy.data.objects.new("wall2_enchufe1.001"), bpy.data.objects.new("wall3_apagador2")]
+
+    plan = _planificar(bpy, wall, especiales)
+
+    assert planificador.describir_plan(plan) == [
+        "'wall2_enchufe1.001' -> 'wall1_enchufe2', padre 'wall1'",
+        "'wall3_apagador2' -> 'wall1_apagador2', padre 'wall1'",
+    ]
+
+
+def test_lote_mezcla_puertas_closets_y_primitivos(bpy):
+    wall = bpy.data.objects.new("wall1")
+    seleccion = [_puerta(bpy, "Door", "Left"), _puerta(bpy, "Closet", "closed_left"), bpy.data.objects.new("Cube")]
+
+    plan = _planificar(bpy, wall, seleccion, lote=True)
+
+    nombres = [accion.nombre_nuevo for accion in plan.acciones]
+    assert nombres[0] == "wall1_door0_frame0"
+    assert "wall1_closet0_door0_frame0" in nombres
+    assert nombres[-1] == "wall1_primitive0"
+    assert plan.informes[0] == ('INFO', "Se procesaron 1 puertas estándar y 1 puertas de closet.")
+
+
+def _ejecutar(bpy, addon, wall, seleccion, **opciones):
+    for obj in bpy.data.objects:
+        obj.select_set(False)
+    for obj in (*seleccion, wall):
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = wall
+    clase = addon.OBJECT_OT_reparent_and_rename_smart
+    operador = clase()
+    for nombre, valor in clase.__annotations__.items():
+        setattr(operador, nombre, opciones.get(nombre, valor))
+    assert operador.execute(bpy.context) == {'FINISHED'}
+    return operador
+
+
+def _escena_lote(bpy):
+    wall = bpy.data.objects.new("wall1")
+    _hijo(bpy, "wall1_door0_frame0", wall)
+    _hijo(bpy, "wall1_primitive3", wall)
+    seleccion = [_puerta(bpy, "Door", "Left"), _puerta(bpy, "Closet", "closed_left"), bpy.data.objects.new("Cube"),
+                 _puerta(bpy, "Door", "Right"), _puerta(bpy, "Closet", "open_right"), bpy.data.objects.new("Cube")]
+    return wall, seleccion
+
+
+def test_lote_equivale_a_una_ejecucion_por_jerarquia(bpy, addon):
+    wall, seleccion = _escena_lote(bpy)
+    bpy_simulado.contadores.reiniciar()
+    operador = _ejecutar(bpy, addon, wall, seleccion + [seleccion[0].children[0]], procesar_lote=True)
+    en_lote = sorted((obj.name, obj.parent.name if obj.parent else None) for obj in bpy.data.objects)
+
+    assert bpy_simulado.contadores.llamadas_ops == 0
+    assert ({'INFO'}, "Se procesaron 2 puertas estándar y 2 puertas de closet.") in operador.reportes
+    assert [raiz.name for raiz in seleccion] == ["wall1_door1_frame0", "wall1_closet0_door0_frame0", "wall1_primitive4",
+                                                "wall1_door2_frame0", "wall1_closet1_door0_frame0", "wall1_primitive5"]
+
+    bpy_simulado.reiniciar(bpy)
+    wall, seleccion = _escena_lote(bpy)
+    for raiz in seleccion:
+        if raiz.children:
+            _ejecutar(bpy, addon, wall, [raiz])
+    _ejecutar(bpy, addon, wall, [obj for obj in seleccion if not obj.children])
+
+    assert sorted((obj.name, obj.parent.name if obj.parent else None) for obj in bpy.data.objects) == en_lote
+
+
+def test_sin_lote_omite_jerarquias_entre_varios_objetos(bpy):
+    wall = bpy.data.objects.new("wall1")
+    raiz = _puerta(bpy, "Door", "Left")
+
+    plan = _planificar(bpy, wall, [raiz, bpy.data.objects.new("Cube")])
+
+    assert [accion.nombre_nuevo for accion in plan.acciones] == ["wall1_primitive0"]
+    assert plan.informes[0][0] == 'WARNING'
+
+
+def test_aplicar_el_plan_deja_los_nombres_planificados(bpy, addon):
+    wall = bpy.data.objects.new("wall1")
+    _hijo(bpy, "wall1_primitive0", wall)
+    seleccion = [_puerta(bpy, "Door", "Left_panel"), bpy.data.objects.new("wall1_primitive0.001")]
+    plan = _planificar(bpy, wall, seleccion, lote=True)
+    finales = {accion.objeto: accion.nombre_nuevo for accion in plan.acciones if accion.nombre_nuevo is not None}
+
+    addon.aplicar_plan(bpy.context, plan)
+
+    assert all(obj.name == nombre for obj, nombre in finales.items())
+    assert all(obj.parent is wall for obj in seleccion)
+    assert not any("." in obj.name for obj in bpy.data.objects)
+
+
+def _aplicar_paso_a_paso(addon, plan):
+    """Aplica cada accion y comprueba que Blender no tuvo que agregar un sufijo .###."""
+    for accion in plan.acciones:
+        addon.aplicar_accion(accion)
+        if accion.nombre_nuevo is not None:
+            assert accion.objeto.name == accion.nombre_nuevo
+
+
+def test_closets_que_intercambian_indices_pasan_por_un_nombre_temporal(bpy, addon):
+    wall = bpy.data.objects.new("wall1")
+    seleccion = [_puerta(bpy, "wall1_closet1_door0_frame0", "closed_left"),
+                 _puerta(bpy, "wall1_closet0_door0_frame0", "open_right")]
+
+    plan = _planificar(bpy, wall, seleccion, lote=True)
+    temporales = [accion for accion in plan.acciones if accion.nombre_nuevo.startswith(planificador.PREFIJO_TEMPORAL)]
+    _aplicar_paso_a_paso(addon, plan)
+
+    assert len(temporales) == 1 and temporales[0].padre_nuevo is None
+    assert [raiz.name for raiz in seleccion] == ["wall1_closet0_door0_frame0", "wall1_closet1_door0_frame0"]
+    assert [raiz.children[0].name for raiz in seleccion] == [
+        "wall1_closet0_door0_closedleftpanel0", "wall1_closet1_door0_openrightpanel0"]
+    assert all(raiz.parent is wall for raiz in seleccion)
+
+
+def test_closets_al_azar_se_aplican_sin_sufijos_intermedios(bpy, addon):
+    azar = random.Random(6)
+    raices = ("Closet", "wall1_closet0_door0_frame0", "wall1_closet1_door0_frame0")
+    paneles = ("closed_left", "open_right", "closed_right", "wall1_closet0_door0_closedleftpanel0",
+               "wall1_closet0_door0_openrightpanel0", "wall1_closet1_door0_closedrightpanel0")
+    for _ in range(300):
+        bpy_simulado.reiniciar(bpy)
+        wall = bpy.data.objects.new("wall1")
+        seleccion = [_puerta(bpy, azar.choice(raices), *azar.sample(paneles, azar.randrange(1, 3)))
+                     for _ in range(azar.randrange(1, 4))]
+        plan = _planificar(bpy, wall, seleccion, lote=True)
+        finales = {accion.objeto: accion.nombre_nuevo for accion in plan.acciones if accion.nombre_nuevo is not None}
+
+        _aplicar_paso_a_paso(addon, plan)
+
+        assert all(obj.name == nombre for obj, nombre in finales.items())
+        assert not any(obj.name.startswith(planificador.PREFIJO_TEMPORAL) for obj in bpy.data.objects)
+
+
+def test_menu_ofrece_la_previsualizacion(addon):
+    entradas = []
+
+    def operator(bl_idname, **opciones):
+        entrada = types.SimpleNamespace(bl_idname=bl_idname, solo_previsualizar=False, **opciones)
+        entradas.append(entrada)
+        return entrada
+
+    addon.menu_func(types.SimpleNamespace(layout=types.SimpleNamespace(operator=operator)), None)
+
+    previsualizar = [entrada for entrada in entradas if entrada.solo_previsualizar]
+    assert [entrada.bl_idname for entrada in previsualizar] == [addon.OBJECT_OT_reparent_and_rename_smart.bl_idname]
+
+
+def test_operador_en_previsualizacion_no_aplica(bpy, addon):
+    wall = bpy.data.objects.new("wall1")
+    cubo = bpy.data.objects.new("Cube")
+    cubo.select_set(True)
+    wall.select_set(True)
+    bpy.context.view_layer.objects.active = wall
+    clase = addon.OBJECT_OT_reparent_and_rename_smart
+    operador = clase()
+    for nombre, valor in clase.__annotations__.items():
+        setattr(operador, nombre, valor)
+    operador.solo_previsualizar = True
+
+    assert operador.execute(bpy.context) == {'CANCELLED'}
+    assert cubo.name == "Cube" and cubo.parent is None
+    assert ({'INFO'}, "'Cube' -> 'wall1_primitive0', padre 'wall1'") in operador.reportes
+
+
+def test_manifiesto_intercambia_nombres_sin_importar_el_orden(bpy, addon):
+    wall = bpy.data.objects.new("wall1")
+    primero = _hijo(bpy, "wall1_primitive0", wall)
+    segundo = _hijo(bpy, "wall1_primitive1", wall)
+    entradas = [
+        {"clave": "a", "nombre_anterior": "wall1_primitive0", "nombre_nuevo": "wall1_primitive1", "padre": "wall1"},
+        {"clave": "b", "nombre_anterior": "wall1_primitive1", "nombre_nuevo": "wall1_primitive0", "padre": "wall1"},
+    ]
+
+    for orden in (entradas, entradas[::-1]):
+        plan = planificador.planificar_manifiesto(bpy.data.objects, orden, {"a": primero, "b": segundo})
+        addon.aplicar_plan(bpy.context, plan)
+
+        assert (primero.name, segundo.name) == ("wall1_primitive1", "wall1_primitive0")
+        primero.name, segundo.name = "__a", "__b"
+        primero.name, segundo.name = "wall1_primitive0", "wall1_primitive1"
+
+
+def _entrada(clave: str, nombre_anterior: str, nombre_nuevo: str, padre: str = "wall1") -> dict:
+    return {"clave": clave, "nombre_anterior": nombre_anterior, "nombre_nuevo": nombre_nuevo, "padre": padre}
+
+
+def test_manifiesto_resuelve_nombres_sin_busquedas_por_entrada(bpy):
+    wall = bpy.data.objects.new("wall1")
+    objetos = [bpy.data.objects.new(f"Cube{indice}") for indice in range(2000)]
+    entradas = [_entrada("" if indice % 2 else f"k{indice}", obj.name, f"wall1_primitive{indice}")
+                for indice, obj in enumerate(objetos)]
+    claves = {f"k{indice}": obj for indice, obj in enumerate(objetos) if indice % 2 == 0}
+    bpy_simulado.contadores.reiniciar()
+
+    plan = planificador.planificar_manifiesto(bpy.data.objects, entradas, claves)
+
+    assert bpy_simulado.contadores.busquedas_nombre == 0
+    assert len(plan.acciones) == 2000
+    assert all(accion.padre_nuevo is wall for accion in plan.acciones)
+
+
+def test_manifiesto_omite_entradas_sin_nombre_nuevo(bpy):
+    bpy.data.objects.new("wall1")
+    cubo = bpy.data.objects.new("Cube")
+    esfera = bpy.data.objects.new("Sphere")
+    entradas = [_entrada("a", "Cube", ""), _entrada("", "Sphere", "")]
+
+    plan = planificador.planificar_manifiesto(bpy.data.objects, entradas, {"a": cubo})
+
+    assert plan.acciones == ()
+    assert (cubo.name, esfera.name) == ("Cube", "Sphere")
+    assert ('WARNING', "Manifiesto: 2 entradas sin nombre nuevo (omitidas).") in plan.informes
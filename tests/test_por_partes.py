@@ -0,0 +1,95 @@
+"""
+Operador por partes: el plan se aplica en varios ticks del temporizador dentro del
+presupuesto por paso, con progreso, y Esc a mitad de camino revierte lo aplicado.
+"""
+import types
+
+import bpy_simulado
+from conftest import modulo_addon
+
+indices = modulo_addon("indices")
+
+
+class _Reloj:
+    """perf_counter falso que avanza un paso fijo en cada lectura."""
+
+    def __init__(self, paso: float):
+        self.ahora = 0.0
+        self.paso = paso
+
+    def perf_counter(self) -> float:
+        self.ahora += self.paso
+        return self.ahora
+
+
+def _preparar(bpy, addon, monkeypatch, cubos: int = 5):
+    """Escena con wall1 y cubos seleccionados; cada tick aplica una sola accion."""
+    wall = bpy.data.objects.new("wall1")
+    wall.matrix_basis = bpy_simulado.Matrix.Translation((2.0, 0.0, 0.0))
+    seleccion = []
+    for numero in range(cubos):
+        cubo = bpy.data.objects.new("Cube")
+        cubo.matrix_basis = bpy_simulado.Matrix.Translation((0.0, float(numero), 1.0))
+        cubo.select_set(True)
+        seleccion.append(cubo)
+    wall.select_set(True)
+    bpy.context.view_layer.objects.active = wall
+
+    progreso = []
+    window_manager = types.SimpleNamespace(
+        progress_begin=lambda minimo, maximo: progreso.append(("inicio", maximo)),
+        progress_update=lambda valor: progreso.append(valor),
+        progress_end=lambda: progreso.append("fin"),
+        event_timer_add=lambda *args, **kwargs: "temporizador",
+        event_timer_remove=lambda temporizador: progreso.append(("quitar", temporizador)),
+        modal_handler_add=lambda operador: None)
+    monkeypatch.setattr(bpy.context, "window_manager", window_manager, raising=False)
+    monkeypatch.setattr(bpy.context, "window", None, raising=False)
+    monkeypatch.setattr(bpy.context, "workspace", types.SimpleNamespace(status_text_set=lambda texto: None),
+                        raising=False)
+    monkeypatch.setattr(addon, "time", _Reloj(addon.PRESUPUESTO_POR_PASO * 0.6))
+
+    clase = addon.OBJECT_OT_reparent_and_rename_smart_modal
+    operador = clase()
+    for base in reversed(clase.__mro__):
+        for nombre, valor in vars(base).get("__annotations__", {}).items():
+            setattr(operador, nombre, valor)
+    return operador, wall, seleccion, progreso
+
+
+def _tick(bpy, operador):
+    return operador.modal(bpy.context, types.SimpleNamespace(type='TIMER'))
+
+
+def test_aplica_el_plan_en_varios_ticks(bpy, addon, monkeypatch):
+    operador, wall, seleccion, progreso = _preparar(bpy, addon, monkeypatch)
+    mundo = [cubo.matrix_world.translation for cubo in seleccion]
+
+    assert operador.invoke(bpy.context, None) == {'RUNNING_MODAL'}
+    for aplicadas in range(1, len(seleccion)):
+        assert _tick(bpy, operador) == {'RUNNING_MODAL'}
+        assert [cubo.parent is wall for cubo in seleccion] == [numero < aplicadas for numero in range(len(seleccion))]
+        assert bpy.context.view_layer.actualizaciones == 0
+    assert operador.modal(bpy.context, types.SimpleNamespace(type='MOUSEMOVE')) == {'RUNNING_MODAL'}
+    assert _tick(bpy, operador) == {'FINISHED'}
+
+    assert progreso == [("inicio", 5), 1, 2, 3, 4, 5, ("quitar", "temporizador"), "fin"]
+    assert [cubo.name for cubo in seleccion] == [f"wall1_primitive{numero}" for numero in range(5)]
+    assert [cubo.matrix_world.translation for cubo in seleccion] == mundo
+    assert bpy.context.view_layer.actualizaciones == 1
+    assert wall[indices.PROPIEDAD_CONTADORES]["primitive"]["siguiente"] == 5
+
+
+def test_esc_a_mitad_de_camino_revierte_lo_aplicado(bpy, addon, monkeypatch):
+    operador, wall, seleccion, progreso = _preparar(bpy, addon, monkeypatch)
+    antes = [(cubo.name, cubo.parent, cubo.matrix_basis.filas, cubo.matrix_parent_inverse.filas) for cubo in seleccion]
+
+    operador.invoke(bpy.context, None)
+    _tick(bpy, operador)
+    _tick(bpy, operador)
+    assert operador.modal(bpy.context, types.SimpleNamespace(type='ESC')) == {'CANCELLED'}
+
+    assert [(cubo.name, cubo.parent, cubo.matrix_basis.filas, cubo.matrix_parent_inverse.filas)
+            for cubo in seleccion] == antes
+    assert progreso[-2:] == [("quitar", "temporizador"), "fin"]
+    assert indices.PROPIEDAD_CONTADORES not in wall
@@ -0,0 +1,109 @@
+"""
+Seleccion y objeto activo restaurados al terminar, al fallar la aplicacion del plan y al
+cancelar el operador por partes con Esc.
+"""
+import types
+
+import pytest
+
+from conftest import modulo_addon
+
+seleccion = modulo_addon("seleccion")
+
+
+def _operador(clase):
+    operador = clase()
+    for base in reversed(clase.__mro__):
+        for nombre, valor in vars(base).get("__annotations__", {}).items():
+            setattr(operador, nombre, valor)
+    return operador
+
+
+def _escena(bpy):
+    """wall1 activo y un cubo seleccionados, mas otro objeto sin seleccionar."""
+    wall = bpy.data.objects.new("wall1")
+    cubo = bpy.data.objects.new("Cube")
+    otro = bpy.data.objects.new("Sphere")
+    cubo.select_set(True)
+    wall.select_set(True)
+    bpy.context.view_layer.objects.active = wall
+    return wall, cubo, otro
+
+
+def _cambiar_seleccion(bpy, cubo, otro):
+    cubo.select_set(False)
+    otro.select_set(True)
+    bpy.context.view_layer.objects.active = otro
+
+
+def test_restaura_la_seleccion_si_aplicar_el_plan_falla(bpy, addon, monkeypatch):
+    wall, cubo, otro = _escena(bpy)
+
+    def aplicar_plan(context, plan):
+        _cambiar_seleccion(bpy, cubo, otro)
+        raise RuntimeError("fallo al aplicar")
+
+    monkeypatch.setattr(addon, "aplicar_plan", aplicar_plan)
+
+    with pytest.raises(RuntimeError):
+        _operador(addon.OBJECT_OT_reparent_and_rename_smart).execute(bpy.context)
+
+    assert bpy.context.selected_objects == [wall, cubo]
+    assert bpy.context.view_layer.objects.active is wall
+
+
+def test_esc_en_el_operador_por_partes_restaura_la_seleccion(bpy, addon, monkeypatch):
+    wall, cubo, otro = _escena(bpy)
+    window_manager = types.SimpleNamespace(
+        progress_begin=lambda *args: None, progress_update=lambda *args: None, progress_end=lambda: None,
+        event_timer_add=lambda *args, **kwargs: object(), event_timer_remove=lambda temporizador: None,
+        modal_handler_add=lambda operador: None)
+    monkeypatch.setattr(bpy.context, "window_manager", window_manager, raising=False)
+    monkeypatch.setattr(bpy.context, "window", None, raising=False)
+    monkeypatch.setattr(bpy.context, "workspace", types.SimpleNamespace(status_text_set=lambda texto: None),
+                        raising=False)
+    operador = _operador(addon.OBJECT_OT_reparent_and_rename_smart_modal)
+
+    assert operador.invoke(bpy.context, None) == {'RUNNING_MODAL'}
+    assert operador.modal(bpy.context, types.SimpleNamespace(type='TIMER')) == {'FINISHED'}
+    assert cubo.name == "wall1_primitive0"
+
+    cubo.name, cubo.parent = "Cube", None
+    assert operador.invoke(bpy.context, None) == {'RUNNING_MODAL'}
+    _cambiar_seleccion(bpy, cubo, otro)
+    assert operador.modal(bpy.context, types.SimpleNamespace(type='ESC')) == {'CANCELLED'}
+
+    assert cubo.name == "Cube" and cubo.parent is None
+    assert bpy.context.selected_objects == [wall, cubo]
+    assert bpy.context.view_layer.objects.active is wall
+
+
+def test_informa_por_separado_seleccionados_y_activo_perdidos():
+    class Borrado:
+        def select_get(self):
+            raise ReferenceError("objeto borrado")
+
+    class Capa:
+        def __init__(self, activo):
+            self._activo = activo
+
+        @property
+        def active(self):
+            return self._activo
+
+        @active.setter
+        def active(self, valor):
+            raise ReferenceError("objeto borrado")
+
+    activo = Borrado()
+    contexto = types.SimpleNamespace(selected_objects=[Borrado(), activo],
+                                     view_layer=types.SimpleNamespace(objects=Capa(activo)))
+    guardada = seleccion.SeleccionGuardada(contexto)
+    contexto.selected_objects = []
+    contexto.view_layer.objects._activo = None
+
+    with guardada:
+        pass
+
+    assert guardada.omitidos == 2
+    assert not guardada.activo_restaurado
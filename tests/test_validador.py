@@ -0,0 +1,132 @@
+"""
+Validador incremental: despues de cualquier secuencia de ediciones, actualizar y
+sincronizar dejan la misma cache que una reconstruccion completa.
+"""
+import random
+import types
+
+import bpy_simulado
+from conftest import modulo_addon
+
+validador = modulo_addon("validador")
+
+NOMBRES = ("wall1", "wall2", "wall1_door0_frame0", "wall1_door0_leftpanel0", "wall1_door0_leftpanel0_hardware0",
+           "wall1_closet0_door0_frame0", "wall1_closet0_door0_closedleftpanel0", "wall2_primitive3",
+           "wall1_enchufe2", "wall2_door1_frame0", "wall2_door1_rightpanel0", "Cube", "Handle")
+
+
+def _estado(validador_nombres) -> tuple:
+    return (dict(validador_nombres.violaciones), dict(validador_nombres.conteo_motivos),
+            validador_nombres.descendientes, len(validador_nombres))
+
+
+def _completo(bpy) -> tuple:
+    completo = validador.ValidadorNombres()
+    completo.reconstruir(bpy.data.objects)
+    return _estado(completo)
+
+
+def _hijo(bpy, nombre: str, padre):
+    obj = bpy.data.objects.new(nombre)
+    obj.parent = padre
+    return obj
+
+
+def _escena(bpy):
+    """wall1 con una puerta (marco, panel, hardware) y un primitivo, wall2 vacio y un cubo suelto."""
+    wall1 = bpy.data.objects.new("wall1")
+    wall2 = bpy.data.objects.new("wall2")
+    marco = _hijo(bpy, "wall1_door0_frame0", wall1)
+    panel = _hijo(bpy, "wall1_door0_leftpanel0", marco)
+    _hijo(bpy, "wall1_door0_leftpanel0_hardware0", panel)
+    _hijo(bpy, "wall1_primitive0", wall1)
+    bpy.data.objects.new("Cube")
+    return wall1, wall2, marco
+
+
+def test_reconstruir_clasifica_la_jerarquia(bpy):
+    _escena(bpy)
+    validador_nombres = validador.ValidadorNombres()
+    validador_nombres.reconstruir(bpy.data.objects)
+
+    assert validador_nombres.descendientes == 4
+    assert validador_nombres.violaciones == {}
+
+
+def test_mover_un_subarbol_reclasifica_a_los_descendientes(bpy):
+    _, wall2, marco = _escena(bpy)
+    validador_nombres = validador.ValidadorNombres()
+    validador_nombres.reconstruir(bpy.data.objects)
+
+    marco.parent = wall2
+
+    assert validador_nombres.actualizar([marco]) == 3
+    assert _estado(validador_nombres) == _completo(bpy)
+    assert dict(validador_nombres.conteo_motivos) == {validador.MOTIVO_HIJO_WALL: 1, validador.MOTIVO_BAJO_VIOLACION: 2}
+
+
+def test_borrar_un_padre_deja_a_sus_hijos_fuera_de_los_walls(bpy):
+    wall1, _, marco = _escena(bpy)
+    validador_nombres = validador.ValidadorNombres()
+    validador_nombres.reconstruir(bpy.data.objects)
+    huerfanos = list(wall1.children)
+
+    bpy.data.objects.remove(wall1)
+    validador_nombres.sincronizar(huerfanos, bpy.data.objects)
+
+    assert _estado(validador_nombres) == _completo(bpy)
+    assert validador_nombres.descendientes == 0
+    assert marco.parent is None
+
+
+def test_handler_del_depsgraph_sincroniza_la_cache(bpy, addon):
+    wall1, _, marco = _escena(bpy)
+    addon.validador_nombres.reconstruir(bpy.data.objects)
+    try:
+        marco.name = "Door"
+        depsgraph = types.SimpleNamespace(updates=[types.SimpleNamespace(id=marco)])
+
+        addon.validar_en_depsgraph(bpy.context.scene, depsgraph)
+
+        assert _estado(addon.validador_nombres) == _completo(bpy)
+        assert addon.validador_nombres.violaciones[marco] == validador.MOTIVO_HIJO_WALL
+    finally:
+        addon.validador_nombres.limpiar()
+
+
+def _editar(bpy, azar: random.Random) -> list:
+    """Una edicion al azar sobre la escena; retorna los objetos que Blender reportaria."""
+    objetos = list(bpy.data.objects)
+    edicion = azar.randrange(4)
+    if edicion == 0 or not objetos:
+        padre = azar.choice(objetos + [None]) if objetos else None
+        return [_hijo(bpy, azar.choice(NOMBRES), padre)]
+    obj = azar.choice(objetos)
+    if edicion == 1:
+        obj.name = azar.choice(NOMBRES)
+        return [obj]
+    if edicion == 2:
+        padre = azar.choice(objetos + [None])
+        ancestro = padre
+        while ancestro is not None and ancestro is not obj:
+            ancestro = ancestro.parent
+        if ancestro is obj:
+            return []
+        obj.parent = padre
+        return [obj]
+    huerfanos = list(obj.children)
+    bpy.data.objects.remove(obj)
+    return huerfanos
+
+
+def test_ediciones_al_azar_coinciden_con_reconstruir(bpy):
+    azar = random.Random(5)
+    for _ in range(300):
+        bpy_simulado.reiniciar(bpy)
+        _escena(bpy)
+        validador_nombres = validador.ValidadorNombres()
+        validador_nombres.reconstruir(bpy.data.objects)
+        for _ in range(10):
+            validador_nombres.sincronizar(_editar(bpy, azar), bpy.data.objects)
+
+            assert _estado(validador_nombres) == _completo(bpy)
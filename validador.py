@@ -0,0 +1,212 @@
+"""
+Validador incremental de la nomenclatura bajo cada wallN/interiorwallN/ceilingN.
+Clasifica una vez cada objeto de la escena y guarda en cache su nombre, su padre,
+su rol en la jerarquia (wall, marco, panel, hoja) y el motivo si rompe las reglas.
+Despues solo reclasifica los objetos cuyo nombre o padre cambio, y sus descendientes,
+manteniendo al dia los conteos de violaciones por motivo.
+No depende de bpy: trabaja con cualquier objeto que exponga name y parent.
+"""
+import re
+from collections import Counter
+
+from .clasificador import CATEGORIA_PADRE, clasificar_nombre
+
+ROL_PADRE = "padre"
+ROL_MARCO_PUERTA = "marco_puerta"
+ROL_MARCO_CLOSET = "marco_closet"
+ROL_PANEL = "panel"
+ROL_HOJA = "hoja"
+ROL_VIOLACION = "violacion"
+
+MOTIVO_HIJO_WALL = "Hijo del wall sin normalizar"
+MOTIVO_PANEL_PUERTA = "Panel de puerta mal nombrado"
+MOTIVO_PANEL_CLOSET = "Panel de closet mal nombrado"
+MOTIVO_HARDWARE = "Hardware mal nombrado"
+MOTIVO_HIJO_HOJA = "Hijo de un objeto sin jerarquía"
+MOTIVO_BAJO_VIOLACION = "Bajo un objeto fuera de la nomenclatura"
+
+# Hijos directos del wall ya normalizados; el grupo 1 debe ser el nombre del wall.
+_PATRON_MARCO = re.compile(r'(.+?)_(door|closet\d+_door)\d+_frame0')
+_PATRON_PRIMITIVO = re.compile(r'(.+?)_primitive\d+')
+_PATRON_PANEL_PUERTA = re.compile(r'(?:left|right)panel\d+')
+_PATRON_PANEL_CLOSET = re.compile(r'(?:closed|open)(?:left|right)panel\d+')
+_PATRON_HARDWARE = re.compile(r'hardware\d+')
+
+# Motivo del hijo mal nombrado segun el rol del padre.
+_MOTIVO_POR_ROL_PADRE = {
+    ROL_PADRE: MOTIVO_HIJO_WALL,
+    ROL_MARCO_PUERTA: MOTIVO_PANEL_PUERTA,
+    ROL_MARCO_CLOSET: MOTIVO_PANEL_CLOSET,
+    ROL_PANEL: MOTIVO_HARDWARE,
+    ROL_HOJA: MOTIVO_HIJO_HOJA,
+    ROL_VIOLACION: MOTIVO_BAJO_VIOLACION,
+}
+
+
+def _cola(nombre: str, prefijo: str):
+    """Texto de nombre despues de "<prefijo>_", o None si no empieza asi."""
+    if nombre.startswith(prefijo) and nombre[len(prefijo):len(prefijo) + 1] == "_":
+        return nombre[len(prefijo) + 1:]
+    return None
+
+
+def evaluar_nombre(nombre: str, rol_padre, nombre_padre: str):
+    """
+    Rol de un objeto segun su nombre y el rol y nombre de su padre.
+    Retorna (rol, motivo): rol None si no esta bajo ningun wall; motivo None si cumple.
+    """
+    if clasificar_nombre(nombre).categoria == CATEGORIA_PADRE:
+        return ROL_PADRE, None
+    if rol_padre is None:
+        return None, None
+
+    if rol_padre == ROL_PADRE:
+        match = _PATRON_MARCO.fullmatch(nombre)
+        if match and match.group(1) == nombre_padre:
+            return (ROL_MARCO_PUERTA if match.group(2) == "door" else ROL_MARCO_CLOSET), None
+        match = _PATRON_PRIMITIVO.fullmatch(nombre)
+        if match and match.group(1) == nombre_padre:
+            return ROL_HOJA, None
+        clasificacion = clasificar_nombre(nombre)
+        if clasificacion.es_especial and clasificacion.nombre_alineado(nombre_padre) == nombre:
+            return ROL_HOJA, None
+    elif rol_padre in (ROL_MARCO_PUERTA, ROL_MARCO_CLOSET):
+        # Los paneles se nombran sobre la base del marco, sin el "_frame0".
+        cola = _cola(nombre, nombre_padre[:-len("_frame0")])
+        patron = _PATRON_PANEL_PUERTA if rol_padre == ROL_MARCO_PUERTA else _PATRON_PANEL_CLOSET
+        if cola is not None and patron.fullmatch(cola):
+            return ROL_PANEL, None
+    elif rol_padre == ROL_PANEL:
+        cola = _cola(nombre, nombre_padre)
+        if cola is not None and _PATRON_HARDWARE.fullmatch(cola):
+            return ROL_HOJA, None
+    return ROL_VIOLACION, _MOTIVO_POR_ROL_PADRE[rol_padre]
+
+
+class ValidadorNombres:
+    """
+    Cache de clasificacion por objeto con conteos de violaciones por motivo.
+    reconstruir() clasifica toda la escena; actualizar() solo lo que cambio.
+    """
+
+    def __init__(self):
+        self.limpiar()
+
+    def limpiar(self):
+        self._estado = {}  # obj -> (nombre, padre, rol, motivo) de la ultima clasificacion.
+        self._hijos = {}  # padre -> {hijo: None} segun la cache, para propagar cambios.
+        self.violaciones = {}  # obj -> motivo, en orden de deteccion.
+        self.conteo_motivos = Counter()
+        self.descendientes = 0  # Objetos bajo algun wall (sin contar los walls).
+        self.clasificaciones = 0
+
+    def __len__(self) -> int:
+        return len(self._estado)
+
+    def reconstruir(self, objetos):
+        """Clasifica todos los objetos desde cero."""
+        self.limpiar()
+        for obj in objetos:
+            if obj not in self._estado:
+                self._clasificar(obj)
+
+    def _clasificar(self, obj):
+        """Clasifica obj (y antes su padre, si no esta en cache) sin propagar a los hijos."""
+        padre = obj.parent
+        anterior = self._estado.get(obj)
+        if anterior is None or anterior[1] != padre:
+            if anterior is not None and anterior[1] in self._hijos:
+                self._hijos[anterior[1]].pop(obj, None)
+            self._hijos.setdefault(padre, {})[obj] = None
+        rol_padre = nombre_padre = None
+        if padre is not None:
+            estado_padre = self._estado.get(padre)
+            if estado_padre is None:
+                estado_padre = self._clasificar(padre)
+            nombre_padre, rol_padre = estado_padre[0], estado_padre[2]
+        nombre = obj.name
+        self.clasificaciones += 1
+        rol, motivo = evaluar_nombre(nombre, rol_padre, nombre_padre)
+        self._fijar(obj, (nombre, padre, rol, motivo))
+        return self._estado[obj]
+
+    def _fijar(self, obj, estado):
+        anterior = self._estado.get(obj)
+        if anterior is not None:
+            self._descontar(obj, anterior)
+        self._estado[obj] = estado
+        _, _, rol, motivo = estado
+        if rol is not None and rol != ROL_PADRE:
+            self.descendientes += 1
+        if motivo is not None:
+            self.violaciones[obj] = motivo
+            self.conteo_motivos[motivo] += 1
+
+    def _descontar(self, obj, estado):
+        _, _, rol, motivo = estado
+        if rol is not None and rol != ROL_PADRE:
+            self.descendientes -= 1
+        if motivo is not None:
+            del self.violaciones[obj]
+            self.conteo_motivos[motivo] -= 1
+            if not self.conteo_motivos[motivo]:
+                del self.conteo_motivos[motivo]
+
+    def actualizar(self, objetos) -> int:
+        """
+        Reclasifica los objetos cuyo nombre o padre cambio desde la ultima vez (o que no
+        estaban en cache) y, si cambio su nombre o rol, a sus descendientes.
+        Retorna la cantidad de objetos reclasificados.
+        """
+        antes = self.clasificaciones
+        for obj in objetos:
+            anterior = self._estado.get(obj)
+            if anterior is not None and anterior[0] == obj.name and anterior[1] == obj.parent:
+                continue
+            self._reclasificar_arbol(obj)
+        return self.clasificaciones - antes
+
+    def sincronizar(self, actualizados, objetos_escena) -> int:
+        """
+        Uso desde depsgraph_update_post: si la escena tiene menos objetos que la cache mas
+        los actualizados nuevos, olvida los borrados; luego reclasifica los actualizados.
+        Retorna la cantidad de objetos reclasificados.
+        """
+        actualizados = list(actualizados)
+        nuevos = sum(1 for obj in actualizados if obj not in self._estado)
+        if len(objetos_escena) < len(self._estado) + nuevos:
+            self.quitar(objetos_escena)
+        return self.actualizar(actualizados)
+
+    def _reclasificar_arbol(self, raiz):
+        pendientes = [raiz]
+        while pendientes:
+            obj = pendientes.pop()
+            anterior = self._estado.get(obj)
+            try:
+                nuevo = self._clasificar(obj)
+            except ReferenceError:
+                # Objeto de Blender borrado que la cache todavia no olvido.
+                self._olvidar(obj)
+                continue
+            # Los hijos dependen solo del nombre y rol del padre.
+            if anterior is None or anterior[0] != nuevo[0] or anterior[2] != nuevo[2]:
+                pendientes.extend(self._hijos.get(obj, ()))
+
+    def quitar(self, objetos_vigentes):
+        """Olvida los objetos de la cache que ya no estan en objetos_vigentes (p. ej. borrados)."""
+        vigentes = set(objetos_vigentes)
+        for obj in [obj for obj in self._estado if obj not in vigentes]:
+            self._olvidar(obj)
+
+    def _olvidar(self, obj):
+        estado = self._estado.pop(obj, None)
+        if estado is None:
+            return
+        self._descontar(obj, estado)
+        hermanos = self._hijos.get(estado[1])
+        if hermanos is not None:
+            hermanos.pop(obj, None)
+        # Blender deja sin padre a los hijos de un objeto borrado.
+        for hijo in self._hijos.pop(obj, {}):
+            self._hijos.setdefault(None, {})[hijo] = None